@@ -58,12 +58,52 @@ class _MultiTaskIsolatePageState extends State<MultiTaskIsolatePage> {
     setState(() {});
   }
 
+  String _statusLabel(Task task) {
+    switch (task.status) {
+      case TaskStatus.queued:
+        return '排队中';
+      case TaskStatus.running:
+        return '进行中';
+      case TaskStatus.paused:
+        return '已暂停';
+      case TaskStatus.completed:
+        return '已完成';
+      case TaskStatus.failed:
+        return '已失败';
+    }
+  }
+
+  Color _statusColor(Task task) {
+    switch (task.status) {
+      case TaskStatus.queued:
+        return Colors.grey;
+      case TaskStatus.running:
+        return Colors.blue;
+      case TaskStatus.paused:
+        return Colors.orange;
+      case TaskStatus.completed:
+        return Colors.green;
+      case TaskStatus.failed:
+        return Colors.red;
+    }
+  }
+
   @override
   Widget build(BuildContext context) {
     return Scaffold(
       appBar: AppBar(
         backgroundColor: Theme.of(context).colorScheme.inversePrimary,
         title: Text(widget.title),
+        bottom: PreferredSize(
+          preferredSize: const Size.fromHeight(20),
+          child: Padding(
+            padding: const EdgeInsets.only(bottom: 4),
+            child: Text(
+              '工作 Isolate 上限: ${_taskManager.poolSize}',
+              style: Theme.of(context).textTheme.bodySmall,
+            ),
+          ),
+        ),
         actions: [
           if (_taskManager.tasks.isNotEmpty)
             IconButton(
@@ -120,17 +160,9 @@ class _MultiTaskIsolatePageState extends State<MultiTaskIsolatePage> {
                               style: Theme.of(context).textTheme.bodyMedium,
                             ),
                             Text(
-                              task.isCompleted
-                                  ? '已完成'
-                                  : task.isPaused
-                                      ? '已暂停'
-                                      : '进行中',
+                              _statusLabel(task),
                               style: TextStyle(
-                                color: task.isCompleted
-                                    ? Colors.green
-                                    : task.isPaused
-                                        ? Colors.orange
-                                        : Colors.blue,
+                                color: _statusColor(task),
                                 fontWeight: FontWeight.bold,
                               ),
                             ),
@@ -141,13 +173,15 @@ class _MultiTaskIsolatePageState extends State<MultiTaskIsolatePage> {
                             mainAxisAlignment: MainAxisAlignment.end,
                             children: [
                               IconButton(
-                                icon: Icon(task.isPaused
+                                icon: Icon(task.isPaused || task.isFailed
                                     ? Icons.play_arrow
                                     : Icons.pause),
-                                onPressed: task.isPaused
+                                onPressed: task.isPaused || task.isFailed
                                     ? () => _resumeTask(task)
                                     : () => _pauseTask(task),
-                                tooltip: task.isPaused ? '继续任务' : '暂停任务',
+                                tooltip: task.isPaused || task.isFailed
+                                    ? '继续任务'
+                                    : '暂停任务',
                               ),
                             ],
                           ),
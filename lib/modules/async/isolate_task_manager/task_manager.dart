@@ -1,29 +1,55 @@
-import 'dart:isolate';
-import 'dart:async';
 import 'dart:math';
-import 'package:collection/collection.dart';
 import 'package:flutter/material.dart';
 
+import 'task_messages.dart';
+import 'worker_pool.dart';
+
+// 任务状态
+enum TaskStatus {
+  queued,
+  running,
+  paused,
+  completed,
+
+  /// 工作 Isolate 崩溃，保留进度，可重新排队
+  failed,
+}
+
 // 任务模型
 class Task {
   final int id;
   final String name;
+
+  /// 数值越大越先执行
+  final int priority;
+
+  /// 可选的输入数据，较大时以 TransferableTypedData 转移到工作 Isolate
+  final Uint8List? payload;
   int progress;
-  bool isCompleted;
-  bool isPaused = false;
-  Isolate? isolate;
-  ReceivePort? receivePort;
-  StreamSubscription<dynamic>? subscription;
-  SendPort? isolateSendPort;
+  TaskStatus status;
+
+  /// 有输入数据时，任务完成后得到的校验和
+  int? checksum;
+
+  /// 失败原因
+  String? error;
   final Color color;
 
   Task({
     required this.id,
     required this.name,
+    this.priority = 0,
+    this.payload,
     this.progress = 0,
-    this.isCompleted = false,
+    this.status = TaskStatus.queued,
   }) : color = _getRandomColor();
 
+  bool get isQueued => status == TaskStatus.queued;
+  bool get isRunning => status == TaskStatus.running;
+  bool get isPaused => status == TaskStatus.paused;
+  bool get isCompleted => status == TaskStatus.completed;
+  bool get isFailed => status == TaskStatus.failed;
+
   static Color _getRandomColor() {
     final random = Random();
     return Color.fromRGBO(
@@ -33,201 +59,165 @@ class Task {
       1.0,
     );
   }
-
-  void dispose() {
-    isolate?.kill(priority: Isolate.immediate);
-    subscription?.cancel();
-    receivePort?.close();
-  }
-
-  void pause() {
-    if (!isCompleted && !isPaused && isolateSendPort != null) {
-      isolateSendPort?.send({'action': 'pause'});
-      isPaused = true;
-    }
-  }
-
-  void resume() {
-    if (!isCompleted && isPaused && isolateSendPort != null) {
-      isolateSendPort?.send({'action': 'resume'});
-      isPaused = false;
-    }
-  }
 }
 
 // 任务管理类，负责管理任务的生命周期
+//
+// 任务在固定大小的工作 Isolate 池中执行，超出的任务按优先级排队。
+// 工作 Isolate 上报的进度先记在任务上，每帧最多通知 UI 一次。
 class TaskManager {
   final List<Task> _tasks = [];
+  final Map<int, Task> _tasksById = {};
   int _nextTaskId = 1;
   final Function(Task)? onTaskUpdate;
   final Function(Task)? onTaskComplete;
 
-  TaskManager({this.onTaskUpdate, this.onTaskComplete});
+  /// 为空时每步间隔随机 300-800ms
+  final Duration? stepInterval;
+
+  /// 安排一次合并通知，默认在下一帧开始时执行
+  final void Function(VoidCallback flush) _scheduleFlush;
+
+  late final TaskWorkerPool _pool;
+
+  /// 自上次通知以来有变化的任务
+  final Set<Task> _dirtyTasks = {};
+  bool _flushScheduled = false;
+  bool _disposed = false;
+
+  TaskManager({
+    this.onTaskUpdate,
+    this.onTaskComplete,
+    int? poolSize,
+    this.stepInterval,
+    void Function(VoidCallback flush)? scheduleFlush,
+  }) : _scheduleFlush = scheduleFlush ?? _scheduleOnNextFrame {
+    _pool = TaskWorkerPool(size: poolSize, onEvent: _handleEvent);
+  }
 
   List<Task> get tasks => List.unmodifiable(_tasks);
 
-  // 创建并启动新任务
-  Task startNewTask() {
+  /// 工作 Isolate 数量上限
+  int get poolSize => _pool.size;
+
+  Task? taskById(int id) => _tasksById[id];
+
+  // 创建新任务并提交到线程池
+  Task startNewTask({int priority = 0, Uint8List? payload}) {
     final task = Task(
       id: _nextTaskId++,
       name: '任务 ${_nextTaskId - 1}',
+      priority: priority,
+      payload: payload,
     );
 
     _tasks.add(task);
-    _startTaskInIsolate(task);
+    _tasksById[task.id] = task;
+    _submit(task);
 
     return task;
   }
 
-  // 在Isolate中启动任务
-  void _startTaskInIsolate(Task task) async {
-    task.receivePort = ReceivePort();
-
-    // 启动Isolate，传递任务ID、初始进度和sendPort
-    task.isolate = await Isolate.spawn(
-      _taskIsolate,
-      {
-        'sendPort': task.receivePort!.sendPort,
-        'taskId': task.id,
-        'initialProgress': task.progress,
-      },
-    );
+  void _submit(Task task) {
+    task.status = TaskStatus.queued;
+    _pool.submit(TaskRequest(
+      taskId: task.id,
+      priority: task.priority,
+      initialProgress: task.progress,
+      stepInterval: stepInterval,
+      payload: task.payload,
+    ));
+  }
+
+  void _handleEvent(WorkerEvent event) {
+    if (event is! TaskEvent) return;
+    final task = _tasksById[event.taskId];
+    if (task == null) return;
+
+    switch (event) {
+      case TaskStartedEvent():
+        task.status = TaskStatus.running;
+      case TaskProgressEvent(:final progress):
+        task.progress = progress;
+      case TaskCompletedEvent(:final checksum):
+        task.progress = 100;
+        task.status = TaskStatus.completed;
+        task.checksum = checksum;
+      case TaskFailedEvent(:final error):
+        task.status = TaskStatus.failed;
+        task.error = error;
+    }
+    _markDirty(task);
+  }
+
+  void _markDirty(Task task) {
+    _dirtyTasks.add(task);
+    if (_flushScheduled) return;
+    _flushScheduled = true;
+    _scheduleFlush(_flush);
+  }
 
-    // 监听任务进度更新和Isolate的SendPort
-    task.subscription = task.receivePort!.listen((dynamic data) {
-      if (data is SendPort) {
-        // 保存Isolate的SendPort，用于向Isolate发送命令
-        task.isolateSendPort = data;
-      } else if (data is Map<String, dynamic>) {
-        final int taskId = data['taskId'];
-        final Task? updatedTask =
-            _tasks.firstWhereOrNull((t) => t.id == taskId);
-
-        if (updatedTask != null) {
-          if (data.containsKey('progress')) {
-            updatedTask.progress = data['progress'];
-          }
-          if (data.containsKey('completed')) {
-            updatedTask.isCompleted = data['completed'];
-          }
-
-          // 通知任务更新
-          if (onTaskUpdate != null) {
-            onTaskUpdate!(updatedTask);
-          }
-
-          // 通知任务完成
-          if (updatedTask.isCompleted && onTaskComplete != null) {
-            onTaskComplete!(updatedTask);
-          }
-        }
-      }
-    });
+  void _flush() {
+    _flushScheduled = false;
+    if (_disposed) return;
+    final tasks = _dirtyTasks.toList();
+    _dirtyTasks.clear();
+
+    for (final task in tasks) {
+      // 通知任务更新
+      onTaskUpdate?.call(task);
+      // 通知任务完成
+      if (task.isCompleted) onTaskComplete?.call(task);
+    }
   }
 
-  // 暂停任务
+  static void _scheduleOnNextFrame(VoidCallback flush) {
+    WidgetsBinding.instance
+      ..scheduleFrameCallback((_) => flush())
+      ..scheduleFrame();
+  }
+
+  // 暂停任务：排队中的移出队列，执行中的停止并释放工作 Isolate，保留进度
   void pauseTask(Task task) {
-    task.pause();
+    if (task.isCompleted || task.isPaused || task.isFailed) return;
+    _pool.stop(task.id);
+    task.status = TaskStatus.paused;
   }
 
-  // 恢复任务
+  // 恢复任务：从已有进度重新排队（失败的任务同样可以重试）
   void resumeTask(Task task) {
-    task.resume();
+    if (!task.isPaused && !task.isFailed) return;
+    if (!_tasksById.containsKey(task.id)) return;
+    task.error = null;
+    _submit(task);
   }
 
   // 停止特定任务
   void stopTask(Task task) {
-    task.dispose();
+    _pool.stop(task.id);
     _tasks.remove(task);
+    _tasksById.remove(task.id);
+    _dirtyTasks.remove(task);
   }
 
   // 停止所有任务
   void stopAllTasks() {
+    // 先清空队列，避免停止执行中的任务时又派发排队的任务
+    for (final task in _tasks.where((task) => task.isQueued)) {
+      _pool.stop(task.id);
+    }
     for (final task in _tasks) {
-      task.dispose();
+      _pool.stop(task.id);
     }
     _tasks.clear();
+    _tasksById.clear();
+    _dirtyTasks.clear();
   }
 
   // 清理资源
   void dispose() {
     stopAllTasks();
+    _disposed = true;
+    _pool.close();
   }
 }
-
-// Isolate中执行的任务函数
-void _taskIsolate(dynamic message) {
-  final SendPort sendPort = message['sendPort'];
-  final int taskId = message['taskId'];
-  final int initialProgress = message['initialProgress'] ?? 0;
-  final Random random = Random();
-  int progress = initialProgress;
-
-  // 创建一个ReceivePort来接收来自主线程的命令
-  final ReceivePort commandPort = ReceivePort();
-
-  // 向主线程发送命令端口的SendPort
-  sendPort.send(commandPort.sendPort);
-
-  // 任务状态控制变量
-  bool isPaused = false;
-  bool isRunning = true;
-  Timer? timer;
-
-  // 每个任务的完成时间随机（10-30秒）
-  final int totalSteps = random.nextInt(20) + 10;
-  final int delayMs = random.nextInt(500) + 300;
-
-  // 创建定时器模拟任务执行
-  void startTimer() {
-    timer = Timer.periodic(Duration(milliseconds: delayMs), (t) {
-      if (!isPaused && isRunning) {
-        // 每次进度随机增加（2-8%）
-        final int progressIncrement = random.nextInt(7) + 2;
-        progress = min(progress + progressIncrement, 100);
-
-        // 发送进度更新
-        sendPort.send({
-          'taskId': taskId,
-          'progress': progress,
-          'completed': progress >= 100,
-        });
-
-        // 任务完成时停止定时器
-        if (progress >= 100 || t.tick >= totalSteps) {
-          sendPort.send({
-            'taskId': taskId,
-            'progress': 100,
-            'completed': true,
-          });
-          t.cancel();
-          isRunning = false;
-          commandPort.close();
-        }
-      }
-    });
-  }
-
-  // 启动定时器
-  startTimer();
-
-  // 监听来自主线程的命令
-  commandPort.listen((dynamic command) {
-    if (command is Map<String, dynamic>) {
-      final String action = command['action'];
-      switch (action) {
-        case 'pause':
-          isPaused = true;
-          break;
-        case 'resume':
-          isPaused = false;
-          break;
-        case 'stop':
-          isRunning = false;
-          timer?.cancel();
-          commandPort.close();
-          break;
-      }
-    }
-  });
-}
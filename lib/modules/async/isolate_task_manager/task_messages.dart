@@ -0,0 +1,119 @@
+import 'dart:isolate';
+import 'dart:typed_data';
+
+// 主线程与工作 Isolate 之间的消息类型
+//
+// 工作 Isolate 由 Isolate.spawn 创建，与主 Isolate 同属一个 isolate group，
+// 可以直接发送这些对象，不需要再手工拼装/解析 Map。
+
+/// 主线程 -> 工作 Isolate
+sealed class WorkerCommand {
+  const WorkerCommand();
+}
+
+/// 在工作 Isolate 中开始执行任务
+class StartTaskCommand extends WorkerCommand {
+  const StartTaskCommand({
+    required this.taskId,
+    required this.runId,
+    this.initialProgress = 0,
+    this.stepIntervalMs,
+    this.payload,
+  });
+
+  final int taskId;
+
+  /// 每次派发递增，用于丢弃已停止的上一次执行残留的消息
+  final int runId;
+  final int initialProgress;
+
+  /// 为空时每步间隔随机 300-800ms
+  final int? stepIntervalMs;
+  final TaskPayload? payload;
+}
+
+/// 停止正在执行的任务（暂停和取消都使用它，工作 Isolate 随即空闲）
+class StopTaskCommand extends WorkerCommand {
+  const StopTaskCommand(this.taskId);
+
+  final int taskId;
+}
+
+class ShutdownCommand extends WorkerCommand {
+  const ShutdownCommand();
+}
+
+/// 工作 Isolate -> 主线程
+sealed class WorkerEvent {
+  const WorkerEvent();
+}
+
+/// 工作 Isolate 启动完成，附带接收命令的端口
+class WorkerReadyEvent extends WorkerEvent {
+  const WorkerReadyEvent(this.workerId, this.commandPort);
+
+  final int workerId;
+  final SendPort commandPort;
+}
+
+/// 任务相关事件的公共字段
+sealed class TaskEvent extends WorkerEvent {
+  const TaskEvent(this.taskId, this.runId);
+
+  final int taskId;
+  final int runId;
+}
+
+/// 任务已派发到某个工作 Isolate（由线程池在主线程产生）
+class TaskStartedEvent extends TaskEvent {
+  const TaskStartedEvent(super.taskId, super.runId, this.workerId);
+
+  final int workerId;
+}
+
+class TaskProgressEvent extends TaskEvent {
+  const TaskProgressEvent(super.taskId, super.runId, this.progress);
+
+  final int progress;
+}
+
+class TaskCompletedEvent extends TaskEvent {
+  const TaskCompletedEvent(super.taskId, super.runId, {this.checksum});
+
+  /// 任务携带数据时，对数据计算的校验和
+  final int? checksum;
+}
+
+/// 工作 Isolate 启动失败或崩溃，任务未完成（由线程池在主线程产生）
+class TaskFailedEvent extends TaskEvent {
+  const TaskFailedEvent(super.taskId, super.runId, this.error);
+
+  final String error;
+}
+
+/// 任务的输入数据。
+///
+/// 超过 [transferThreshold] 的数据包装为 [TransferableTypedData]，跨 Isolate
+/// 时只转移所有权，不再随消息逐字节复制；较小的数据直接随消息发送。
+class TaskPayload {
+  TaskPayload._(this._inline, this._transferable);
+
+  factory TaskPayload(Uint8List bytes) {
+    if (bytes.lengthInBytes >= transferThreshold) {
+      return TaskPayload._(null, TransferableTypedData.fromList([bytes]));
+    }
+    return TaskPayload._(bytes, null);
+  }
+
+  static const transferThreshold = 64 * 1024;
+
+  final Uint8List? _inline;
+  final TransferableTypedData? _transferable;
+
+  bool get isTransferable => _transferable != null;
+
+  /// 在接收方取出数据；[TransferableTypedData] 只能取出一次。
+  Uint8List materialize() {
+    return _inline ?? _transferable!.materialize().asUint8List();
+  }
+}
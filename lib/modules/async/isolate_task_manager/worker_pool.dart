@@ -0,0 +1,378 @@
+import 'dart:async';
+import 'dart:io';
+import 'dart:isolate';
+import 'dart:math';
+import 'dart:typed_data';
+
+import 'package:collection/collection.dart';
+import 'package:flutter/foundation.dart' show visibleForTesting;
+
+import 'task_messages.dart';
+
+/// 提交到线程池的任务
+class TaskRequest {
+  const TaskRequest({
+    required this.taskId,
+    this.priority = 0,
+    this.initialProgress = 0,
+    this.stepInterval,
+    this.payload,
+  });
+
+  final int taskId;
+
+  /// 数值越大越先执行，相同优先级按提交顺序
+  final int priority;
+  final int initialProgress;
+  final Duration? stepInterval;
+  final Uint8List? payload;
+}
+
+/// 固定大小、可复用的工作 Isolate 池。
+///
+/// 工作 Isolate 在首次需要时创建，之后一直复用，数量不超过 [size]（默认为
+/// CPU 核数）。超出的任务进入优先级队列，等待有工作 Isolate 空闲。所有事件
+/// 通过 [onEvent] 回调在主 Isolate 上按到达顺序派发。
+///
+/// 工作 Isolate 启动失败或执行中崩溃时，其上的任务以 [TaskFailedEvent] 结束，
+/// 该 Isolate 被移出池，之后按需重新创建。
+class TaskWorkerPool {
+  TaskWorkerPool({
+    int? size,
+    required this.onEvent,
+    @visibleForTesting
+    void Function(WorkerBootstrap bootstrap) workerEntryPoint = _workerMain,
+  })  : size = max(1, size ?? Platform.numberOfProcessors),
+        _workerEntryPoint = workerEntryPoint {
+    _eventSubscription = _eventPort.listen(_handleMessage);
+  }
+
+  final int size;
+  final void Function(WorkerEvent event) onEvent;
+  final void Function(WorkerBootstrap bootstrap) _workerEntryPoint;
+
+  final ReceivePort _eventPort = ReceivePort();
+  late final StreamSubscription<dynamic> _eventSubscription;
+
+  /// 存活的工作 Isolate，按 id 索引；崩溃的会被移除
+  final Map<int, _Worker> _workers = {};
+  final List<_Worker> _idleWorkers = [];
+
+  final PriorityQueue<_QueuedRequest> _queue =
+      HeapPriorityQueue<_QueuedRequest>(_QueuedRequest.compare);
+
+  /// 排队中的任务，停止时只从这里删除，出队时跳过已删除的条目
+  final Map<int, _QueuedRequest> _queuedById = {};
+
+  /// 执行中的任务 -> 所在工作 Isolate
+  final Map<int, _Running> _runningById = {};
+
+  int _sequence = 0;
+  int _nextRunId = 1;
+  int _nextWorkerId = 0;
+  bool _closed = false;
+
+  int get workerCount => _workers.length;
+  int get queuedCount => _queuedById.length;
+  int get runningCount => _runningById.length;
+
+  bool isQueued(int taskId) => _queuedById.containsKey(taskId);
+  bool isRunning(int taskId) => _runningById.containsKey(taskId);
+
+  void submit(TaskRequest request) {
+    if (_closed) throw StateError('TaskWorkerPool is closed');
+    if (isQueued(request.taskId) || isRunning(request.taskId)) {
+      throw StateError('Task ${request.taskId} is already submitted');
+    }
+    final entry = _QueuedRequest(request, _sequence++);
+    _queuedById[request.taskId] = entry;
+    _queue.add(entry);
+    _dispatch();
+  }
+
+  /// 从队列中移除或停止执行中的任务，返回任务是否存在。
+  ///
+  /// 停止后该任务之前执行残留的事件不会再派发。
+  bool stop(int taskId) {
+    if (_queuedById.remove(taskId) != null) return true;
+    final running = _runningById.remove(taskId);
+    if (running == null) return false;
+    running.worker.send(StopTaskCommand(taskId));
+    _release(running.worker);
+    return true;
+  }
+
+  Future<void> close() async {
+    if (_closed) return;
+    _closed = true;
+    _queue.clear();
+    _queuedById.clear();
+    _runningById.clear();
+    for (final worker in _workers.values) {
+      worker.close();
+    }
+    _workers.clear();
+    _idleWorkers.clear();
+    await _eventSubscription.cancel();
+    _eventPort.close();
+  }
+
+  void _dispatch() {
+    while (_queuedById.isNotEmpty) {
+      final worker = _takeWorker();
+      if (worker == null) return;
+
+      final entry = _popQueued();
+      final request = entry.request;
+      final runId = _nextRunId++;
+      _runningById[request.taskId] = _Running(worker, runId);
+
+      final payload = request.payload;
+      worker.send(StartTaskCommand(
+        taskId: request.taskId,
+        runId: runId,
+        initialProgress: request.initialProgress,
+        stepIntervalMs: request.stepInterval?.inMilliseconds,
+        payload: payload == null ? null : TaskPayload(payload),
+      ));
+      onEvent(TaskStartedEvent(request.taskId, runId, worker.id));
+    }
+  }
+
+  _QueuedRequest _popQueued() {
+    while (true) {
+      final entry = _queue.removeFirst();
+      // 已停止或重新提交过的任务会留下过期条目
+      if (identical(_queuedById[entry.request.taskId], entry)) {
+        _queuedById.remove(entry.request.taskId);
+        return entry;
+      }
+    }
+  }
+
+  _Worker? _takeWorker() {
+    if (_idleWorkers.isNotEmpty) return _idleWorkers.removeLast();
+    if (_workers.length >= size) return null;
+    final worker = _Worker(_nextWorkerId++, onDied: _handleWorkerDied);
+    _workers[worker.id] = worker;
+    // spawn 内部处理启动失败，不会抛出
+    unawaited(worker.spawn(_eventPort.sendPort, _workerEntryPoint));
+    return worker;
+  }
+
+  void _handleWorkerDied(_Worker worker, Object error) {
+    if (_closed) return;
+    _workers.remove(worker.id);
+    _idleWorkers.remove(worker);
+
+    // 该 Isolate 上执行中的任务以失败结束（每个工作 Isolate 最多一个）
+    final failed = [
+      for (final entry in _runningById.entries)
+        if (identical(entry.value.worker, worker)) entry.key,
+    ];
+    for (final taskId in failed) {
+      final running = _runningById.remove(taskId)!;
+      onEvent(TaskFailedEvent(taskId, running.runId, '$error'));
+    }
+    // 空出的名额用于重新创建工作 Isolate
+    _dispatch();
+  }
+
+  void _release(_Worker worker) {
+    _idleWorkers.add(worker);
+    _dispatch();
+  }
+
+  void _handleMessage(dynamic message) {
+    if (_closed || message is! WorkerEvent) return;
+    switch (message) {
+      case WorkerReadyEvent(:final workerId, :final commandPort):
+        _workers[workerId]?.attach(commandPort);
+      case TaskEvent(:final taskId, :final runId):
+        final running = _runningById[taskId];
+        if (running == null || running.runId != runId) return;
+        if (message is TaskCompletedEvent) {
+          _runningById.remove(taskId);
+          onEvent(message);
+          _release(running.worker);
+          return;
+        }
+        onEvent(message);
+    }
+  }
+}
+
+class _QueuedRequest {
+  _QueuedRequest(this.request, this.sequence);
+
+  final TaskRequest request;
+  final int sequence;
+
+  static int compare(_QueuedRequest a, _QueuedRequest b) {
+    final byPriority = b.request.priority.compareTo(a.request.priority);
+    return byPriority != 0 ? byPriority : a.sequence.compareTo(b.sequence);
+  }
+}
+
+class _Running {
+  const _Running(this.worker, this.runId);
+
+  final _Worker worker;
+  final int runId;
+}
+
+class _Worker {
+  _Worker(this.id, {required this.onDied});
+
+  final int id;
+  final void Function(_Worker worker, Object error) onDied;
+  Isolate? _isolate;
+  SendPort? _commandPort;
+  bool _closed = false;
+
+  /// 接收 Isolate 的未捕获错误（[错误, 堆栈]）和退出通知（null）
+  final RawReceivePort _lifecyclePort = RawReceivePort();
+
+  /// 工作 Isolate 就绪前发出的命令，就绪后按顺序补发
+  final List<WorkerCommand> _pending = [];
+
+  Future<void> spawn(
+    SendPort eventPort,
+    void Function(WorkerBootstrap bootstrap) entryPoint,
+  ) async {
+    _lifecyclePort.handler = (dynamic message) {
+      _die(message is List ? message.first as Object : 'Worker $id exited');
+    };
+    final Isolate isolate;
+    try {
+      isolate = await Isolate.spawn(
+        entryPoint,
+        WorkerBootstrap(id, eventPort),
+        onError: _lifecyclePort.sendPort,
+        onExit: _lifecyclePort.sendPort,
+        debugName: 'task-worker-$id',
+      );
+    } catch (error) {
+      _die(error);
+      return;
+    }
+    // 线程池可能在 Isolate 启动期间被关闭
+    if (_closed) {
+      isolate.kill();
+    } else {
+      _isolate = isolate;
+    }
+  }
+
+  void _die(Object error) {
+    if (_closed) return;
+    close();
+    onDied(this, error);
+  }
+
+  void attach(SendPort commandPort) {
+    _commandPort = commandPort;
+    for (final command in _pending) {
+      commandPort.send(command);
+    }
+    _pending.clear();
+  }
+
+  void close() {
+    _closed = true;
+    _pending.clear();
+    _lifecyclePort.close();
+    _commandPort?.send(const ShutdownCommand());
+    _isolate?.kill();
+  }
+
+  void send(WorkerCommand command) {
+    final port = _commandPort;
+    if (port == null) {
+      _pending.add(command);
+    } else {
+      port.send(command);
+    }
+  }
+}
+
+/// 工作 Isolate 入口函数的参数
+class WorkerBootstrap {
+  const WorkerBootstrap(this.workerId, this.eventPort);
+
+  final int workerId;
+  final SendPort eventPort;
+}
+
+// 工作 Isolate 入口：常驻，依次执行主线程派发的任务
+void _workerMain(WorkerBootstrap bootstrap) {
+  final commandPort = ReceivePort();
+  final eventPort = bootstrap.eventPort;
+  _SimulatedJob? job;
+
+  eventPort.send(WorkerReadyEvent(bootstrap.workerId, commandPort.sendPort));
+
+  commandPort.listen((dynamic message) {
+    switch (message as WorkerCommand) {
+      case StartTaskCommand command:
+        job?.cancel();
+        job = _SimulatedJob(command, eventPort)..start();
+      case StopTaskCommand(:final taskId):
+        if (job?.taskId == taskId) {
+          job?.cancel();
+          job = null;
+        }
+      case ShutdownCommand():
+        job?.cancel();
+        commandPort.close();
+    }
+  });
+}
+
+/// 模拟的耗时任务：按固定间隔随机推进进度，完成时对输入数据计算校验和
+class _SimulatedJob {
+  _SimulatedJob(this.command, this.eventPort);
+
+  final StartTaskCommand command;
+  final SendPort eventPort;
+  final Random _random = Random();
+  Timer? _timer;
+
+  int get taskId => command.taskId;
+
+  void start() {
+    // 先取出数据，释放转移过来的缓冲区
+    final payload = command.payload?.materialize();
+    var progress = command.initialProgress;
+
+    // 每个任务的完成时间随机（10-30 步）
+    final totalSteps = _random.nextInt(20) + 10;
+    final delayMs = command.stepIntervalMs ?? _random.nextInt(500) + 300;
+
+    _timer = Timer.periodic(Duration(milliseconds: delayMs), (timer) {
+      // 每次进度随机增加（2-8%）
+      progress = min(progress + _random.nextInt(7) + 2, 100);
+
+      if (progress >= 100 || timer.tick >= totalSteps) {
+        timer.cancel();
+        eventPort.send(TaskCompletedEvent(
+          taskId,
+          command.runId,
+          checksum: payload == null ? null : _checksum(payload),
+        ));
+        return;
+      }
+      eventPort.send(TaskProgressEvent(taskId, command.runId, progress));
+    });
+  }
+
+  void cancel() => _timer?.cancel();
+
+  static int _checksum(Uint8List bytes) {
+    var sum = 0;
+    for (var i = 0; i < bytes.length; i++) {
+      sum = (sum + bytes[i]) & 0xFFFFFFFF;
+    }
+    return sum;
+  }
+}
@@ -1,6 +1,72 @@
 import 'dart:async';
+import 'dart:collection';
+
+import 'package:flutter/widgets.dart';
+
+/// 有界队列满时的处理策略
+enum OverflowPolicy {
+  /// 丢弃队列中最旧的数据，保留最新数据
+  dropOldest,
+
+  /// 丢弃新到达的数据
+  dropNewest,
+
+  /// 暂停上游订阅，直到队列被下游消费完
+  block,
+}
+
+/// 背压算子的运行计数
+///
+/// 每个算子使用独立的实例；[queueDepth] 为算子内部当前暂存的数据量
+/// （批处理算子为当前批次长度）。
+class StreamOperatorStats {
+  int _received = 0;
+  int _emitted = 0;
+  int _dropped = 0;
+  int _queueDepth = 0;
+  int _maxQueueDepth = 0;
+  int _upstreamPauses = 0;
+
+  /// 从上游收到的数据数
+  int get received => _received;
+
+  /// 向下游发送的事件数（批处理算子中一个批次计为一次）
+  int get emitted => _emitted;
+
+  /// 因队列溢出或合并而丢弃的数据数
+  int get dropped => _dropped;
+
+  int get queueDepth => _queueDepth;
+
+  int get maxQueueDepth => _maxQueueDepth;
+
+  /// 因队列已满而暂停上游的次数
+  int get upstreamPauses => _upstreamPauses;
+
+  void reset() {
+    _received = 0;
+    _emitted = 0;
+    _dropped = 0;
+    _queueDepth = 0;
+    _maxQueueDepth = 0;
+    _upstreamPauses = 0;
+  }
+
+  void _recordDepth(int depth) {
+    _queueDepth = depth;
+    if (depth > _maxQueueDepth) _maxQueueDepth = depth;
+  }
+
+  @override
+  String toString() => 'received $received, emitted $emitted, '
+      'dropped $dropped, queue $queueDepth (max $maxQueueDepth), '
+      'upstream pauses $upstreamPauses';
+}
 
 /// Stream工具类，提供各种Stream操作函数
+///
+/// 单订阅算子在下游开始监听时才订阅上游，并把下游的暂停/恢复/取消转发给
+/// 上游订阅，慢速监听者不会让中间缓冲无限增长。
 class StreamUtils {
   /// 创建一个固定间隔发送数据的Stream
   ///
@@ -17,6 +83,8 @@ class StreamUtils {
 
     void addData() {
       if (controller.isClosed) return;
+      // 暂停期间不生成数据，避免在控制器中堆积
+      if (controller.isPaused) return;
 
       if (count != null && counter >= count) {
         controller.close();
@@ -60,49 +128,52 @@ class StreamUtils {
 
   /// 合并多个Stream
   static Stream<T> mergeStreams<T>(List<Stream<T>> streams) {
-    final controller = StreamController<T>();
     final subscriptions = <StreamSubscription<T>>[];
-
-    for (var stream in streams) {
-      final subscription = stream.listen(
-        controller.add,
-        onError: controller.addError,
-      );
-
-      subscriptions.add(subscription);
-    }
-
-    // 当所有Stream都完成时，关闭控制器
-    var completedCount = 0;
-    for (var stream in streams) {
-      stream.listen(
-        null,
-        onDone: () {
-          completedCount++;
-          if (completedCount == streams.length) {
-            controller.close();
-          }
-        },
-      ).cancel(); // 立即取消这个监听，因为我们只关心完成事件
-    }
-
-    controller.onCancel = () {
-      for (var subscription in subscriptions) {
-        subscription.cancel();
-      }
-    };
+    late final StreamController<T> controller;
+
+    controller = StreamController<T>(
+      onListen: () {
+        // 当所有Stream都完成时，关闭控制器
+        var remaining = streams.length;
+        if (remaining == 0) {
+          controller.close();
+          return;
+        }
+        for (final stream in streams) {
+          subscriptions.add(stream.listen(
+            controller.add,
+            onError: controller.addError,
+            onDone: () {
+              if (--remaining == 0) controller.close();
+            },
+          ));
+        }
+      },
+      onPause: () {
+        for (final subscription in subscriptions) {
+          subscription.pause();
+        }
+      },
+      onResume: () {
+        for (final subscription in subscriptions) {
+          subscription.resume();
+        }
+      },
+      onCancel: () => Future.wait([
+        for (final subscription in subscriptions) subscription.cancel(),
+      ]),
+    );
 
     return controller.stream;
   }
 
   /// 限制Stream的发送速率
   static Stream<T> throttle<T>(Stream<T> stream, Duration duration) {
-    final controller = StreamController<T>();
     DateTime? lastEventTime;
-    StreamSubscription<T>? subscription;
 
-    subscription = stream.listen(
-      (data) {
+    return _pipe<T, T>(
+      stream,
+      onData: (data, controller) {
         final now = DateTime.now();
         if (lastEventTime == null ||
             now.difference(lastEventTime!) >= duration) {
@@ -110,43 +181,266 @@ class StreamUtils {
           controller.add(data);
         }
       },
-      onError: controller.addError,
-      onDone: controller.close,
     );
+  }
 
-    controller.onCancel = () {
-      subscription?.cancel();
-    };
+  /// 缓冲Stream的数据，当收集到指定数量的数据时一次性发送
+  ///
+  /// 批次列表直接移交给下游，不再复制；下游可以持有或修改收到的列表。
+  static Stream<List<T>> buffer<T>(
+    Stream<T> stream,
+    int count, {
+    StreamOperatorStats? stats,
+  }) {
+    assert(count > 0);
+    var batch = <T>[];
+
+    return _pipe<T, List<T>>(
+      stream,
+      onData: (data, controller) {
+        batch.add(data);
+        if (stats != null) {
+          stats._received++;
+          stats._recordDepth(batch.length);
+        }
+        if (batch.length >= count) {
+          final full = batch;
+          batch = <T>[];
+          stats?._emitted++;
+          stats?._queueDepth = 0;
+          controller.add(full);
+        }
+      },
+      onDone: (controller) {
+        if (batch.isEmpty) return;
+        stats?._emitted++;
+        stats?._queueDepth = 0;
+        controller.add(batch);
+        batch = <T>[];
+      },
+    );
+  }
+
+  /// 按时间窗口批处理：每隔 [window] 发送一次期间收到的数据
+  ///
+  /// 指定 [maxCount] 时批次达到该长度会提前发送。下游暂停期间上游同样被
+  /// 暂停，窗口到期也不发送，恢复后在下一个窗口发送。
+  static Stream<List<T>> bufferTime<T>(
+    Stream<T> stream,
+    Duration window, {
+    int? maxCount,
+    StreamOperatorStats? stats,
+  }) {
+    var batch = <T>[];
+    Timer? timer;
+    StreamSubscription<T>? subscription;
+    late final StreamController<List<T>> controller;
+
+    void emit() {
+      if (batch.isEmpty) return;
+      final full = batch;
+      batch = <T>[];
+      stats?._emitted++;
+      stats?._queueDepth = 0;
+      controller.add(full);
+    }
+
+    controller = StreamController<List<T>>(
+      sync: true,
+      onListen: () {
+        timer = Timer.periodic(window, (_) {
+          if (!controller.isPaused) emit();
+        });
+        subscription = stream.listen(
+          (data) {
+            batch.add(data);
+            if (stats != null) {
+              stats._received++;
+              stats._recordDepth(batch.length);
+            }
+            if (maxCount != null && batch.length >= maxCount) emit();
+          },
+          onError: controller.addError,
+          onDone: () {
+            timer?.cancel();
+            emit();
+            controller.close();
+          },
+        );
+      },
+      onPause: () => subscription?.pause(),
+      onResume: () => subscription?.resume(),
+      onCancel: () {
+        timer?.cancel();
+        return subscription?.cancel();
+      },
+    );
 
     return controller.stream;
   }
 
-  /// 缓冲Stream的数据，当收集到指定数量的数据时一次性发送
-  static Stream<List<T>> buffer<T>(Stream<T> stream, int count) {
-    final controller = StreamController<List<T>>();
-    final buffer = <T>[];
+  /// 在上游与下游之间放置容量为 [capacity] 的有界队列
+  ///
+  /// 下游未暂停时数据直接透传；下游暂停后数据进入队列，队列满时按 [policy]
+  /// 处理。丢弃策略下上游始终保持订阅，适合只关心较新数据的热数据源；
+  /// [OverflowPolicy.block] 在队列满时暂停上游，队列清空后恢复，不丢数据。
+  /// 错误事件不进入队列，直接转发。
+  static Stream<T> bounded<T>(
+    Stream<T> stream, {
+    required int capacity,
+    OverflowPolicy policy = OverflowPolicy.block,
+    StreamOperatorStats? stats,
+  }) {
+    assert(capacity > 0);
+    final counters = stats ?? StreamOperatorStats();
+    final queue = ListQueue<T>(capacity);
     StreamSubscription<T>? subscription;
+    late final StreamController<T> controller;
+    var upstreamDone = false;
+    var upstreamBlocked = false;
+    var drainScheduled = false;
+
+    void drain() {
+      drainScheduled = false;
+      // 下游在回调中再次暂停或取消时立即停止
+      while (queue.isNotEmpty &&
+          controller.hasListener &&
+          !controller.isPaused) {
+        counters._emitted++;
+        controller.add(queue.removeFirst());
+      }
+      counters._queueDepth = queue.length;
+      if (queue.isNotEmpty) return;
+      if (upstreamDone) {
+        controller.close();
+      } else if (upstreamBlocked) {
+        upstreamBlocked = false;
+        subscription?.resume();
+      }
+    }
 
-    subscription = stream.listen(
-      (data) {
-        buffer.add(data);
-        if (buffer.length >= count) {
-          controller.add(List<T>.from(buffer));
-          buffer.clear();
+    void onData(T data) {
+      counters._received++;
+      if (queue.isEmpty && !controller.isPaused) {
+        counters._emitted++;
+        controller.add(data);
+        return;
+      }
+      if (queue.length >= capacity) {
+        if (policy == OverflowPolicy.dropNewest) {
+          counters._dropped++;
+          return;
         }
-      },
-      onError: controller.addError,
-      onDone: () {
-        if (buffer.isNotEmpty) {
-          controller.add(List<T>.from(buffer));
+        if (policy == OverflowPolicy.dropOldest) {
+          queue.removeFirst();
+          counters._dropped++;
         }
-        controller.close();
+      }
+      queue.add(data);
+      counters._recordDepth(queue.length);
+      if (policy == OverflowPolicy.block &&
+          !upstreamBlocked &&
+          queue.length >= capacity) {
+        upstreamBlocked = true;
+        counters._upstreamPauses++;
+        subscription?.pause();
+      }
+    }
+
+    controller = StreamController<T>(
+      sync: true,
+      onListen: () {
+        subscription = stream.listen(
+          onData,
+          onError: controller.addError,
+          onDone: () {
+            upstreamDone = true;
+            if (queue.isEmpty) controller.close();
+          },
+        );
+      },
+      onResume: () {
+        // 不在 resume() 调用栈内同步投递，留到微任务中排空
+        if (queue.isEmpty || drainScheduled) return;
+        drainScheduled = true;
+        scheduleMicrotask(drain);
+      },
+      onCancel: () {
+        queue.clear();
+        counters._queueDepth = 0;
+        return subscription?.cancel();
       },
     );
 
-    controller.onCancel = () {
-      subscription?.cancel();
-    };
+    return controller.stream;
+  }
+
+  /// 合并高频数据：每次调度只发送期间收到的最新值
+  ///
+  /// 默认在下一帧开始时发送，每帧最多一次；[scheduleFlush] 可替换调度方式
+  /// （测试中可同步或按微任务调度）。只保留一个值，因此不暂停上游；
+  /// 被覆盖的值计入 [StreamOperatorStats.dropped]。
+  static Stream<T> coalesceLatest<T>(
+    Stream<T> stream, {
+    void Function(VoidCallback flush)? scheduleFlush,
+    StreamOperatorStats? stats,
+  }) {
+    final schedule = scheduleFlush ?? _scheduleOnNextFrame;
+    T? latest;
+    var hasLatest = false;
+    var flushScheduled = false;
+    var upstreamDone = false;
+    StreamSubscription<T>? subscription;
+    late final StreamController<T> controller;
+
+    void flush() {
+      flushScheduled = false;
+      if (!hasLatest || !controller.hasListener) return;
+      // 暂停期间保留最新值，恢复后重新调度
+      if (controller.isPaused) return;
+      final value = latest as T;
+      latest = null;
+      hasLatest = false;
+      stats?._emitted++;
+      stats?._queueDepth = 0;
+      controller.add(value);
+      if (upstreamDone) controller.close();
+    }
+
+    void scheduleIfNeeded() {
+      if (!hasLatest || flushScheduled) return;
+      flushScheduled = true;
+      schedule(flush);
+    }
+
+    controller = StreamController<T>(
+      sync: true,
+      onListen: () {
+        subscription = stream.listen(
+          (data) {
+            if (stats != null) {
+              stats._received++;
+              if (hasLatest) stats._dropped++;
+              stats._recordDepth(1);
+            }
+            latest = data;
+            hasLatest = true;
+            if (!controller.isPaused) scheduleIfNeeded();
+          },
+          onError: controller.addError,
+          onDone: () {
+            upstreamDone = true;
+            if (!hasLatest) controller.close();
+          },
+        );
+      },
+      onResume: scheduleIfNeeded,
+      onCancel: () {
+        latest = null;
+        hasLatest = false;
+        return subscription?.cancel();
+      },
+    );
 
     return controller.stream;
   }
@@ -156,11 +450,9 @@ class StreamUtils {
     Stream<T> stream,
     R Function(T value) transformer,
   ) {
-    final controller = StreamController<R>();
-    StreamSubscription<T>? subscription;
-
-    subscription = stream.listen(
-      (data) {
+    return _pipe<T, R>(
+      stream,
+      onData: (data, controller) {
         try {
           final result = transformer(data);
           controller.add(result);
@@ -168,27 +460,18 @@ class StreamUtils {
           controller.addError(e);
         }
       },
-      onError: controller.addError,
-      onDone: controller.close,
     );
-
-    controller.onCancel = () {
-      subscription?.cancel();
-    };
-
-    return controller.stream;
   }
 
   /// 创建一个当数据发生变化时才发送的Stream
   static Stream<T> distinct<T>(Stream<T> stream,
       {bool Function(T previous, T current)? equals}) {
-    final controller = StreamController<T>();
     T? previousValue;
     bool isFirst = true;
-    StreamSubscription<T>? subscription;
 
-    subscription = stream.listen(
-      (data) {
+    return _pipe<T, T>(
+      stream,
+      onData: (data, controller) {
         if (isFirst) {
           isFirst = false;
           previousValue = data;
@@ -204,15 +487,7 @@ class StreamUtils {
           }
         }
       },
-      onError: controller.addError,
-      onDone: controller.close,
     );
-
-    controller.onCancel = () {
-      subscription?.cancel();
-    };
-
-    return controller.stream;
   }
 
   /// 创建一个仅发送最后一个值的Stream
@@ -238,4 +513,42 @@ class StreamUtils {
 
     return completer.future;
   }
+
+  /// 逐事件算子的公共骨架
+  ///
+  /// 下游开始监听时才订阅上游，暂停/恢复/取消直接转发给上游订阅。控制器
+  /// 是同步的：数据在上游回调中直接交给下游，不为每个事件排队一次微任务。
+  static Stream<R> _pipe<T, R>(
+    Stream<T> stream, {
+    required void Function(T data, StreamController<R> controller) onData,
+    void Function(StreamController<R> controller)? onDone,
+  }) {
+    StreamSubscription<T>? subscription;
+    late final StreamController<R> controller;
+
+    controller = StreamController<R>(
+      sync: true,
+      onListen: () {
+        subscription = stream.listen(
+          (data) => onData(data, controller),
+          onError: controller.addError,
+          onDone: () {
+            onDone?.call(controller);
+            controller.close();
+          },
+        );
+      },
+      onPause: () => subscription?.pause(),
+      onResume: () => subscription?.resume(),
+      onCancel: () => subscription?.cancel(),
+    );
+
+    return controller.stream;
+  }
+
+  static void _scheduleOnNextFrame(VoidCallback flush) {
+    WidgetsBinding.instance
+      ..scheduleFrameCallback((_) => flush())
+      ..scheduleFrame();
+  }
 }
@@ -30,6 +30,19 @@ class MockServer {
   // 模拟网络延迟（毫秒）
   int networkDelay = 300;
 
+  // 收到的请求数（不含预检请求），用于测试缓存和去重
+  int requestCount = 0;
+
+  // 返回 304 Not Modified 的次数
+  int notModifiedCount = 0;
+
+  // 文章数据的版本和修改时间，用于 ETag / Last-Modified
+  int _articlesVersion = 1;
+  DateTime _articlesModifiedAt = _truncateToSeconds(DateTime.now().toUtc());
+
+  /// 实际监听的端口（port 为 0 时由系统分配）
+  int? get boundPort => _server?.port;
+
   MockServer({this.port = defaultPort}) {
     // 初始化一些模拟数据
     _initMockData();
@@ -56,7 +69,7 @@ class MockServer {
       _server = await HttpServer.bind(InternetAddress.loopbackIPv4, port);
 
       if (kDebugMode) {
-        print('模拟服务器已启动，监听端口: $port');
+        print('模拟服务器已启动，监听端口: ${_server!.port}');
       }
 
       _handleRequests();
@@ -94,6 +107,8 @@ class MockServer {
         return;
       }
 
+      requestCount++;
+
       // 模拟网络延迟
       await Future.delayed(Duration(milliseconds: networkDelay));
 
@@ -374,6 +389,17 @@ class MockServer {
     final pageSize =
         int.tryParse(request.uri.queryParameters['pageSize'] ?? '10') ?? 10;
 
+    // 数据未变化时返回 304，客户端复用缓存
+    final etag = 'W/"articles-$_articlesVersion-$page-$pageSize"';
+    request.response.headers.set(HttpHeaders.etagHeader, etag);
+    request.response.headers.set(
+        HttpHeaders.lastModifiedHeader, HttpDate.format(_articlesModifiedAt));
+    if (_isNotModified(request, etag)) {
+      notModifiedCount++;
+      request.response.statusCode = HttpStatus.notModified;
+      return;
+    }
+
     // 计算分页
     final startIndex = (page - 1) * pageSize;
     final endIndex = startIndex + pageSize;
@@ -475,6 +501,8 @@ class MockServer {
       };
 
       _articles.add(newArticle);
+      _articlesVersion++;
+      _articlesModifiedAt = _truncateToSeconds(DateTime.now().toUtc());
 
       request.response.statusCode = HttpStatus.created;
       request.response.headers.contentType = ContentType.json;
@@ -496,6 +524,24 @@ class MockServer {
     }
   }
 
+  /// 判断条件请求是否命中，If-None-Match 优先于 If-Modified-Since
+  bool _isNotModified(HttpRequest request, String etag) {
+    final ifNoneMatch = request.headers.value(HttpHeaders.ifNoneMatchHeader);
+    if (ifNoneMatch != null) {
+      return ifNoneMatch.split(',').any((tag) => tag.trim() == etag);
+    }
+    final ifModifiedSince = request.headers.ifModifiedSince;
+    return ifModifiedSince != null &&
+        !_articlesModifiedAt.isAfter(ifModifiedSince);
+  }
+
+  /// HTTP 日期只精确到秒
+  static DateTime _truncateToSeconds(DateTime time) =>
+      time.subtract(Duration(
+        milliseconds: time.millisecond,
+        microseconds: time.microsecond,
+      ));
+
   /// 读取请求体
   Future<String> _readRequestBody(HttpRequest request) {
     return utf8.decoder.bind(request).join();
@@ -0,0 +1,105 @@
+import 'dart:convert';
+import 'dart:typed_data';
+
+/// 缓存的一条 HTTP 响应
+///
+/// 响应体以字节保存（JSON 会先编码），既方便按字节数限制缓存大小，也方便
+/// 写入磁盘；每次命中都重新解码，调用方拿到的是独立的对象。
+class CacheEntry {
+  CacheEntry({
+    required this.key,
+    required this.statusCode,
+    required this.headers,
+    required this.body,
+    required this.isJson,
+    required this.storedAt,
+    required this.expiresAt,
+    this.etag,
+    this.lastModified,
+  });
+
+  factory CacheEntry.fromJson(Map<String, dynamic> json) {
+    return CacheEntry(
+      key: json['key'] as String,
+      statusCode: json['statusCode'] as int,
+      headers: (json['headers'] as Map<String, dynamic>).map(
+        (name, values) => MapEntry(name, List<String>.from(values as List)),
+      ),
+      body: base64Decode(json['body'] as String),
+      isJson: json['isJson'] as bool,
+      storedAt: DateTime.fromMillisecondsSinceEpoch(json['storedAt'] as int),
+      expiresAt: DateTime.fromMillisecondsSinceEpoch(json['expiresAt'] as int),
+      etag: json['etag'] as String?,
+      lastModified: json['lastModified'] as String?,
+    );
+  }
+
+  final String key;
+  final int statusCode;
+  final Map<String, List<String>> headers;
+  final Uint8List body;
+
+  /// 响应体是否是 JSON 编码后的数据
+  final bool isJson;
+  final DateTime storedAt;
+  final DateTime expiresAt;
+
+  /// 校验信息，过期后用于条件请求
+  final String? etag;
+  final String? lastModified;
+
+  /// 用于容量统计的近似大小
+  int get sizeInBytes => body.lengthInBytes + key.length;
+
+  bool isFresh(DateTime now) => now.isBefore(expiresAt);
+
+  bool get canRevalidate => etag != null || lastModified != null;
+
+  /// 服务器返回 304 后，以新的有效期和校验信息（如有）更新条目
+  CacheEntry revalidated({
+    required DateTime now,
+    required Duration maxAge,
+    String? etag,
+    String? lastModified,
+  }) {
+    return CacheEntry(
+      key: key,
+      statusCode: statusCode,
+      headers: headers,
+      body: body,
+      isJson: isJson,
+      storedAt: now,
+      expiresAt: now.add(maxAge),
+      etag: etag ?? this.etag,
+      lastModified: lastModified ?? this.lastModified,
+    );
+  }
+
+  Map<String, dynamic> toJson() => {
+        'key': key,
+        'statusCode': statusCode,
+        'headers': headers,
+        'body': base64Encode(body),
+        'isJson': isJson,
+        'storedAt': storedAt.millisecondsSinceEpoch,
+        'expiresAt': expiresAt.millisecondsSinceEpoch,
+        'etag': etag,
+        'lastModified': lastModified,
+      };
+}
+
+/// 跨进程稳定的字符串哈希（64 位 FNV-1a，16 进制），用于缓存键和文件名
+///
+/// `String.hashCode` 不保证在不同运行之间一致，不能用于磁盘缓存。
+String stableHash(String value) {
+  var hash = 0xcbf29ce484222325;
+  for (final unit in value.codeUnits) {
+    hash ^= unit;
+    hash *= 0x100000001b3;
+  }
+  // int 是有符号 64 位，分成两个 32 位输出避免负号
+  final high = (hash >> 32) & 0xFFFFFFFF;
+  final low = hash & 0xFFFFFFFF;
+  return high.toRadixString(16).padLeft(8, '0') +
+      low.toRadixString(16).padLeft(8, '0');
+}
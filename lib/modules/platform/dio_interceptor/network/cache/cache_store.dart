@@ -0,0 +1,76 @@
+import 'cache_entry.dart';
+
+/// 缓存存储层
+abstract class CacheStore {
+  Future<CacheEntry?> get(String key);
+
+  Future<void> set(CacheEntry entry);
+
+  Future<void> remove(String key);
+
+  Future<void> clear();
+}
+
+/// 内存 LRU 缓存
+///
+/// 按最近访问顺序保存条目，总字节数超过 [maxBytes] 或条目数超过
+/// [maxEntries] 时从最久未访问的条目开始淘汰。
+class MemoryCacheStore implements CacheStore {
+  MemoryCacheStore({
+    this.maxBytes = 4 * 1024 * 1024,
+    this.maxEntries = 256,
+  });
+
+  final int maxBytes;
+  final int maxEntries;
+
+  // Map 字面量保持插入顺序，访问时移到末尾即为 LRU
+  final Map<String, CacheEntry> _entries = {};
+  int _bytes = 0;
+  int _evictions = 0;
+
+  int get length => _entries.length;
+  int get sizeInBytes => _bytes;
+  int get evictions => _evictions;
+
+  /// 从最久未访问到最近访问的键，用于调试和测试
+  Iterable<String> get keys => _entries.keys;
+
+  /// 同步读取，内存层命中时不必等待异步调度
+  CacheEntry? getSync(String key) {
+    final entry = _entries.remove(key);
+    if (entry == null) return null;
+    _entries[key] = entry;
+    return entry;
+  }
+
+  @override
+  Future<CacheEntry?> get(String key) async => getSync(key);
+
+  @override
+  Future<void> set(CacheEntry entry) async {
+    _removeSync(entry.key);
+    // 单条超过容量上限的响应不缓存
+    if (entry.sizeInBytes > maxBytes) return;
+    _entries[entry.key] = entry;
+    _bytes += entry.sizeInBytes;
+    while (_bytes > maxBytes || _entries.length > maxEntries) {
+      _removeSync(_entries.keys.first);
+      _evictions++;
+    }
+  }
+
+  @override
+  Future<void> remove(String key) async => _removeSync(key);
+
+  @override
+  Future<void> clear() async {
+    _entries.clear();
+    _bytes = 0;
+  }
+
+  void _removeSync(String key) {
+    final entry = _entries.remove(key);
+    if (entry != null) _bytes -= entry.sizeInBytes;
+  }
+}
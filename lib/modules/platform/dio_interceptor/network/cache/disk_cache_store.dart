@@ -0,0 +1,149 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:flutter/foundation.dart';
+
+import 'cache_entry.dart';
+import 'cache_store.dart';
+
+/// 磁盘缓存（可选的第二层）
+///
+/// 每条响应保存为 [directory] 下的一个文件，文件名是缓存键的稳定哈希。
+/// 首次访问时扫描目录建立索引，之后在内存中按访问顺序维护，总大小超过
+/// [maxBytes] 时删除最久未访问的文件。
+class DiskCacheStore implements CacheStore {
+  DiskCacheStore(this.directory, {this.maxBytes = 32 * 1024 * 1024});
+
+  static const _extension = '.cache';
+
+  final Directory directory;
+  final int maxBytes;
+
+  /// 文件名 -> 文件大小，按最近访问顺序
+  final Map<String, int> _index = {};
+  int _bytes = 0;
+  Future<void>? _loading;
+
+  /// 文件名 -> 进行中的写入，同一个键的写入依次执行
+  final Map<String, Future<void>> _writes = {};
+  int _tempCounter = 0;
+
+  int get sizeInBytes => _bytes;
+  int get length => _index.length;
+
+  @override
+  Future<CacheEntry?> get(String key) async {
+    await _ensureLoaded();
+    final name = _fileNameOf(key);
+    final size = _index.remove(name);
+    if (size == null) return null;
+    _index[name] = size;
+
+    try {
+      final content = await _file(name).readAsString();
+      final entry = CacheEntry.fromJson(json.decode(content));
+      // 哈希冲突时不返回别的请求的响应
+      return entry.key == key ? entry : null;
+    } catch (e) {
+      if (kDebugMode) {
+        print('DiskCacheStore - 读取缓存失败，已删除: $e');
+      }
+      await _delete(name);
+      return null;
+    }
+  }
+
+  @override
+  Future<void> set(CacheEntry entry) async {
+    await _ensureLoaded();
+    final name = _fileNameOf(entry.key);
+    final bytes = utf8.encode(json.encode(entry.toJson()));
+    if (bytes.length > maxBytes) return;
+
+    // 并发重新验证可能同时写同一个键，排在前一次写入之后
+    final write = _write(name, bytes, _writes[name]);
+    _writes[name] = write;
+    try {
+      await write;
+    } finally {
+      if (identical(_writes[name], write)) _writes.remove(name);
+    }
+  }
+
+  Future<void> _write(
+    String name,
+    List<int> bytes,
+    Future<void>? previous,
+  ) async {
+    if (previous != null) {
+      try {
+        await previous;
+      } catch (_) {
+        // 前一次写入的失败已由它的调用方处理
+      }
+    }
+
+    // 先写临时文件再重命名，避免读到写了一半的文件；临时文件名唯一
+    final temp = File('${directory.path}/$name.${_tempCounter++}.tmp');
+    try {
+      await temp.writeAsBytes(bytes, flush: true);
+      await temp.rename(_file(name).path);
+    } catch (_) {
+      if (await temp.exists()) await temp.delete();
+      rethrow;
+    }
+
+    _bytes -= _index.remove(name) ?? 0;
+    _index[name] = bytes.length;
+    _bytes += bytes.length;
+
+    while (_bytes > maxBytes && _index.isNotEmpty) {
+      await _delete(_index.keys.first);
+    }
+  }
+
+  @override
+  Future<void> remove(String key) async {
+    await _ensureLoaded();
+    await _delete(_fileNameOf(key));
+  }
+
+  @override
+  Future<void> clear() async {
+    await _ensureLoaded();
+    for (final name in _index.keys.toList()) {
+      await _delete(name);
+    }
+  }
+
+  Future<void> _ensureLoaded() => _loading ??= _load();
+
+  Future<void> _load() async {
+    await directory.create(recursive: true);
+    final files = <File, FileStat>{};
+    await for (final entity in directory.list()) {
+      if (entity is File && entity.path.endsWith(_extension)) {
+        files[entity] = await entity.stat();
+      }
+    }
+    // 以修改时间近似上次访问时间
+    final sorted = files.entries.toList()
+      ..sort((a, b) => a.value.modified.compareTo(b.value.modified));
+    for (final file in sorted) {
+      final name = file.key.uri.pathSegments.last;
+      _index[name] = file.value.size;
+      _bytes += file.value.size;
+    }
+  }
+
+  Future<void> _delete(String name) async {
+    final size = _index.remove(name);
+    if (size != null) _bytes -= size;
+    final file = _file(name);
+    if (await file.exists()) await file.delete();
+  }
+
+  File _file(String name) => File('${directory.path}/$name');
+
+  String _fileNameOf(String key) => '${stableHash(key)}$_extension';
+}
@@ -1,24 +1,52 @@
+import 'dart:io' as io;
+
 import 'package:dio/dio.dart';
+import 'package:dio/io.dart';
 import 'package:flutter/foundation.dart';
 
 import 'interceptor/auth_interceptor.dart';
+import 'interceptor/cache_interceptor.dart';
 import 'interceptor/error_interceptor.dart';
 import 'interceptor/log_interceptor.dart';
 import 'interceptor/retry_interceptor.dart';
+import 'request_deduplicator.dart';
 
 /// 网络请求客户端
 class HttpClient {
   static final HttpClient _instance = HttpClient._internal();
   factory HttpClient() => _instance;
 
+  /// 独立实例，用于测试时连接其他地址的服务器
+  @visibleForTesting
+  factory HttpClient.create({
+    required String baseUrl,
+    CacheInterceptor? cacheInterceptor,
+    bool enableLogging = false,
+  }) =>
+      HttpClient._internal(
+        baseUrl: baseUrl,
+        cacheInterceptor: cacheInterceptor,
+        enableLogging: enableLogging,
+      );
+
   late Dio dio;
   final CancelToken _cancelToken = CancelToken();
 
+  /// 响应缓存
+  late final CacheInterceptor cacheInterceptor;
+
+  /// 相同的并发 GET 请求只发送一次
+  final RequestDeduplicator deduplicator = RequestDeduplicator();
+
   /// 私有构造函数
-  HttpClient._internal() {
+  HttpClient._internal({
+    String baseUrl = 'http://localhost:8080',
+    CacheInterceptor? cacheInterceptor,
+    bool enableLogging = kDebugMode,
+  }) {
     // 基础配置
     BaseOptions options = BaseOptions(
-      baseUrl: 'http://localhost:8080',
+      baseUrl: baseUrl,
       connectTimeout: const Duration(seconds: 10),
       receiveTimeout: const Duration(seconds: 10),
       headers: {},
@@ -28,13 +56,24 @@ class HttpClient {
 
     dio = Dio(options);
 
+    // 复用同一主机的 keep-alive 连接，限制并发连接数
+    dio.httpClientAdapter = IOHttpClientAdapter(
+      createHttpClient: () => io.HttpClient()
+        ..idleTimeout = const Duration(seconds: 15)
+        ..maxConnectionsPerHost = 6,
+    );
+
+    this.cacheInterceptor = cacheInterceptor ?? CacheInterceptor();
+
     // 添加拦截器
+    // 重试通过同一个 dio 发出，304 也会经过缓存拦截器转换
     dio.interceptors.add(AuthInterceptor());
     dio.interceptors.add(ErrorInterceptor());
-    dio.interceptors.add(RetryInterceptor());
+    dio.interceptors.add(RetryInterceptor(dio: dio));
+    dio.interceptors.add(this.cacheInterceptor);
 
     // 调试模式下启用日志拦截器
-    if (kDebugMode) {
+    if (enableLogging) {
       dio.interceptors.add(LoggingInterceptor());
     }
   }
@@ -45,6 +84,9 @@ class HttpClient {
   }
 
   /// GET请求
+  ///
+  /// 未指定 options / cancelToken / onReceiveProgress 时，相同路径、参数和
+  /// 用户的并发请求共享同一个响应。
   Future<Response> get(
     String path, {
     Map<String, dynamic>? queryParameters,
@@ -52,12 +94,28 @@ class HttpClient {
     CancelToken? cancelToken,
     ProgressCallback? onReceiveProgress,
   }) async {
-    return await dio.get(
+    if (options != null || cancelToken != null || onReceiveProgress != null) {
+      return await dio.get(
+        path,
+        queryParameters: queryParameters,
+        options: options,
+        cancelToken: cancelToken ?? _cancelToken,
+        onReceiveProgress: onReceiveProgress,
+      );
+    }
+
+    final key = RequestDeduplicator.keyOf(
       path,
-      queryParameters: queryParameters,
-      options: options,
-      cancelToken: cancelToken ?? _cancelToken,
-      onReceiveProgress: onReceiveProgress,
+      queryParameters,
+      authorization: AuthInterceptor.getToken(),
+    );
+    return await deduplicator.run(
+      key,
+      () => dio.get(
+        path,
+        queryParameters: queryParameters,
+        cancelToken: _cancelToken,
+      ),
     );
   }
 
@@ -0,0 +1,267 @@
+import 'dart:convert';
+import 'dart:io';
+
+import 'package:dio/dio.dart';
+import 'package:flutter/foundation.dart';
+
+import '../cache/cache_entry.dart';
+import '../cache/cache_store.dart';
+
+/// 缓存命中统计
+class CacheStats {
+  int requests = 0;
+  int hits = 0;
+  int misses = 0;
+
+  /// 条件请求得到 304 的次数（计入命中）
+  int revalidated = 0;
+
+  double get hitRate => requests == 0 ? 0 : (hits + revalidated) / requests;
+
+  void reset() {
+    requests = 0;
+    hits = 0;
+    misses = 0;
+    revalidated = 0;
+  }
+
+  @override
+  String toString() => 'CacheStats(requests: $requests, hits: $hits, '
+      'revalidated: $revalidated, misses: $misses, '
+      'hitRate: ${(hitRate * 100).toStringAsFixed(1)}%)';
+}
+
+/// 缓存拦截器
+/// 为 GET 请求提供内存 LRU + 可选磁盘两级缓存
+///
+/// - 未过期的条目直接返回，不发出网络请求
+/// - 过期但带有 ETag / Last-Modified 的条目发送条件请求，服务器返回 304
+///   时复用缓存的响应体
+/// - 非 GET 请求成功后清空缓存，避免读到修改前的数据
+/// - 单个请求可通过 `extra: {CacheInterceptor.noCacheKey: true}` 跳过缓存
+class CacheInterceptor extends Interceptor {
+  static const String noCacheKey = 'cache_interceptor.no_cache';
+  static const String fromCacheKey = 'cache_interceptor.from_cache';
+  static const String _entryKey = 'cache_interceptor.entry';
+
+  /// 标记已经处理过的请求选项。重试会用同一个 RequestOptions 再次经过
+  /// 拦截器链，不能重复计数，也不能重复设置条件请求。
+  static const String _seenKey = 'cache_interceptor.seen';
+
+  final MemoryCacheStore memory;
+  final CacheStore? disk;
+
+  /// 响应没有 Cache-Control: max-age 时的默认有效期
+  final Duration maxAge;
+
+  final DateTime Function() _now;
+  final CacheStats stats = CacheStats();
+
+  CacheInterceptor({
+    MemoryCacheStore? memory,
+    this.disk,
+    this.maxAge = const Duration(seconds: 30),
+    DateTime Function()? clock,
+  })  : memory = memory ?? MemoryCacheStore(),
+        _now = clock ?? DateTime.now;
+
+  /// 清空两级缓存
+  Future<void> clear() async {
+    await memory.clear();
+    await disk?.clear();
+  }
+
+  @override
+  void onRequest(
+    RequestOptions options,
+    RequestInterceptorHandler handler,
+  ) async {
+    if (!_isCacheable(options) || options.extra[_seenKey] == true) {
+      handler.next(options);
+      return;
+    }
+
+    options.extra[_seenKey] = true;
+    stats.requests++;
+    final key = cacheKeyOf(options);
+    final entry = memory.getSync(key) ?? await _readDisk(key);
+
+    if (entry != null && entry.isFresh(_now())) {
+      stats.hits++;
+      handler.resolve(_toResponse(entry, options), true);
+      return;
+    }
+
+    if (entry != null && entry.canRevalidate) {
+      // 发送条件请求，304 在 onResponse 中转换为缓存的响应
+      if (entry.etag != null) {
+        options.headers[HttpHeaders.ifNoneMatchHeader] = entry.etag;
+      }
+      if (entry.lastModified != null) {
+        options.headers[HttpHeaders.ifModifiedSinceHeader] =
+            entry.lastModified;
+      }
+      final validateStatus = options.validateStatus;
+      options.validateStatus = (status) =>
+          status == HttpStatus.notModified || validateStatus(status);
+      options.extra[_entryKey] = entry;
+    } else {
+      stats.misses++;
+    }
+
+    handler.next(options);
+  }
+
+  @override
+  void onResponse(Response response, ResponseInterceptorHandler handler) async {
+    final options = response.requestOptions;
+
+    if (response.extra[fromCacheKey] == true) {
+      handler.next(response);
+      return;
+    }
+
+    if (!_isCacheable(options)) {
+      // 修改类请求成功后，缓存中的数据可能已经过时
+      if (_isUnsafe(options.method) && _isSuccess(response.statusCode)) {
+        await clear();
+      }
+      handler.next(response);
+      return;
+    }
+
+    final previous = options.extra.remove(_entryKey) as CacheEntry?;
+    if (previous != null && response.statusCode == HttpStatus.notModified) {
+      stats.revalidated++;
+      final refreshed = previous.revalidated(
+        now: _now(),
+        maxAge: _maxAgeOf(response.headers) ?? maxAge,
+        etag: response.headers.value(HttpHeaders.etagHeader),
+        lastModified: response.headers.value(HttpHeaders.lastModifiedHeader),
+      );
+      await _write(refreshed);
+      handler.next(_toResponse(refreshed, options));
+      return;
+    }
+    if (previous != null) stats.misses++;
+
+    if (response.statusCode == HttpStatus.ok) {
+      final entry = _toEntry(response);
+      if (entry != null) await _write(entry);
+    }
+    handler.next(response);
+  }
+
+  /// 缓存键：方法 + 完整 URL + 认证信息的哈希（不同用户互不共享）
+  static String cacheKeyOf(RequestOptions options) {
+    final auth = options.headers[HttpHeaders.authorizationHeader];
+    final suffix = auth == null ? '' : ' #${stableHash(auth.toString())}';
+    return '${options.method} ${options.uri}$suffix';
+  }
+
+  bool _isCacheable(RequestOptions options) =>
+      options.method.toUpperCase() == 'GET' &&
+      options.extra[noCacheKey] != true &&
+      options.responseType != ResponseType.stream;
+
+  bool _isUnsafe(String method) =>
+      const {'POST', 'PUT', 'PATCH', 'DELETE'}.contains(method.toUpperCase());
+
+  bool _isSuccess(int? status) =>
+      status != null && status >= 200 && status < 300;
+
+  Future<CacheEntry?> _readDisk(String key) async {
+    final store = disk;
+    if (store == null) return null;
+    final entry = await store.get(key);
+    // 磁盘命中提升到内存层
+    if (entry != null) await memory.set(entry);
+    return entry;
+  }
+
+  Future<void> _write(CacheEntry entry) async {
+    await memory.set(entry);
+    await disk?.set(entry);
+  }
+
+  CacheEntry? _toEntry(Response response) {
+    final cacheControl = _cacheControlOf(response.headers);
+    if (cacheControl.contains('no-store')) return null;
+
+    final Uint8List body;
+    var isJson = false;
+    final data = response.data;
+    if (data is Map || data is List) {
+      body = utf8.encode(json.encode(data));
+      isJson = true;
+    } else if (data is String) {
+      body = utf8.encode(data);
+    } else if (data is Uint8List) {
+      body = data;
+    } else if (data is List<int>) {
+      body = Uint8List.fromList(data);
+    } else {
+      return null;
+    }
+
+    // no-cache 表示可以保存，但每次使用前都要向服务器确认
+    final lifetime = cacheControl.contains('no-cache')
+        ? Duration.zero
+        : _maxAgeOf(response.headers) ?? maxAge;
+    final now = _now();
+    return CacheEntry(
+      key: cacheKeyOf(response.requestOptions),
+      statusCode: response.statusCode!,
+      headers: response.headers.map,
+      body: body,
+      isJson: isJson,
+      storedAt: now,
+      expiresAt: now.add(lifetime),
+      etag: response.headers.value(HttpHeaders.etagHeader),
+      lastModified: response.headers.value(HttpHeaders.lastModifiedHeader),
+    );
+  }
+
+  /// 每次命中都重新解码，调用方修改返回的数据不会影响缓存
+  Response _toResponse(CacheEntry entry, RequestOptions options) {
+    final dynamic data;
+    switch (options.responseType) {
+      case ResponseType.bytes:
+        data = Uint8List.fromList(entry.body);
+        break;
+      case ResponseType.plain:
+        data = utf8.decode(entry.body);
+        break;
+      default:
+        final text = utf8.decode(entry.body);
+        data = entry.isJson ? json.decode(text) : text;
+        break;
+    }
+    return Response(
+      requestOptions: options,
+      statusCode: entry.statusCode,
+      headers: Headers.fromMap(entry.headers),
+      data: data,
+      extra: {fromCacheKey: true},
+    );
+  }
+
+  Set<String> _cacheControlOf(Headers headers) {
+    final value = headers.value(HttpHeaders.cacheControlHeader);
+    if (value == null) return const {};
+    return value
+        .split(',')
+        .map((directive) => directive.trim().toLowerCase())
+        .toSet();
+  }
+
+  Duration? _maxAgeOf(Headers headers) {
+    for (final directive in _cacheControlOf(headers)) {
+      if (directive.startsWith('max-age=')) {
+        final seconds = int.tryParse(directive.substring(8));
+        if (seconds != null) return Duration(seconds: seconds);
+      }
+    }
+    return null;
+  }
+}
@@ -1,117 +1,114 @@
 import 'dart:async';
 import 'dart:io';
+import 'dart:math';
 import 'package:dio/dio.dart';
 import 'package:flutter/foundation.dart';
 
 /// 重试拦截器
 /// 用于网络请求失败时自动重试
+///
+/// 重试间隔按指数退避增长并加入随机抖动（full jitter），避免大量客户端
+/// 在同一时刻集中重试。重试次数保存在本次 onError 调用的局部变量里，
+/// 不需要按请求记录的全局状态。
 class RetryInterceptor extends Interceptor {
+  /// 标记正在由本拦截器发起的重试请求，嵌套的 onError 直接放行
+  static const String retryingKey = 'retry_interceptor.retrying';
+
   // 最大重试次数
   final int maxRetries;
-  // 重试间隔（毫秒）
+  // 首次重试的基准间隔（毫秒）
   final int retryInterval;
+  // 退避间隔上限（毫秒）
+  final int maxRetryInterval;
   // 需要重试的错误类型
   final Set<DioExceptionType> retryableErrors;
 
-  // 重试计数器，记录每个请求的重试次数
-  final Map<String, int> _retryCountMap = {};
+  /// 发起重试的 Dio 实例，应传入拦截器所在的实例，使重试经过完整的拦截器链
+  final Dio? _dio;
+  Dio? _fallbackDio;
+  final Random _random;
 
   RetryInterceptor({
+    Dio? dio,
     this.maxRetries = 3,
     this.retryInterval = 1000,
+    this.maxRetryInterval = 30000,
     Set<DioExceptionType>? retryableErrors,
-  }) : retryableErrors = retryableErrors ??
+    Random? random,
+  })  : _dio = dio,
+        _random = random ?? Random(),
+        retryableErrors = retryableErrors ??
             {
               DioExceptionType.connectionTimeout,
               DioExceptionType.receiveTimeout,
               DioExceptionType.connectionError,
             };
 
+  /// 第 [attempt] 次重试（从 1 开始）前的等待时间
+  ///
+  /// 在 [0, min(maxRetryInterval, retryInterval * 2^(attempt-1))] 内均匀取值。
+  Duration backoffDelay(int attempt) {
+    final exponent = min(attempt - 1, 30);
+    final ceiling = min(maxRetryInterval, retryInterval * (1 << exponent));
+    return Duration(milliseconds: _random.nextInt(ceiling + 1));
+  }
+
   @override
   void onError(DioException err, ErrorInterceptorHandler handler) async {
-    // 获取请求的唯一标识符（URL+参数+方法）
-    final String requestId = _getRequestId(err.requestOptions);
-
-    // 获取当前重试次数，默认为0
-    final int currentRetryCount = _retryCountMap[requestId] ?? 0;
-
-    // 判断是否满足重试条件
-    bool shouldRetry = currentRetryCount < maxRetries && // 未超过最大重试次数
-        _shouldRetryError(err) && // 是可重试的错误类型
-        _isIdempotentRequest(err.requestOptions); // 是幂等请求
-
-    if (shouldRetry) {
-      // 增加重试计数
-      _retryCountMap[requestId] = currentRetryCount + 1;
-
-      if (kDebugMode) {
-        print(
-            'RetryInterceptor - 将在${retryInterval}ms后进行第${currentRetryCount + 1}次重试');
-        print('请求: ${err.requestOptions.uri}');
-      }
-
-      // 等待指定的重试间隔
-      await Future.delayed(Duration(milliseconds: retryInterval));
-
-      try {
-        // 创建新的请求选项，继承原始请求的所有参数
-        final options = Options(
-          method: err.requestOptions.method,
-          headers: err.requestOptions.headers,
-          responseType: err.requestOptions.responseType,
-          contentType: err.requestOptions.contentType,
-          validateStatus: err.requestOptions.validateStatus,
-          receiveDataWhenStatusError:
-              err.requestOptions.receiveDataWhenStatusError,
-          followRedirects: err.requestOptions.followRedirects,
-          maxRedirects: err.requestOptions.maxRedirects,
-          requestEncoder: err.requestOptions.requestEncoder,
-          responseDecoder: err.requestOptions.responseDecoder,
-          listFormat: err.requestOptions.listFormat,
-        );
-
-        // 通过原始dio实例重新发送请求
-        final dio = Dio(); // 这里创建新的Dio实例只用于重试
-
-        // 执行重试请求
-        final response = await dio.request(
-          err.requestOptions.path,
-          data: err.requestOptions.data,
-          queryParameters: err.requestOptions.queryParameters,
-          options: options,
-          cancelToken: err.requestOptions.cancelToken,
-        );
-
-        if (kDebugMode) {
-          print('RetryInterceptor - 重试成功: ${response.statusCode}');
-        }
-
-        // 重试成功，清除重试计数
-        _retryCountMap.remove(requestId);
+    final requestOptions = err.requestOptions;
+
+    // 重试请求自身的错误交给外层的重试循环处理
+    if (requestOptions.extra[retryingKey] == true ||
+        !_shouldRetryError(err) ||
+        !_isIdempotentRequest(requestOptions)) {
+      handler.next(err);
+      return;
+    }
 
-        // 返回重试成功的响应
-        handler.resolve(response);
-        return;
-      } catch (e) {
+    DioException lastError = err;
+    requestOptions.extra[retryingKey] = true;
+    try {
+      for (var attempt = 1; attempt <= maxRetries; attempt++) {
+        final delay = backoffDelay(attempt);
         if (kDebugMode) {
-          print('RetryInterceptor - 重试失败: $e');
+          print('RetryInterceptor - 将在${delay.inMilliseconds}ms后进行'
+              '第$attempt次重试');
+          print('请求: ${requestOptions.uri}');
         }
 
-        // 如果是最后一次重试失败，清除重试计数
-        if (currentRetryCount + 1 >= maxRetries) {
-          _retryCountMap.remove(requestId);
+        // 等待退避间隔
+        await Future.delayed(delay);
+        if (requestOptions.cancelToken?.isCancelled ?? false) break;
+
+        try {
+          // 使用原始请求选项重新发送，保留 baseUrl、请求头和请求体
+          final response = await _retryDio.fetch(requestOptions);
+
+          if (kDebugMode) {
+            print('RetryInterceptor - 重试成功: ${response.statusCode}');
+          }
+
+          // 返回重试成功的响应
+          handler.resolve(response);
+          return;
+        } on DioException catch (e) {
+          if (kDebugMode) {
+            print('RetryInterceptor - 重试失败: $e');
+          }
+          lastError = e;
+          if (!_shouldRetryError(e)) break;
         }
-
-        // 重试失败，继续传递错误
-        handler.next(err);
-        return;
       }
+    } finally {
+      requestOptions.extra.remove(retryingKey);
     }
 
-    // 不满足重试条件，继续传递错误
-    handler.next(err);
+    // 重试耗尽或遇到不可重试的错误，继续传递最后一次的错误
+    handler.next(lastError);
   }
 
+  Dio get _retryDio => _dio ?? (_fallbackDio ??= Dio());
+
   /// 判断错误是否应该重试
   bool _shouldRetryError(DioException err) {
     // 网络连接错误
@@ -130,9 +127,4 @@ class RetryInterceptor extends Interceptor {
         .contains(options.method.toUpperCase());
     // 注意：POST请求通常不是幂等的，但某些特定API可能设计为幂等，这需要具体情况具体分析
   }
-
-  /// 生成请求的唯一标识符
-  String _getRequestId(RequestOptions options) {
-    return '${options.method}_${options.uri}_${options.data.hashCode}_${options.queryParameters.hashCode}';
-  }
 }
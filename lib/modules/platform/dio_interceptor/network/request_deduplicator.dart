@@ -0,0 +1,83 @@
+import 'dart:typed_data';
+
+import 'package:dio/dio.dart';
+
+/// 进行中请求去重
+///
+/// 相同键的请求在第一个完成前只发送一次，其余调用方等待同一个请求。
+/// 与缓存命中一样，每个调用方拿到独立的 [Response]：后加入的调用方得到
+/// 响应数据的副本，修改返回的数据不会影响其他调用方。
+/// 请求完成（无论成功或失败）后立即移除，不做结果缓存——缓存由
+/// CacheInterceptor 负责。
+class RequestDeduplicator {
+  final Map<String, Future<Response>> _inFlight = {};
+  int _sharedCount = 0;
+
+  /// 当前进行中的请求数
+  int get inFlightCount => _inFlight.length;
+
+  /// 复用已有请求的次数
+  int get sharedCount => _sharedCount;
+
+  Future<Response> run(String key, Future<Response> Function() request) {
+    final existing = _inFlight[key];
+    if (existing != null) {
+      _sharedCount++;
+      return existing.then(_copyResponse);
+    }
+    final future = request();
+    _inFlight[key] = future;
+    future.whenComplete(() => _inFlight.remove(key)).ignore();
+    return future;
+  }
+
+  static Response _copyResponse(Response response) {
+    return Response(
+      requestOptions: response.requestOptions,
+      statusCode: response.statusCode,
+      statusMessage: response.statusMessage,
+      headers: Headers.fromMap({
+        for (final entry in response.headers.map.entries)
+          entry.key: List<String>.from(entry.value),
+      }),
+      data: _copyData(response.data),
+      extra: Map<String, dynamic>.from(response.extra),
+      redirects: List<RedirectRecord>.from(response.redirects),
+      isRedirect: response.isRedirect,
+    );
+  }
+
+  /// 深拷贝 JSON 结构和字节数据，其余值（字符串、数字等）不可变，直接复用
+  static dynamic _copyData(dynamic data) {
+    if (data is Map<String, dynamic>) {
+      return <String, dynamic>{
+        for (final entry in data.entries) entry.key: _copyData(entry.value),
+      };
+    }
+    if (data is Map) {
+      return {
+        for (final entry in data.entries) entry.key: _copyData(entry.value),
+      };
+    }
+    if (data is Uint8List) return Uint8List.fromList(data);
+    if (data is List) return [for (final item in data) _copyData(item)];
+    return data;
+  }
+
+  /// 生成 GET 请求的去重键，查询参数按名称排序
+  static String keyOf(
+    String path,
+    Map<String, dynamic>? queryParameters, {
+    String? authorization,
+  }) {
+    final buffer = StringBuffer('GET $path');
+    if (queryParameters != null && queryParameters.isNotEmpty) {
+      final names = queryParameters.keys.toList()..sort();
+      for (final name in names) {
+        buffer.write(' $name=${queryParameters[name]}');
+      }
+    }
+    if (authorization != null) buffer.write(' #$authorization');
+    return buffer.toString();
+  }
+}
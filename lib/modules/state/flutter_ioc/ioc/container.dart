@@ -1,5 +1,6 @@
 import 'dart:async';
 
+import 'resolution_profiler.dart';
 import 'types.dart';
 
 class _ContainerKey {
@@ -22,6 +23,57 @@ class _ContainerKey {
   String toString() => '${type.toString()}${name != null ? '#$name' : ''}';
 }
 
+/// Compiled resolution step for one registration.
+typedef _Resolver = dynamic Function(
+    Container scope, _Binding binding, bool allowAsyncFactories);
+
+/// Creates (and injects) a new instance.
+typedef _Creator = dynamic Function(
+    Container scope, bool allowAsyncFactories);
+
+/// Holds a cached singleton or scoped instance.
+///
+/// While an async factory is running the pending future is shared, so
+/// concurrent `resolveAsync` calls create the instance only once. A failed
+/// future is dropped so the next resolve retries.
+class _InstanceSlot {
+  bool hasValue = false;
+  dynamic value;
+  Future<dynamic>? pending;
+
+  dynamic resolve(
+    _Registration registration,
+    Container scope,
+    bool allowAsyncFactories,
+  ) {
+    if (hasValue) return value;
+    final inFlight = pending;
+    if (inFlight != null) {
+      if (!allowAsyncFactories) throw registration.asyncError();
+      return inFlight;
+    }
+
+    final created = registration.create(scope, allowAsyncFactories);
+    if (created is Future) {
+      return pending = created.then(
+        (instance) {
+          value = instance;
+          hasValue = true;
+          pending = null;
+          return instance;
+        },
+        onError: (Object error, StackTrace stackTrace) {
+          pending = null;
+          Error.throwWithStackTrace(error, stackTrace);
+        },
+      );
+    }
+    value = created;
+    hasValue = true;
+    return created;
+  }
+}
+
 class _Registration {
   _Registration({
     required this.key,
@@ -34,24 +86,145 @@ class _Registration {
   final _ContainerKey key;
   final Factory<dynamic> factory;
   final Lifetime lifetime;
-  final Condition condition;
+
+  /// `null` means the registration always applies.
+  final Condition? condition;
   final List<PropertyInjector<dynamic>> propertyInjectors;
-  dynamic instance;
+
+  /// Singleton instance, shared by every scope.
+  final _InstanceSlot _singleton = _InstanceSlot();
+
+  /// Lifetime-specific resolver, compiled on first use.
+  late final _Resolver resolver = _compileResolver();
+
+  late final _Creator create = _compileCreator();
+
+  ContainerException asyncError() => ContainerException(
+      'Async factory registered for ${key.type}; '
+      'call resolveAsync<${key.type}>() instead.');
+
+  _Resolver _compileResolver() {
+    switch (lifetime) {
+      case Lifetime.singleton:
+        return (scope, binding, allowAsync) =>
+            _singleton.resolve(this, scope, allowAsync);
+      case Lifetime.transient:
+        return (scope, binding, allowAsync) => create(scope, allowAsync);
+      case Lifetime.scoped:
+        return (scope, binding, allowAsync) =>
+            (binding.scopedSlot ??= scope._scopedSlot(key))
+                .resolve(this, scope, allowAsync);
+    }
+  }
+
+  _Creator _compileCreator() {
+    if (propertyInjectors.isEmpty) {
+      return (scope, allowAsync) {
+        final created = factory(scope);
+        if (created is Future && !allowAsync) throw asyncError();
+        return created;
+      };
+    }
+    return (scope, allowAsync) {
+      final created = factory(scope);
+      if (created is Future) {
+        if (!allowAsync) throw asyncError();
+        return created.then((value) {
+          _injectProperties(value, scope);
+          return value;
+        });
+      }
+      _injectProperties(created, scope);
+      return created;
+    };
+  }
+
+  void _injectProperties(dynamic instance, Container scope) {
+    for (final injector in propertyInjectors) {
+      injector(instance, scope);
+    }
+  }
+}
+
+/// Cached lookup result for one `(type, name)` in one container.
+///
+/// [candidates] are this container's registrations followed by the parents',
+/// already filtered by name, so a resolve never walks the parent chain.
+class _Binding {
+  _Binding(this.key, this.candidates)
+      : _unconditional = candidates.isNotEmpty &&
+                candidates.first.condition == null
+            ? candidates.first
+            : null;
+
+  final _ContainerKey key;
+  final List<_Registration> candidates;
+  final _Registration? _unconditional;
+
+  /// Scoped instance slot of the owning container, looked up once.
+  _InstanceSlot? scopedSlot;
+
+  ResolutionProfiler? _profiler;
+  ResolveStats? _stats;
+
+  _Registration? select(Container scope) {
+    final unconditional = _unconditional;
+    if (unconditional != null) return unconditional;
+    for (final registration in candidates) {
+      final condition = registration.condition;
+      if (condition == null || condition(scope)) return registration;
+    }
+    return null;
+  }
+
+  ResolveStats statsFor(ResolutionProfiler profiler) {
+    if (!identical(_profiler, profiler)) {
+      _profiler = profiler;
+      _stats = profiler.slot(key.type, key.name);
+    }
+    return _stats!;
+  }
+}
+
+/// State shared by a root container and every scope created from it.
+class _ScopeTree {
+  /// Bumped on every registration anywhere in the tree; compiled bindings
+  /// built for an older epoch are discarded.
+  int epoch = 0;
+  ResolutionProfiler? profiler;
 }
 
 /// Concrete IoC container with lifecycle management, conditional selection, and scopes.
 class Container implements IoCContainer {
   Container({Map<String, Object?> environment = const {}, Container? parent})
       : _environment = Map<String, Object?>.from(environment),
-        _parent = parent;
+        _parent = parent,
+        _tree = parent?._tree ?? _ScopeTree();
 
   final Map<Type, List<_Registration>> _registrations = {};
-  final Map<_ContainerKey, dynamic> _scopedInstances =
+  final Map<_ContainerKey, _InstanceSlot> _scopedInstances =
       {}; // Scope-specific cache.
   final List<_ContainerKey> _resolutionPath =
       []; // Tracks resolution chain to detect cycles.
   final Map<String, Object?> _environment;
   final Container? _parent;
+  final _ScopeTree _tree;
+
+  // Compiled bindings, flattened across parents. Unnamed lookups (the
+  // common case) skip the inner map.
+  final Map<Type, _Binding> _bindings = {};
+  final Map<Type, Map<String, _Binding>> _namedBindings = {};
+  int _bindingsEpoch = 0;
+
+  /// Active profiler for this scope hierarchy, or `null` when disabled.
+  ResolutionProfiler? get profiler => _tree.profiler;
+
+  /// Starts recording resolve counts and latencies for this container, its
+  /// parents and all scopes created from them.
+  ResolutionProfiler enableProfiling() =>
+      _tree.profiler ??= ResolutionProfiler();
+
+  void disableProfiling() => _tree.profiler = null;
 
   @override
   void registerSingleton<T>(
@@ -112,17 +285,23 @@ class Container implements IoCContainer {
       key: _ContainerKey(T, name),
       factory: factory,
       lifetime: lifetime,
-      condition: condition ?? (_) => true,
-      propertyInjectors:
-          propertyInjectors?.cast<PropertyInjector<dynamic>>() ?? const [],
+      condition: condition,
+      propertyInjectors: propertyInjectors == null
+          ? const []
+          : [
+              for (final injector in propertyInjectors)
+                (Object? instance, ContainerResolver resolver) =>
+                    injector(instance as T, resolver),
+            ],
     );
     _registrations.putIfAbsent(T, () => []).add(registration);
+    // Child scopes share the tree, so their flattened caches are dropped too.
+    _tree.epoch++;
   }
 
   @override
   T resolve<T>({String? name}) {
-    final result = _resolveInternal<T>(
-        name: name, scope: this, allowAsyncFactories: false);
+    final result = _resolveInternal(T, name, false);
     if (result is Future) {
       throw ContainerException(
           'Async factory registered for $T; call resolveAsync<$T>() instead.');
@@ -132,94 +311,89 @@ class Container implements IoCContainer {
 
   @override
   Future<T> resolveAsync<T>({String? name}) async {
-    final result = await _resolveInternal<T>(
-      name: name,
-      scope: this,
-      allowAsyncFactories: true,
-    );
+    final result = _resolveInternal(T, name, true);
     if (result is Future) {
       return await result;
     }
     return result as T;
   }
 
-  dynamic _resolveInternal<T>(
-      {String? name,
-      required Container scope,
-      required bool allowAsyncFactories}) {
-    final token = _ContainerKey(T, name);
-    if (_resolutionPath.contains(token)) {
-      final chain =
-          [..._resolutionPath, token].map((e) => e.toString()).join(' -> ');
-      throw ContainerException('Circular dependency detected: $chain');
+  dynamic _resolveInternal(
+      Type type, String? name, bool allowAsyncFactories) {
+    final binding = _binding(type, name);
+    final profiler = _tree.profiler;
+    if (profiler == null) {
+      return _resolveBinding(binding, allowAsyncFactories);
     }
 
-    final registration = _findRegistration<T>(name: name, scope: scope);
-    _resolutionPath.add(token);
+    final stats = binding.statsFor(profiler);
+    final start = profiler.ticks;
     try {
-      switch (registration.lifetime) {
-        case Lifetime.singleton:
-          return registration.instance ??=
-              _createInstance<T>(registration, scope, allowAsyncFactories);
-        case Lifetime.transient:
-          return _createInstance<T>(registration, scope, allowAsyncFactories);
-        case Lifetime.scoped:
-          return scope._scopedInstances.putIfAbsent(
-            registration.key,
-            () => _createInstance<T>(registration, scope, allowAsyncFactories),
-          );
-      }
+      return _resolveBinding(binding, allowAsyncFactories);
     } finally {
-      _resolutionPath.removeLast();
+      profiler.record(stats, start);
     }
   }
 
-  dynamic _createInstance<T>(
-    _Registration registration,
-    Container scope,
-    bool allowAsyncFactories,
-  ) {
-    final created = registration.factory(scope);
-    if (created is Future && !allowAsyncFactories) {
-      throw ContainerException(
-          'Async factory registered for $T; call resolveAsync<$T>() instead.');
+  dynamic _resolveBinding(_Binding binding, bool allowAsyncFactories) {
+    // The path is empty for top-level resolves, so this is only paid for
+    // nested dependencies.
+    if (_resolutionPath.contains(binding.key)) {
+      final chain = [..._resolutionPath, binding.key]
+          .map((e) => e.toString())
+          .join(' -> ');
+      throw ContainerException('Circular dependency detected: $chain');
     }
 
-    if (created is Future) {
-      return created.then((value) {
-        _injectProperties(registration, value, scope);
-        return value;
-      });
+    final registration = binding.select(this) ?? _throwNotFound(binding.key);
+    _resolutionPath.add(binding.key);
+    try {
+      return registration.resolver(this, binding, allowAsyncFactories);
+    } finally {
+      _resolutionPath.removeLast();
     }
-
-    _injectProperties(registration, created, scope);
-    return created;
   }
 
-  void _injectProperties(
-      _Registration registration, dynamic instance, Container scope) {
-    for (final injector in registration.propertyInjectors) {
-      injector(instance, scope);
+  _Binding _binding(Type type, String? name) {
+    if (_bindingsEpoch != _tree.epoch) {
+      _bindings.clear();
+      _namedBindings.clear();
+      _bindingsEpoch = _tree.epoch;
+    }
+    if (name == null) {
+      return _bindings[type] ??= _compileBinding(type, null);
     }
+    return (_namedBindings[type] ??= {})[name] ??=
+        _compileBinding(type, name);
   }
 
-  _Registration _findRegistration<T>({String? name, required Container scope}) {
-    final registrations = _collectRegistrations(T);
-    final matching = registrations
-        .where((r) => r.key.name == name && r.condition(scope))
-        .toList();
-
-    if (matching.isEmpty) {
-      final availableNames = registrations
-          .where((r) => r.key.name != null)
-          .map((r) => r.key.name)
-          .toSet()
-          .join(', ');
-      throw ContainerException(
-          'No registration found for $T ${name != null ? 'with name $name ' : ''}'
-          '${availableNames.isNotEmpty ? '(available names: $availableNames)' : ''}');
-    }
-    return matching.first;
+  _Binding _compileBinding(Type type, String? name) {
+    final own = [
+      for (final registration in _registrations[type] ?? const [])
+        if (registration.key.name == name) registration,
+    ];
+    final inherited = _parent?._binding(type, name).candidates;
+    return _Binding(
+      _ContainerKey(type, name),
+      inherited == null || inherited.isEmpty
+          ? own
+          : [...own, ...inherited],
+    );
+  }
+
+  _InstanceSlot _scopedSlot(_ContainerKey key) =>
+      _scopedInstances.putIfAbsent(key, _InstanceSlot.new);
+
+  Never _throwNotFound(_ContainerKey key) {
+    final availableNames = _collectRegistrations(key.type)
+        .where((r) => r.key.name != null)
+        .map((r) => r.key.name)
+        .toSet()
+        .join(', ');
+    final name = key.name;
+    throw ContainerException(
+        'No registration found for ${key.type} ${name != null ? 'with name $name ' : ''}'
+        '${availableNames.isNotEmpty ? '(available names: $availableNames)' : ''}');
   }
 
   List<_Registration> _collectRegistrations(Type type) {
@@ -1,2 +1,3 @@
 export 'container.dart';
+export 'resolution_profiler.dart';
 export 'types.dart';
@@ -0,0 +1,86 @@
+/// Resolve statistics for one `(type, name)` pair.
+class ResolveStats {
+  ResolveStats(this.type, this.name);
+
+  final Type type;
+  final String? name;
+
+  int _count = 0;
+  int _totalTicks = 0;
+  int _maxTicks = 0;
+
+  /// Number of resolves, including ones that threw.
+  int get count => _count;
+
+  /// Total time spent resolving, including nested dependency resolves.
+  Duration get total => _toDuration(_totalTicks);
+
+  /// Slowest single resolve.
+  Duration get max => _toDuration(_maxTicks);
+
+  double get averageMicroseconds => _count == 0
+      ? 0
+      : _totalTicks * 1e6 / ResolutionProfiler._frequency / _count;
+
+  void _reset() {
+    _count = 0;
+    _totalTicks = 0;
+    _maxTicks = 0;
+  }
+
+  void _record(int ticks) {
+    _count++;
+    _totalTicks += ticks;
+    if (ticks > _maxTicks) _maxTicks = ticks;
+  }
+
+  static Duration _toDuration(int ticks) => Duration(
+      microseconds: ticks * 1000000 ~/ ResolutionProfiler._frequency);
+
+  @override
+  String toString() => '$type${name != null ? '#$name' : ''}: '
+      '$count resolves, avg ${averageMicroseconds.toStringAsFixed(3)}us, '
+      'max ${max.inMicroseconds}us';
+}
+
+/// Opt-in profiler that records resolve counts and latencies per type.
+///
+/// Enable it with `Container.enableProfiling()`; it is shared by the whole
+/// scope hierarchy. When disabled the container does not read the clock.
+class ResolutionProfiler {
+  static final int _frequency = Stopwatch().frequency;
+
+  final Stopwatch _clock = Stopwatch()..start();
+  final Map<Type, Map<String?, ResolveStats>> _stats = {};
+
+  /// Statistics for every type resolved so far, slowest total first.
+  List<ResolveStats> get stats {
+    return [
+      for (final byName in _stats.values) ...byName.values,
+    ]..sort((a, b) => b._totalTicks.compareTo(a._totalTicks));
+  }
+
+  ResolveStats? statsFor<T>({String? name}) => _stats[T]?[name];
+
+  /// Clears all counters. Slots are zeroed in place because containers keep
+  /// references to them.
+  void reset() {
+    for (final byName in _stats.values) {
+      for (final stats in byName.values) {
+        stats._reset();
+      }
+    }
+  }
+
+  /// Returns the stats slot for `(type, name)`; containers cache it.
+  ResolveStats slot(Type type, String? name) =>
+      (_stats[type] ??= {})[name] ??= ResolveStats(type, name);
+
+  int get ticks => _clock.elapsedTicks;
+
+  void record(ResolveStats stats, int startTicks) =>
+      stats._record(_clock.elapsedTicks - startTicks);
+
+  @override
+  String toString() => stats.join('\n');
+}
@@ -1,6 +1,7 @@
 import 'dart:async';
 import 'package:flutter/material.dart';
 import '../models/drawing_element.dart';
+import 'snap_point_index.dart';
 
 class SnapLine {
   final Offset start;
@@ -36,40 +37,19 @@ class AdsorptionManager {
   static List<SnapLine> _lastSnapLines = [];
 
   /// 获取可见的吸附线（带延迟隐藏机制）
+  ///
+  /// 传入 [index] 时直接查询空间索引，不再遍历 [elements]。
   static List<SnapLine> getVisibleSnapLines(
     List<DrawingElement> elements,
-    DrawingElement? currentElement,
-  ) {
+    DrawingElement? currentElement, {
+    SnapPointIndex? index,
+  }) {
     if (currentElement == null) return [];
 
-    final allSnapLines = calculateSnapLines(elements, currentElement);
-    final visibleLines = <SnapLine>[];
-    final currentSnapPoints = currentElement.getSnapPoints();
-    bool hasActiveSnap = false;
-
-    for (final snapLine in allSnapLines) {
-      bool shouldShow = false;
-
-      for (final point in currentSnapPoints) {
-        if (snapLine.type == SnapType.vertical) {
-          if ((point.dx - snapLine.start.dx).abs() < snapThreshold) {
-            shouldShow = true;
-            hasActiveSnap = true;
-            break;
-          }
-        } else if (snapLine.type == SnapType.horizontal) {
-          if ((point.dy - snapLine.start.dy).abs() < snapThreshold) {
-            shouldShow = true;
-            hasActiveSnap = true;
-            break;
-          }
-        }
-      }
-
-      if (shouldShow) {
-        visibleLines.add(snapLine);
-      }
-    }
+    // 吸附线本身就是按阈值筛选出来的，非空即处于吸附状态
+    final visibleLines =
+        calculateSnapLines(elements, currentElement, index: index);
+    final hasActiveSnap = visibleLines.isNotEmpty;
 
     // 更新吸附状态和延迟隐藏逻辑
     if (hasActiveSnap) {
@@ -91,39 +71,46 @@ class AdsorptionManager {
     }
   }
 
+  /// 计算与当前元素吸附点距离小于 [snapThreshold] 的吸附线，同一坐标只返回
+  /// 一条。
+  ///
+  /// 未传入 [index] 时临时从 [elements] 建立索引（O(n)）；拖拽过程中应传入
+  /// `DrawingState.snapIndex`，每次查询只访问阈值附近的桶。
   static List<SnapLine> calculateSnapLines(
     List<DrawingElement> elements,
-    DrawingElement? currentElement,
-  ) {
+    DrawingElement? currentElement, {
+    SnapPointIndex? index,
+  }) {
     if (currentElement == null) return [];
 
-    final snapLines = <SnapLine>[];
+    final snapIndex = index ?? SnapPointIndex.fromElements(elements);
     final currentSnapPoints = currentElement.getSnapPoints();
+    final snapLines = <SnapLine>[];
 
-    for (final element in elements) {
-      if (element.id == currentElement.id) continue;
-
-      final elementSnapPoints = element.getSnapPoints();
-
-      for (final currentPoint in currentSnapPoints) {
-        for (final elementPoint in elementSnapPoints) {
-          if ((currentPoint.dx - elementPoint.dx).abs() < snapThreshold) {
-            snapLines.add(SnapLine(
-              start: Offset(elementPoint.dx, 0),
-              end: Offset(elementPoint.dx, double.infinity),
-              type: SnapType.vertical,
-            ));
-          }
-
-          if ((currentPoint.dy - elementPoint.dy).abs() < snapThreshold) {
-            snapLines.add(SnapLine(
-              start: Offset(0, elementPoint.dy),
-              end: Offset(double.infinity, elementPoint.dy),
-              type: SnapType.horizontal,
-            ));
-          }
-        }
-      }
+    final xs = snapIndex.verticalCandidates(
+      currentSnapPoints,
+      snapThreshold,
+      excludeId: currentElement.id,
+    );
+    for (final x in xs) {
+      snapLines.add(SnapLine(
+        start: Offset(x, 0),
+        end: Offset(x, double.infinity),
+        type: SnapType.vertical,
+      ));
+    }
+
+    final ys = snapIndex.horizontalCandidates(
+      currentSnapPoints,
+      snapThreshold,
+      excludeId: currentElement.id,
+    );
+    for (final y in ys) {
+      snapLines.add(SnapLine(
+        start: Offset(0, y),
+        end: Offset(double.infinity, y),
+        type: SnapType.horizontal,
+      ));
     }
 
     return snapLines;
@@ -132,46 +119,45 @@ class AdsorptionManager {
   static Offset snapPosition(
     Offset position,
     List<DrawingElement> elements,
-    DrawingElement currentElement,
-  ) {
-    final snapLines = calculateSnapLines(elements, currentElement);
-    double newX = position.dx;
-    double newY = position.dy;
-
-    // 查找最近的吸附线
-    double minXDistance = double.infinity;
-    double minYDistance = double.infinity;
-    double snapX = position.dx;
-    double snapY = position.dy;
-
-    for (final snapLine in snapLines) {
-      if (snapLine.type == SnapType.vertical) {
-        final distance = position.dx - snapLine.start.dx;
-        if (distance.abs() < snapThreshold &&
-            distance.abs() < minXDistance.abs()) {
-          minXDistance = distance;
-          snapX = snapLine.start.dx;
-        }
-      } else if (snapLine.type == SnapType.horizontal) {
-        final distance = position.dy - snapLine.start.dy;
-        if (distance.abs() < snapThreshold &&
-            distance.abs() < minYDistance.abs()) {
-          minYDistance = distance;
-          snapY = snapLine.start.dy;
-        }
-      }
-    }
+    DrawingElement currentElement, {
+    SnapPointIndex? index,
+  }) {
+    final snapIndex = index ?? SnapPointIndex.fromElements(elements);
+    final currentSnapPoints = currentElement.getSnapPoints();
 
-    // 简化的吸附逻辑：在阈值范围内直接吸附
-    if (minXDistance != double.infinity) {
-      newX = snapX;
-    }
+    // 查找最近的吸附线，简化的吸附逻辑：在阈值范围内直接吸附
+    final snapX = _nearest(
+      position.dx,
+      snapIndex.verticalCandidates(
+        currentSnapPoints,
+        snapThreshold,
+        excludeId: currentElement.id,
+      ),
+    );
+    final snapY = _nearest(
+      position.dy,
+      snapIndex.horizontalCandidates(
+        currentSnapPoints,
+        snapThreshold,
+        excludeId: currentElement.id,
+      ),
+    );
+
+    return Offset(snapX ?? position.dx, snapY ?? position.dy);
+  }
 
-    if (minYDistance != double.infinity) {
-      newY = snapY;
+  /// [candidates] 中距离 [value] 最近且小于阈值的坐标，没有则返回 null。
+  static double? _nearest(double value, Iterable<double> candidates) {
+    double? nearest;
+    var minDistance = snapThreshold;
+    for (final candidate in candidates) {
+      final distance = (value - candidate).abs();
+      if (distance < minDistance) {
+        minDistance = distance;
+        nearest = candidate;
+      }
     }
-
-    return Offset(newX, newY);
+    return nearest;
   }
 
   /// 应用磁吸效果的拖拽方法
@@ -181,9 +167,15 @@ class AdsorptionManager {
     List<DrawingElement> elements,
     DrawingElement currentElement, {
     Function(DrawingElement)? onElementSnapped,
+    SnapPointIndex? index,
   }) {
     // 简化逻辑：直接使用snapPosition方法
-    return snapPosition(currentPosition, elements, currentElement);
+    return snapPosition(
+      currentPosition,
+      elements,
+      currentElement,
+      index: index,
+    );
   }
 
   /// 清理延迟隐藏计时器（在页面销毁时调用）
@@ -0,0 +1,162 @@
+import 'package:flutter/material.dart';
+
+import '../models/drawing_element.dart';
+import 'adsorption_manager.dart';
+
+/// 元素吸附点的空间索引。
+///
+/// X / Y 坐标分别按 [cellSize] 宽的桶分组（一维网格），元素新增、移动、
+/// 删除时只改动它自己的几个吸附点，代价与画板上的元素总数无关。查询阈值
+/// 范围内的坐标只需访问相邻的几个桶。
+class SnapPointIndex {
+  SnapPointIndex({this.cellSize = AdsorptionManager.snapThreshold})
+      : assert(cellSize > 0),
+        _xAxis = _AxisBuckets(cellSize),
+        _yAxis = _AxisBuckets(cellSize);
+
+  /// 从已有元素列表一次性建立索引。
+  factory SnapPointIndex.fromElements(
+    Iterable<DrawingElement> elements, {
+    double cellSize = AdsorptionManager.snapThreshold,
+  }) {
+    final index = SnapPointIndex(cellSize: cellSize);
+    for (final element in elements) {
+      index.add(element);
+    }
+    return index;
+  }
+
+  final double cellSize;
+  final _AxisBuckets _xAxis;
+  final _AxisBuckets _yAxis;
+
+  /// 元素 id -> 该元素登记在两个轴上的条目，用于增量删除
+  final Map<String, List<_AxisEntry>> _entriesById = {};
+
+  /// 已索引的元素数量
+  int get length => _entriesById.length;
+
+  bool contains(String elementId) => _entriesById.containsKey(elementId);
+
+  void add(DrawingElement element) {
+    remove(element.id);
+    final entries = <_AxisEntry>[];
+    for (final point in element.getSnapPoints()) {
+      entries.add(_xAxis.insert(point.dx, element.id));
+      entries.add(_yAxis.insert(point.dy, element.id));
+    }
+    _entriesById[element.id] = entries;
+  }
+
+  /// 元素移动或尺寸变化后调用，等价于先删除再添加。
+  void update(DrawingElement element) => add(element);
+
+  void remove(String elementId) {
+    final entries = _entriesById.remove(elementId);
+    if (entries == null) return;
+    // 条目按 x, y 交替登记
+    for (var i = 0; i < entries.length; i += 2) {
+      _xAxis.delete(entries[i]);
+      _yAxis.delete(entries[i + 1]);
+    }
+  }
+
+  void clear() {
+    _entriesById.clear();
+    _xAxis.clear();
+    _yAxis.clear();
+  }
+
+  /// 与 [points] 中任一点 X 距离小于 [threshold] 的其他元素吸附点 X 坐标。
+  ///
+  /// 结果去重，[excludeId] 对应的元素（通常是正在拖拽的元素）不参与匹配。
+  Set<double> verticalCandidates(
+    List<Offset> points,
+    double threshold, {
+    String? excludeId,
+  }) {
+    final result = <double>{};
+    for (final point in points) {
+      _xAxis.query(point.dx, threshold, excludeId, result);
+    }
+    return result;
+  }
+
+  /// 与 [points] 中任一点 Y 距离小于 [threshold] 的其他元素吸附点 Y 坐标。
+  Set<double> horizontalCandidates(
+    List<Offset> points,
+    double threshold, {
+    String? excludeId,
+  }) {
+    final result = <double>{};
+    for (final point in points) {
+      _yAxis.query(point.dy, threshold, excludeId, result);
+    }
+    return result;
+  }
+}
+
+class _AxisEntry {
+  _AxisEntry(this.value, this.elementId, this.bucket);
+
+  final double value;
+  final String elementId;
+  final int bucket;
+
+  /// 在桶列表中的下标，换位删除时随之更新
+  int slot = -1;
+}
+
+/// 单个坐标轴上的桶：`floor(value / cellSize)` -> 条目列表。
+class _AxisBuckets {
+  _AxisBuckets(this.cellSize);
+
+  final double cellSize;
+  final Map<int, List<_AxisEntry>> _buckets = {};
+
+  int _bucketOf(double value) => (value / cellSize).floor();
+
+  _AxisEntry insert(double value, String elementId) {
+    final entry = _AxisEntry(value, elementId, _bucketOf(value));
+    final bucket = _buckets[entry.bucket] ??= [];
+    entry.slot = bucket.length;
+    bucket.add(entry);
+    return entry;
+  }
+
+  void delete(_AxisEntry entry) {
+    final bucket = _buckets[entry.bucket];
+    final i = entry.slot;
+    if (bucket == null || i < 0 || i >= bucket.length) return;
+    if (!identical(bucket[i], entry)) return;
+    // 桶内顺序无关，末尾元素换位后删除避免整体移动；条目记录自己的下标，
+    // 即使很多元素对齐在同一个桶里也不需要查找
+    final last = bucket.removeLast();
+    if (!identical(last, entry)) {
+      bucket[i] = last;
+      last.slot = i;
+    }
+    entry.slot = -1;
+    if (bucket.isEmpty) _buckets.remove(entry.bucket);
+  }
+
+  void query(
+    double value,
+    double threshold,
+    String? excludeId,
+    Set<double> result,
+  ) {
+    final first = _bucketOf(value - threshold);
+    final last = _bucketOf(value + threshold);
+    for (var b = first; b <= last; b++) {
+      final bucket = _buckets[b];
+      if (bucket == null) continue;
+      for (final entry in bucket) {
+        if (entry.elementId == excludeId) continue;
+        if ((value - entry.value).abs() < threshold) result.add(entry.value);
+      }
+    }
+  }
+
+  void clear() => _buckets.clear();
+}
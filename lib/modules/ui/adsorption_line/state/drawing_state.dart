@@ -1,24 +1,51 @@
+import 'dart:collection';
+
 import 'package:flutter/material.dart';
 import 'package:flutter/services.dart';
 import '../models/drawing_element.dart';
+import '../services/snap_point_index.dart';
 
 class DrawingState extends ChangeNotifier {
   final List<DrawingElement> _elements = [];
+
+  /// 元素 id -> 在 [_elements] 中的下标，拖拽更新时不必遍历列表
+  final Map<String, int> _indexById = {};
   DrawingElement? _selectedElement;
   bool _isDragging = false;
   Offset? _dragOffset;
 
-  List<DrawingElement> get elements => List.unmodifiable(_elements);
+  /// 与 [_elements] 同步维护的吸附点索引
+  final SnapPointIndex _snapIndex = SnapPointIndex();
+
+  /// 只读视图，不复制元素列表（拖拽时每帧都会读取）
+  List<DrawingElement> get elements => UnmodifiableListView(_elements);
+  SnapPointIndex get snapIndex => _snapIndex;
   DrawingElement? get selectedElement => _selectedElement;
   bool get isDragging => _isDragging;
 
   void addElement(DrawingElement element) {
-    _elements.add(element);
+    final existing = _indexById[element.id];
+    if (existing != null) {
+      // 同一个 id 只保留一个元素
+      _elements[existing] = element;
+    } else {
+      _indexById[element.id] = _elements.length;
+      _elements.add(element);
+    }
+    _snapIndex.add(element);
     notifyListeners();
   }
 
   void removeElement(String elementId) {
-    _elements.removeWhere((element) => element.id == elementId);
+    final index = _indexById.remove(elementId);
+    if (index != null) {
+      // 保持绘制顺序，后面元素的下标依次前移
+      _elements.removeAt(index);
+      for (var i = index; i < _elements.length; i++) {
+        _indexById[_elements[i].id] = i;
+      }
+    }
+    _snapIndex.remove(elementId);
     if (_selectedElement?.id == elementId) {
       _selectedElement = null;
     }
@@ -26,10 +53,10 @@ class DrawingState extends ChangeNotifier {
   }
 
   void updateElement(DrawingElement updatedElement) {
-    final index =
-        _elements.indexWhere((element) => element.id == updatedElement.id);
-    if (index != -1) {
+    final index = _indexById[updatedElement.id];
+    if (index != null) {
       _elements[index] = updatedElement;
+      _snapIndex.update(updatedElement);
       if (_selectedElement?.id == updatedElement.id) {
         _selectedElement = updatedElement;
       }
@@ -84,6 +111,8 @@ class DrawingState extends ChangeNotifier {
 
   void clear() {
     _elements.clear();
+    _indexById.clear();
+    _snapIndex.clear();
     _selectedElement = null;
     _isDragging = false;
     _dragOffset = null;
@@ -72,6 +72,7 @@ class _DrawingBoardState extends State<DrawingBoard> {
                     return DrawingCanvas(
                       elements: drawingState.elements,
                       selectedElement: drawingState.selectedElement,
+                      snapIndex: drawingState.snapIndex,
                       onTap: _handleCanvasTap,
                       onPanStart: _handlePanStart,
                       onPanUpdate: _handlePanUpdate,
@@ -332,6 +333,7 @@ class _DrawingBoardState extends State<DrawingBoard> {
         position,
         drawingState.elements,
         drawingState.selectedElement!,
+        index: drawingState.snapIndex,
       );
 
       drawingState.updateDrag(magneticPosition);
@@ -348,6 +350,7 @@ class _DrawingBoardState extends State<DrawingBoard> {
         drawingState.selectedElement!.position,
         drawingState.elements,
         drawingState.selectedElement!,
+        index: drawingState.snapIndex,
         onElementSnapped: (snappedElement) {
           // 更新元素的最终坐标
           drawingState.updateElement(snappedElement);
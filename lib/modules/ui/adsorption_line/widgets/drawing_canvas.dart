@@ -1,12 +1,16 @@
 import 'package:flutter/material.dart';
 import '../models/drawing_element.dart';
 import '../services/adsorption_manager.dart';
+import '../services/snap_point_index.dart';
 import 'dart:math' as math;
 
 /// 画板画布组件
 class DrawingCanvas extends StatelessWidget {
   final List<DrawingElement> elements;
   final DrawingElement? selectedElement;
+
+  /// 吸附点索引，为空时吸附线计算会临时从 [elements] 建立
+  final SnapPointIndex? snapIndex;
   final Function(Offset) onTap;
   final Function(Offset) onPanStart;
   final Function(Offset) onPanUpdate;
@@ -16,6 +20,7 @@ class DrawingCanvas extends StatelessWidget {
     super.key,
     required this.elements,
     this.selectedElement,
+    this.snapIndex,
     required this.onTap,
     required this.onPanStart,
     required this.onPanUpdate,
@@ -33,6 +38,7 @@ class DrawingCanvas extends StatelessWidget {
         painter: DrawingCanvasPainter(
           elements: elements,
           selectedElement: selectedElement,
+          snapIndex: snapIndex,
         ),
         size: Size.infinite,
       ),
@@ -44,10 +50,12 @@ class DrawingCanvas extends StatelessWidget {
 class DrawingCanvasPainter extends CustomPainter {
   final List<DrawingElement> elements;
   final DrawingElement? selectedElement;
+  final SnapPointIndex? snapIndex;
 
   DrawingCanvasPainter({
     required this.elements,
     this.selectedElement,
+    this.snapIndex,
   });
 
   @override
@@ -128,7 +136,8 @@ class DrawingCanvasPainter extends CustomPainter {
   }
 
   /// 绘制吸附线
-  /// 只有当元素进入吸附阈值范围内时才显示吸附线
+  /// 只有当元素进入吸附阈值范围内时才显示吸附线，且只绘制落在画布可见区域
+  /// 内的线条
   void _drawSnapLines(Canvas canvas, Size canvasSize) {
     if (selectedElement == null) return;
 
@@ -136,6 +145,7 @@ class DrawingCanvasPainter extends CustomPainter {
     final visibleSnapLines = AdsorptionManager.getVisibleSnapLines(
       elements,
       selectedElement,
+      index: snapIndex,
     );
 
     if (visibleSnapLines.isEmpty) return;
@@ -145,41 +155,56 @@ class DrawingCanvasPainter extends CustomPainter {
       ..strokeWidth = 1.5
       ..style = PaintingStyle.stroke;
 
-    for (final snapLine in visibleSnapLines) {
-      Offset start = snapLine.start;
-      Offset end = snapLine.end;
+    // 线条长度贴近元素：取所有元素外扩 20 的包围范围并裁剪到画布，
+    // 只计算一次，而不是每条线都遍历一遍元素
+    final extent = _snapLineExtent(canvasSize);
+    if (extent == null) return;
 
-      // 调整线条长度以适应画布，但让线条更贴近元素
+    for (final snapLine in visibleSnapLines) {
       if (snapLine.type == SnapType.vertical) {
-        // 计算垂直线的合理范围
-        double minY = double.infinity;
-        double maxY = double.negativeInfinity;
-
-        for (final element in elements) {
-          final bounds = element.bounds;
-          minY = math.min(minY, bounds.top - 20);
-          maxY = math.max(maxY, bounds.bottom + 20);
-        }
-
-        start = Offset(snapLine.start.dx, math.max(0, minY));
-        end = Offset(snapLine.start.dx, math.min(canvasSize.height, maxY));
+        final x = snapLine.start.dx;
+        if (x < 0 || x > canvasSize.width) continue;
+        _drawDashedLine(
+          canvas,
+          Offset(x, extent.top),
+          Offset(x, extent.bottom),
+          snapLinePaint,
+        );
       } else if (snapLine.type == SnapType.horizontal) {
-        // 计算水平线的合理范围
-        double minX = double.infinity;
-        double maxX = double.negativeInfinity;
-
-        for (final element in elements) {
-          final bounds = element.bounds;
-          minX = math.min(minX, bounds.left - 20);
-          maxX = math.max(maxX, bounds.right + 20);
-        }
-
-        start = Offset(math.max(0, minX), snapLine.start.dy);
-        end = Offset(math.min(canvasSize.width, maxX), snapLine.start.dy);
+        final y = snapLine.start.dy;
+        if (y < 0 || y > canvasSize.height) continue;
+        _drawDashedLine(
+          canvas,
+          Offset(extent.left, y),
+          Offset(extent.right, y),
+          snapLinePaint,
+        );
       }
+    }
+  }
+
+  /// 吸附线的绘制范围，与画布不相交时返回 null
+  Rect? _snapLineExtent(Size canvasSize) {
+    double minX = double.infinity;
+    double minY = double.infinity;
+    double maxX = double.negativeInfinity;
+    double maxY = double.negativeInfinity;
 
-      _drawDashedLine(canvas, start, end, snapLinePaint);
+    for (final element in elements) {
+      final bounds = element.bounds;
+      minX = math.min(minX, bounds.left - 20);
+      minY = math.min(minY, bounds.top - 20);
+      maxX = math.max(maxX, bounds.right + 20);
+      maxY = math.max(maxY, bounds.bottom + 20);
     }
+
+    final extent = Rect.fromLTRB(
+      math.max(0, minX),
+      math.max(0, minY),
+      math.min(canvasSize.width, maxX),
+      math.min(canvasSize.height, maxY),
+    );
+    return extent.isEmpty ? null : extent;
   }
 
   /// 绘制虚线矩形
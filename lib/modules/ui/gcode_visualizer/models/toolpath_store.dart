@@ -0,0 +1,137 @@
+import 'dart:typed_data';
+
+import 'gcode_command.dart';
+import 'machine_position.dart';
+import 'toolpath_segment.dart';
+
+/// 列式存储的刀路轨迹。
+///
+/// 每段只占用若干个 typed-data 槽位，而不是一个 [ToolpathSegment] 加两个
+/// [MachinePosition] 对象。绘制与播放直接读取列数据；需要对象形式时通过
+/// `store[i]` 按需生成一个 [ToolpathSegment] 视图。
+class ToolpathStore {
+  ToolpathStore({
+    required this.commands,
+    required this.startX,
+    required this.startY,
+    required this.endX,
+    required this.endY,
+    required this.feedRate,
+    required this.types,
+    required this.commandIndex,
+    required this.segmentIndexOfCommand,
+  })  : assert(startX.length == endX.length),
+        assert(types.length == endX.length),
+        assert(commandIndex.length == endX.length),
+        assert(segmentIndexOfCommand.length == commands.length) {
+    _computeBounds();
+  }
+
+  factory ToolpathStore.empty() => ToolpathStore(
+        commands: const [],
+        startX: Float32List(0),
+        startY: Float32List(0),
+        endX: Float32List(0),
+        endY: Float32List(0),
+        feedRate: Float32List(0),
+        types: Uint8List(0),
+        commandIndex: Int32List(0),
+        segmentIndexOfCommand: Int32List(0),
+      );
+
+  /// 生成轨迹的源指令列表，`commandIndex` 中的值是它的下标。
+  final List<GcodeCommand> commands;
+
+  final Float32List startX;
+  final Float32List startY;
+  final Float32List endX;
+  final Float32List endY;
+  final Float32List feedRate;
+
+  /// [GcodeSegmentType.index]
+  final Uint8List types;
+
+  /// 段 -> 源指令下标
+  final Int32List commandIndex;
+
+  /// 源指令下标 -> 段下标，无运动的指令为 -1
+  final Int32List segmentIndexOfCommand;
+
+  double _minX = 0;
+  double _maxX = 0;
+  double _minY = 0;
+  double _maxY = 0;
+
+  int get length => endX.length;
+  bool get isEmpty => length == 0;
+  bool get isNotEmpty => length != 0;
+
+  double get minX => _minX;
+  double get maxX => _maxX;
+  double get minY => _minY;
+  double get maxY => _maxY;
+
+  GcodeSegmentType typeAt(int index) => GcodeSegmentType.values[types[index]];
+
+  bool isRapidAt(int index) => types[index] == GcodeSegmentType.rapid.index;
+
+  GcodeCommand commandAt(int index) => commands[commandIndex[index]];
+
+  int lineNumberAt(int index) => commands[commandIndex[index]].lineNumber;
+
+  /// 第一个源指令下标 >= [index] 的段，没有则返回 [length]。
+  ///
+  /// `commandIndex` 列单调递增，二分查找即可。
+  int segmentAtOrAfterCommand(int index) {
+    var low = 0;
+    var high = length;
+    while (low < high) {
+      final mid = (low + high) >> 1;
+      if (commandIndex[mid] < index) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  /// 按需生成对象视图；视图中 start/end 共用本段的进给率。
+  ToolpathSegment operator [](int index) {
+    RangeError.checkValidIndex(index, this, 'index', length);
+    return ToolpathSegment(
+      start: MachinePosition(
+        x: startX[index],
+        y: startY[index],
+        feedRate: feedRate[index],
+      ),
+      end: MachinePosition(
+        x: endX[index],
+        y: endY[index],
+        feedRate: feedRate[index],
+      ),
+      command: commandAt(index),
+      type: typeAt(index),
+    );
+  }
+
+  void _computeBounds() {
+    if (isEmpty) return;
+    var minX = startX[0];
+    var maxX = minX;
+    var minY = startY[0];
+    var maxY = minY;
+    for (var i = 0; i < length; i++) {
+      final x = endX[i];
+      final y = endY[i];
+      if (x < minX) minX = x;
+      if (x > maxX) maxX = x;
+      if (y < minY) minY = y;
+      if (y > maxY) maxY = y;
+    }
+    _minX = minX;
+    _maxX = maxX;
+    _minY = minY;
+    _maxY = maxY;
+  }
+}
@@ -91,6 +91,8 @@ class _GcodeVisualizerPageState extends State<GcodeVisualizerPage>
                   child: GcodeCanvas(
                     segments: _controller.segments,
                     progress: _controller.progress,
+                    currentSegmentIndex: _controller.currentSegmentIndex,
+                    segmentProgress: _controller.segmentProgress,
                     errorCount: _controller.errorCount,
                   ),
                 ),
@@ -109,6 +111,8 @@ class _GcodeVisualizerPageState extends State<GcodeVisualizerPage>
                 child: GcodeCanvas(
                   segments: _controller.segments,
                   progress: _controller.progress,
+                  currentSegmentIndex: _controller.currentSegmentIndex,
+                  segmentProgress: _controller.segmentProgress,
                   errorCount: _controller.errorCount,
                 ),
               ),
@@ -130,6 +134,8 @@ class _GcodeVisualizerPageState extends State<GcodeVisualizerPage>
           errorCount: _controller.errorCount,
           commandCount: _controller.totalCommands,
           hasParsed: _controller.parseResult != null,
+          isParsing: _controller.isParsing,
+          parseProgress: _controller.parseProgress,
         ),
         const SizedBox(height: 8),
         PlaybackControls(
@@ -149,7 +155,9 @@ class _GcodeVisualizerPageState extends State<GcodeVisualizerPage>
             child: CommandTimeline(
               commands: _controller.parseResult?.commands ?? [],
               errors: _controller.parseResult?.errors ?? [],
+              toolpath: _controller.segments,
               currentIndex: _controller.currentCommandIndex,
+              onTap: _controller.seekToCommand,
               maxHeight: 140,
             ),
           ),
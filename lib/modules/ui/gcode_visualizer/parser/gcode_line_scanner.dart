@@ -0,0 +1,239 @@
+import 'dart:typed_data';
+
+import '../models/gcode_command.dart';
+import 'gcode_parse_result.dart';
+
+/// 手写的单行扫描器，语义与 [GcodeParser] 保持一致，但不使用正则、
+/// 不为每个 token 创建字符串，内部缓冲区在多行之间复用。
+class GcodeLineScanner {
+  static const _tab = 0x09;
+  static const _space = 0x20;
+  static const _openParen = 0x28;
+  static const _closeParen = 0x29;
+  static const _minus = 0x2D;
+  static const _dot = 0x2E;
+  static const _semicolon = 0x3B;
+  static const _zero = 0x30;
+  static const _one = 0x31;
+  static const _lowerG = 0x67;
+
+  static const _maxFastDigits = 15;
+  static const _pow10 = [
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, //
+    1e11, 1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22,
+  ];
+
+  static final _letterKeys = List<String>.generate(
+    26,
+    (i) => String.fromCharCode(0x41 + i),
+    growable: false,
+  );
+
+  Uint16List _buffer = Uint16List(256);
+
+  /// 扫描 [source] 中 `[start, end)` 范围内的一行（不含换行符）。
+  ///
+  /// 有效指令追加到 [commands]，错误追加到 [errors]，空行与纯注释行被跳过。
+  void scanLine(
+    String source,
+    int start,
+    int end,
+    int lineNumber,
+    List<GcodeCommand> commands,
+    List<GcodeParseError> errors,
+  ) {
+    while (start < end && _isWhitespace(source.codeUnitAt(start))) {
+      start++;
+    }
+    while (end > start && _isWhitespace(source.codeUnitAt(end - 1))) {
+      end--;
+    }
+    if (start == end) return;
+
+    if (_buffer.length < end - start) {
+      _buffer = Uint16List(end - start);
+    }
+    final buffer = _buffer;
+
+    // 去掉括号注释，并以第一个 ';' 为界切分指令区和注释区
+    var length = 0;
+    var contentEnd = -1;
+    var inComment = false;
+    for (var i = start; i < end; i++) {
+      final ch = source.codeUnitAt(i);
+      if (ch == _openParen) {
+        inComment = true;
+      } else if (ch == _closeParen) {
+        inComment = false;
+      } else if (!inComment) {
+        if (ch == _semicolon && contentEnd < 0) {
+          contentEnd = length;
+        } else {
+          buffer[length++] = ch;
+        }
+      }
+    }
+    final hasComment = contentEnd >= 0;
+    if (!hasComment) contentEnd = length;
+
+    var pos = 0;
+    var contentLimit = contentEnd;
+    while (pos < contentLimit && _isWhitespace(buffer[pos])) {
+      pos++;
+    }
+    while (contentLimit > pos && _isWhitespace(buffer[contentLimit - 1])) {
+      contentLimit--;
+    }
+    if (pos == contentLimit) return;
+
+    final codeStart = pos;
+    while (pos < contentLimit && !_isSeparator(buffer[pos])) {
+      pos++;
+    }
+    final codeEnd = pos;
+
+    final code = _matchMotionCode(codeStart, codeEnd);
+    if (code == null) {
+      errors.add(
+        GcodeParseError(
+          lineNumber: lineNumber,
+          rawLine: source.substring(start, end),
+          message: 'Unsupported code: '
+              '${_text(codeStart, codeEnd).toUpperCase()}',
+        ),
+      );
+      return;
+    }
+
+    final params = <String, double>{};
+    while (pos < contentLimit) {
+      while (pos < contentLimit && _isSeparator(buffer[pos])) {
+        pos++;
+      }
+      if (pos == contentLimit) break;
+      final tokenStart = pos;
+      while (pos < contentLimit && !_isSeparator(buffer[pos])) {
+        pos++;
+      }
+
+      final letter = buffer[tokenStart] | 0x20;
+      final value = letter >= 0x61 && letter <= 0x7A
+          ? _parseNumber(tokenStart + 1, pos)
+          : null;
+      if (value == null) {
+        errors.add(
+          GcodeParseError(
+            lineNumber: lineNumber,
+            rawLine: source.substring(start, end),
+            message: 'Malformed parameter: ${_text(tokenStart, pos)}',
+          ),
+        );
+        return;
+      }
+      params[_letterKeys[letter - 0x61]] = value;
+    }
+
+    commands.add(
+      GcodeCommand(
+        lineNumber: lineNumber,
+        rawLine: source.substring(start, end),
+        code: code,
+        params: params,
+        comment: hasComment ? _trimmedText(contentEnd, length) : '',
+      ),
+    );
+  }
+
+  /// 仅识别 G0/G00/G1/G01（大小写不敏感），返回归一化后的代码。
+  String? _matchMotionCode(int start, int end) {
+    final buffer = _buffer;
+    final length = end - start;
+    if (length < 2 || length > 3) return null;
+    if (buffer[start] | 0x20 != _lowerG) return null;
+    if (length == 3 && buffer[start + 1] != _zero) return null;
+    return switch (buffer[end - 1]) {
+      _zero => 'G0',
+      _one => 'G1',
+      _ => null,
+    };
+  }
+
+  /// 解析 `-?(\d+\.?\d*|\.\d+)`，不匹配时返回 null。
+  ///
+  /// 有效数字不超过 15 位且小数位不超过 22 位时直接用整数尾数除以 10 的幂，
+  /// 结果与 [double.parse] 的正确舍入一致；否则回退到 [double.parse]。
+  double? _parseNumber(int start, int end) {
+    final buffer = _buffer;
+    var i = start;
+    final negative = i < end && buffer[i] == _minus;
+    if (negative) i++;
+
+    var mantissa = 0;
+    var significantDigits = 0;
+    var integerDigits = 0;
+    var fractionDigits = 0;
+    var seenDot = false;
+    for (; i < end; i++) {
+      final ch = buffer[i];
+      final digit = ch - _zero;
+      if (digit >= 0 && digit <= 9) {
+        if (seenDot) {
+          fractionDigits++;
+        } else {
+          integerDigits++;
+        }
+        if (mantissa != 0 || digit != 0) {
+          significantDigits++;
+          if (significantDigits <= _maxFastDigits) {
+            mantissa = mantissa * 10 + digit;
+          }
+        }
+      } else if (ch == _dot && !seenDot) {
+        seenDot = true;
+      } else {
+        return null;
+      }
+    }
+    if (integerDigits == 0 && fractionDigits == 0) return null;
+
+    if (significantDigits > _maxFastDigits ||
+        fractionDigits >= _pow10.length) {
+      return double.parse(_text(start, end));
+    }
+    var value = mantissa.toDouble();
+    if (fractionDigits > 0) value /= _pow10[fractionDigits];
+    return negative ? -value : value;
+  }
+
+  String _text(int start, int end) =>
+      String.fromCharCodes(_buffer, start, end);
+
+  String _trimmedText(int start, int end) {
+    while (start < end && _isWhitespace(_buffer[start])) {
+      start++;
+    }
+    while (end > start && _isWhitespace(_buffer[end - 1])) {
+      end--;
+    }
+    return start == end ? '' : _text(start, end);
+  }
+
+  static bool _isSeparator(int ch) => ch == _space || ch == _tab;
+
+  /// 与 [String.trim] 使用相同的空白字符集合。
+  static bool _isWhitespace(int ch) {
+    if (ch > _space && ch < 0x85) return false;
+    return ch == _space ||
+        (ch >= 0x09 && ch <= 0x0D) ||
+        ch == 0x85 ||
+        ch == 0xA0 ||
+        ch == 0x1680 ||
+        (ch >= 0x2000 && ch <= 0x200A) ||
+        ch == 0x2028 ||
+        ch == 0x2029 ||
+        ch == 0x202F ||
+        ch == 0x205F ||
+        ch == 0x3000 ||
+        ch == 0xFEFF;
+  }
+}
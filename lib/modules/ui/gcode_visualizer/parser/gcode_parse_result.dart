@@ -26,3 +26,25 @@ class GcodeParseResult {
 
   bool get hasErrors => errors.isNotEmpty;
 }
+
+/// 分块解析时的一次增量结果，只包含本块新增的指令与错误。
+class GcodeParseChunk {
+  const GcodeParseChunk({
+    required this.commands,
+    required this.errors,
+    required this.linesProcessed,
+    required this.charactersProcessed,
+    required this.totalCharacters,
+    required this.isLast,
+  });
+
+  final List<GcodeCommand> commands;
+  final List<GcodeParseError> errors;
+  final int linesProcessed;
+  final int charactersProcessed;
+  final int totalCharacters;
+  final bool isLast;
+
+  double get progress =>
+      totalCharacters == 0 ? 1.0 : charactersProcessed / totalCharacters;
+}
@@ -0,0 +1,185 @@
+import 'dart:async';
+import 'dart:isolate';
+
+import '../models/gcode_command.dart';
+import 'gcode_line_scanner.dart';
+import 'gcode_parse_result.dart';
+
+/// 面向大文件的分块解析器。
+///
+/// 按换行符原地逐行扫描（不 split 整个源码），使用 [GcodeLineScanner]
+/// 代替正则，每 [chunkSize] 行产出一个 [GcodeParseChunk]。
+/// [parseInBackground] 在后台 Isolate 中执行，并把分块结果逐个回传。
+class GcodeStreamParser {
+  const GcodeStreamParser({this.chunkSize = defaultChunkSize})
+      : assert(chunkSize > 0);
+
+  static const defaultChunkSize = 10000;
+  static const backgroundLineThreshold = 1000;
+  static const backgroundLengthThreshold = 100 * 1024;
+
+  final int chunkSize;
+
+  /// 小程序仍在 UI Isolate 同步解析；超过阈值时才值得付出 Isolate 启动开销。
+  static bool shouldParseInBackground(String source) {
+    if (source.length > backgroundLengthThreshold) return true;
+    var lines = 1;
+    var index = source.indexOf('\n');
+    while (index >= 0) {
+      if (++lines > backgroundLineThreshold) return true;
+      index = source.indexOf('\n', index + 1);
+    }
+    return false;
+  }
+
+  /// 在当前 Isolate 中同步地分块解析。
+  Iterable<GcodeParseChunk> parseChunks(String source) sync* {
+    final scanner = GcodeLineScanner();
+    final length = source.length;
+    var commands = <GcodeCommand>[];
+    var errors = <GcodeParseError>[];
+    var lineStart = 0;
+    var lineNumber = 0;
+    var linesInChunk = 0;
+
+    // 与 split('\n') 一致：末尾换行之后还有一个空行
+    while (lineStart <= length) {
+      var lineEnd = source.indexOf('\n', lineStart);
+      if (lineEnd < 0) lineEnd = length;
+      lineNumber++;
+      scanner.scanLine(
+        source,
+        lineStart,
+        lineEnd,
+        lineNumber,
+        commands,
+        errors,
+      );
+      lineStart = lineEnd + 1;
+
+      if (++linesInChunk >= chunkSize && lineStart <= length) {
+        yield GcodeParseChunk(
+          commands: commands,
+          errors: errors,
+          linesProcessed: lineNumber,
+          charactersProcessed: lineStart,
+          totalCharacters: length,
+          isLast: false,
+        );
+        commands = <GcodeCommand>[];
+        errors = <GcodeParseError>[];
+        linesInChunk = 0;
+      }
+    }
+
+    yield GcodeParseChunk(
+      commands: commands,
+      errors: errors,
+      linesProcessed: lineNumber,
+      charactersProcessed: length,
+      totalCharacters: length,
+      isLast: true,
+    );
+  }
+
+  /// 在当前 Isolate 中一次性解析，结果与 [GcodeParser.parse] 相同。
+  GcodeParseResult parse(String source) {
+    final commands = <GcodeCommand>[];
+    final errors = <GcodeParseError>[];
+    for (final chunk in parseChunks(source)) {
+      commands.addAll(chunk.commands);
+      errors.addAll(chunk.errors);
+    }
+    return GcodeParseResult(commands: commands, errors: errors);
+  }
+
+  /// 在后台 Isolate 中分块解析。
+  ///
+  /// 最后一个分块的 [GcodeParseChunk.isLast] 为 true，随后流关闭。
+  /// 取消订阅会立即终止后台 Isolate。
+  Stream<GcodeParseChunk> parseInBackground(String source) {
+    late final StreamController<GcodeParseChunk> controller;
+    ReceivePort? receivePort;
+    Isolate? isolate;
+    var cancelled = false;
+
+    void release() {
+      cancelled = true;
+      receivePort?.close();
+      receivePort = null;
+      isolate?.kill(priority: Isolate.immediate);
+      isolate = null;
+    }
+
+    void fail(Object error, StackTrace stackTrace) {
+      if (controller.isClosed) return;
+      release();
+      controller.addError(error, stackTrace);
+      controller.close();
+    }
+
+    Future<void> start() async {
+      final port = ReceivePort();
+      receivePort = port;
+      port.listen((dynamic message) {
+        if (message is GcodeParseChunk) {
+          controller.add(message);
+          if (message.isLast) {
+            release();
+            controller.close();
+          }
+        } else if (message is List && message.length == 2) {
+          // Isolate 的 onError 消息: [error, stackTrace]
+          fail(
+            StateError('G-code 后台解析失败: ${message[0]}'),
+            StackTrace.fromString('${message[1]}'),
+          );
+        }
+      });
+
+      try {
+        final spawned = await Isolate.spawn(
+          _parseInIsolate,
+          _BackgroundParseRequest(
+            sendPort: port.sendPort,
+            source: source,
+            chunkSize: chunkSize,
+          ),
+          onError: port.sendPort,
+        );
+        if (cancelled) {
+          spawned.kill(priority: Isolate.immediate);
+        } else {
+          isolate = spawned;
+        }
+      } catch (error, stackTrace) {
+        fail(error, stackTrace);
+      }
+    }
+
+    controller = StreamController<GcodeParseChunk>(
+      onListen: start,
+      onCancel: release,
+    );
+    return controller.stream;
+  }
+}
+
+class _BackgroundParseRequest {
+  const _BackgroundParseRequest({
+    required this.sendPort,
+    required this.source,
+    required this.chunkSize,
+  });
+
+  final SendPort sendPort;
+  final String source;
+  final int chunkSize;
+}
+
+void _parseInIsolate(_BackgroundParseRequest request) {
+  final parser = GcodeStreamParser(chunkSize: request.chunkSize);
+  for (final chunk in parser.parseChunks(request.source)) {
+    request.sendPort.send(chunk);
+  }
+}
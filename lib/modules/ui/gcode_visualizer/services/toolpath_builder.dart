@@ -1,35 +1,85 @@
+import 'dart:typed_data';
+
 import '../models/gcode_command.dart';
-import '../models/machine_position.dart';
-import '../models/toolpath_segment.dart';
+import '../models/toolpath_store.dart';
 
 class ToolpathBuilder {
-  static List<ToolpathSegment> build(List<GcodeCommand> commands) {
-    final segments = <ToolpathSegment>[];
-    var current = const MachinePosition();
+  static ToolpathStore build(List<GcodeCommand> commands) {
+    final count = _countSegments(commands);
+
+    final startX = Float32List(count);
+    final startY = Float32List(count);
+    final endX = Float32List(count);
+    final endY = Float32List(count);
+    final feedRate = Float32List(count);
+    final types = Uint8List(count);
+    final commandIndex = Int32List(count);
+    final segmentIndexOfCommand = Int32List(commands.length);
+
+    final rapid = GcodeSegmentType.rapid.index;
+    final linear = GcodeSegmentType.linear.index;
+
+    var x = 0.0;
+    var y = 0.0;
+    var feed = 0.0;
+    var segment = 0;
 
-    for (final cmd in commands) {
-      final next = cmd.toPosition(current);
+    for (var i = 0; i < commands.length; i++) {
+      final cmd = commands[i];
+      final cmdX = cmd.x;
+      final cmdY = cmd.y;
+      final nextX = cmdX ?? x;
+      final nextY = cmdY ?? y;
+      feed = cmd.feedRate ?? feed;
 
-      final hasMovement = (cmd.x != null && cmd.x != current.x) ||
-          (cmd.y != null && cmd.y != current.y);
+      final hasMovement =
+          (cmdX != null && cmdX != x) || (cmdY != null && cmdY != y);
 
       if (hasMovement) {
-        final type =
-            cmd.code == 'G0' ? GcodeSegmentType.rapid : GcodeSegmentType.linear;
-
-        segments.add(
-          ToolpathSegment(
-            start: current,
-            end: next,
-            command: cmd,
-            type: type,
-          ),
-        );
+        startX[segment] = x;
+        startY[segment] = y;
+        endX[segment] = nextX;
+        endY[segment] = nextY;
+        feedRate[segment] = feed;
+        types[segment] = cmd.code == 'G0' ? rapid : linear;
+        commandIndex[segment] = i;
+        segmentIndexOfCommand[i] = segment;
+        segment++;
+      } else {
+        segmentIndexOfCommand[i] = -1;
       }
 
-      current = next;
+      x = nextX;
+      y = nextY;
     }
 
-    return segments;
+    return ToolpathStore(
+      commands: commands,
+      startX: startX,
+      startY: startY,
+      endX: endX,
+      endY: endY,
+      feedRate: feedRate,
+      types: types,
+      commandIndex: commandIndex,
+      segmentIndexOfCommand: segmentIndexOfCommand,
+    );
+  }
+
+  static int _countSegments(List<GcodeCommand> commands) {
+    var x = 0.0;
+    var y = 0.0;
+    var count = 0;
+    for (var i = 0; i < commands.length; i++) {
+      final cmd = commands[i];
+      final cmdX = cmd.x;
+      final cmdY = cmd.y;
+      if ((cmdX != null && cmdX != x) || (cmdY != null && cmdY != y)) {
+        count++;
+      }
+      x = cmdX ?? x;
+      y = cmdY ?? y;
+    }
+    return count;
   }
 }
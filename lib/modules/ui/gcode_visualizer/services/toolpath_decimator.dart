@@ -0,0 +1,231 @@
+import 'dart:math';
+import 'dart:typed_data';
+
+import '../models/gcode_command.dart';
+import '../models/toolpath_store.dart';
+
+/// 机床坐标到屏幕坐标的 fit 映射（Y 轴翻转）。
+///
+/// 值相等即视口未变化，画布据此判断缓存是否失效。
+class ToolpathViewport {
+  const ToolpathViewport._({
+    required this.width,
+    required this.height,
+    required this.minX,
+    required this.maxX,
+    required this.minY,
+    required this.maxY,
+    required this.scale,
+    required this.offsetX,
+    required this.offsetY,
+  });
+
+  factory ToolpathViewport.fit({
+    required double width,
+    required double height,
+    required double minX,
+    required double maxX,
+    required double minY,
+    required double maxY,
+    double padding = 30,
+  }) {
+    final rangeX = maxX - minX;
+    final rangeY = maxY - minY;
+    final scaleX = (width - padding * 2) / max(rangeX, 1);
+    final scaleY = (height - padding * 2) / max(rangeY, 1);
+    final scale = min(scaleX, scaleY);
+    return ToolpathViewport._(
+      width: width,
+      height: height,
+      minX: minX,
+      maxX: maxX,
+      minY: minY,
+      maxY: maxY,
+      scale: scale,
+      offsetX: padding + (width - padding * 2 - rangeX * scale) / 2,
+      offsetY: padding + (height - padding * 2 - rangeY * scale) / 2,
+    );
+  }
+
+  factory ToolpathViewport.forStore(
+    ToolpathStore store, {
+    required double width,
+    required double height,
+  }) {
+    return ToolpathViewport.fit(
+      width: width,
+      height: height,
+      minX: store.minX,
+      maxX: store.maxX,
+      minY: store.minY,
+      maxY: store.maxY,
+    );
+  }
+
+  final double width;
+  final double height;
+  final double minX;
+  final double maxX;
+  final double minY;
+  final double maxY;
+  final double scale;
+  final double offsetX;
+  final double offsetY;
+
+  double screenX(double x) => offsetX + (x - minX) * scale;
+
+  double screenY(double y) => offsetY + (maxY - y) * scale;
+
+  @override
+  bool operator ==(Object other) {
+    return other is ToolpathViewport &&
+        other.width == width &&
+        other.height == height &&
+        other.minX == minX &&
+        other.maxX == maxX &&
+        other.minY == minY &&
+        other.maxY == maxY;
+  }
+
+  @override
+  int get hashCode => Object.hash(width, height, minX, maxX, minY, maxY);
+}
+
+/// 按类型分组、可直接交给 `Canvas.drawRawPoints(PointMode.lines, ...)`
+/// 的屏幕坐标线段：`[x0, y0, x1, y1, x0, y0, x1, y1, ...]`。
+class DecimatedToolpath {
+  const DecimatedToolpath({
+    required this.rapid,
+    required this.linear,
+  });
+
+  final Float32List rapid;
+  final Float32List linear;
+
+  int get lineCount => (rapid.length + linear.length) ~/ 4;
+}
+
+/// 像素级抽稀 (LOD)。
+///
+/// 连续的同类型线段在屏幕上落入同一像素时合并为一条，且只覆盖已绘制
+/// 像素的 1px 短线会被丢弃，因此缩小视图时短线图元数量不会超过像素数。
+/// 内部的像素标记数组在多次调用之间复用。
+class ToolpathDecimator {
+  Uint16List _stamps = Uint16List(0);
+  int _generation = 0;
+  int _width = 0;
+  int _height = 0;
+
+  DecimatedToolpath decimate(
+    ToolpathStore store,
+    ToolpathViewport viewport, {
+    int start = 0,
+    int? end,
+  }) {
+    final last = min(end ?? store.length, store.length);
+    _prepareStamps(viewport);
+    final rapid = _LineBuffer();
+    final linear = _LineBuffer();
+    final rapidType = GcodeSegmentType.rapid.index;
+    final rapidStamp = _generation;
+    final linearStamp = _generation + 1;
+
+    var runType = -1;
+    var anchorX = 0.0;
+    var anchorY = 0.0;
+    var anchorCell = -1;
+    var lastX = 0.0;
+    var lastY = 0.0;
+    var lastCell = -1;
+    var pending = false;
+
+    void emit(double bx, double by, int bCell) {
+      final isRapid = runType == rapidType;
+      final stamp = isRapid ? rapidStamp : linearStamp;
+      if (_isAdjacent(anchorCell, bCell) &&
+          _stamps[anchorCell] == stamp &&
+          _stamps[bCell] == stamp) {
+        return;
+      }
+      _stamps[anchorCell] = stamp;
+      _stamps[bCell] = stamp;
+      (isRapid ? rapid : linear).add(anchorX, anchorY, bx, by);
+    }
+
+    for (var i = start; i < last; i++) {
+      final type = store.types[i];
+      final sx = viewport.screenX(store.startX[i]);
+      final sy = viewport.screenY(store.startY[i]);
+      final sCell = _cellOf(sx, sy);
+
+      if (type != runType || sCell != lastCell) {
+        if (pending) emit(lastX, lastY, lastCell);
+        runType = type;
+        anchorX = sx;
+        anchorY = sy;
+        anchorCell = sCell;
+      }
+
+      lastX = viewport.screenX(store.endX[i]);
+      lastY = viewport.screenY(store.endY[i]);
+      lastCell = _cellOf(lastX, lastY);
+      pending = true;
+
+      if (lastCell != anchorCell) {
+        emit(lastX, lastY, lastCell);
+        anchorX = lastX;
+        anchorY = lastY;
+        anchorCell = lastCell;
+        pending = false;
+      }
+    }
+    if (pending) emit(lastX, lastY, lastCell);
+
+    return DecimatedToolpath(rapid: rapid.toList(), linear: linear.toList());
+  }
+
+  void _prepareStamps(ToolpathViewport viewport) {
+    _width = max(1, viewport.width.ceil());
+    _height = max(1, viewport.height.ceil());
+    final cells = _width * _height;
+    // 每次抽稀占用两个标记值（快速/线性），用代数计数代替清零
+    if (_stamps.length < cells || _generation + 3 > 0xFFFF) {
+      _stamps = Uint16List(max(cells, _stamps.length));
+      _generation = 1;
+    } else {
+      _generation += 2;
+    }
+  }
+
+  int _cellOf(double x, double y) {
+    final cx = x.clamp(0.0, _width - 1.0).toInt();
+    final cy = y.clamp(0.0, _height - 1.0).toInt();
+    return cy * _width + cx;
+  }
+
+  bool _isAdjacent(int a, int b) {
+    final dx = (a % _width) - (b % _width);
+    final dy = (a ~/ _width) - (b ~/ _width);
+    return dx.abs() <= 1 && dy.abs() <= 1;
+  }
+}
+
+class _LineBuffer {
+  Float32List _data = Float32List(256);
+  int _length = 0;
+
+  void add(double x0, double y0, double x1, double y1) {
+    if (_length + 4 > _data.length) {
+      final grown = Float32List(_data.length * 2);
+      grown.setRange(0, _length, _data);
+      _data = grown;
+    }
+    _data[_length] = x0;
+    _data[_length + 1] = y0;
+    _data[_length + 2] = x1;
+    _data[_length + 3] = y1;
+    _length += 4;
+  }
+
+  Float32List toList() => Float32List.sublistView(_data, 0, _length);
+}
@@ -0,0 +1,121 @@
+import 'dart:math';
+import 'dart:typed_data';
+
+import '../models/toolpath_store.dart';
+
+/// 预计算的路径长度与加工时间前缀和，用于按时间比例播放与定位。
+///
+/// `cumulativeTime[i]` 是第 i 段结束时的累计时间（秒），单调递增，
+/// 因此进度 -> 段的映射可以用二分查找完成；顺序播放时再利用上一次的
+/// 段下标作为提示，每帧代价与程序规模无关。
+class ToolpathTiming {
+  ToolpathTiming._(this.cumulativeLength, this.cumulativeTime);
+
+  /// G0 没有 F 值，按常见机床快速移动速度估算 (mm/min)。
+  static const defaultRapidFeedRate = 5000.0;
+
+  /// G1 在出现第一个 F 之前使用的进给率 (mm/min)。
+  static const defaultFeedRate = 1000.0;
+
+  factory ToolpathTiming.fromStore(
+    ToolpathStore store, {
+    double rapidFeedRate = defaultRapidFeedRate,
+    double fallbackFeedRate = defaultFeedRate,
+  }) {
+    final count = store.length;
+    final cumulativeLength = Float64List(count);
+    final cumulativeTime = Float64List(count);
+    var totalLength = 0.0;
+    var totalTime = 0.0;
+
+    for (var i = 0; i < count; i++) {
+      final dx = store.endX[i] - store.startX[i];
+      final dy = store.endY[i] - store.startY[i];
+      final length = sqrt(dx * dx + dy * dy);
+      final feed = store.isRapidAt(i)
+          ? rapidFeedRate
+          : store.feedRate[i] > 0
+              ? store.feedRate[i]
+              : fallbackFeedRate;
+      totalLength += length;
+      totalTime += length / feed * 60;
+      cumulativeLength[i] = totalLength;
+      cumulativeTime[i] = totalTime;
+    }
+
+    return ToolpathTiming._(cumulativeLength, cumulativeTime);
+  }
+
+  factory ToolpathTiming.empty() =>
+      ToolpathTiming._(Float64List(0), Float64List(0));
+
+  final Float64List cumulativeLength;
+  final Float64List cumulativeTime;
+
+  int get length => cumulativeTime.length;
+  bool get isEmpty => length == 0;
+  bool get isNotEmpty => length != 0;
+
+  double get totalLength => isEmpty ? 0 : cumulativeLength[length - 1];
+
+  /// 预计加工时间（秒）。
+  double get totalTime => isEmpty ? 0 : cumulativeTime[length - 1];
+
+  double segmentStartTime(int index) =>
+      index <= 0 ? 0 : cumulativeTime[index - 1];
+
+  /// 第 [index] 段开始时对应的播放进度 (0..1)。
+  double progressAtSegmentStart(int index) {
+    final total = totalTime;
+    return total <= 0 ? 0 : segmentStartTime(index) / total;
+  }
+
+  /// 返回进度 [progress] 所在的段下标，空轨迹返回 -1。
+  ///
+  /// 每段占据 `[开始时间, 结束时间)`，进度 1.0 落在最后一段。
+  /// [hint] 为上一次的结果：向前播放时从它开始倍增查找，代价只与两帧之间
+  /// 经过的段数有关；没有提示或向后跳转时对全表二分查找。
+  int segmentAt(double progress, {int hint = -1}) {
+    if (isEmpty) return -1;
+    final total = totalTime;
+    final time = progress.clamp(0.0, 1.0) * total;
+    if (time >= total) return length - 1;
+
+    if (hint >= 0 && hint < length && time >= segmentStartTime(hint)) {
+      if (time < cumulativeTime[hint]) return hint;
+      var low = hint + 1;
+      var high = low;
+      var step = 1;
+      while (high < length - 1 && cumulativeTime[high] <= time) {
+        low = high + 1;
+        step <<= 1;
+        high = min(hint + step, length - 1);
+      }
+      return _firstEndingAfter(time, low, high);
+    }
+    return _firstEndingAfter(time, 0, length - 1);
+  }
+
+  /// 进度 [progress] 在第 [index] 段内部的比例 (0..1)。
+  double localProgress(int index, double progress) {
+    if (index < 0 || index >= length) return 0;
+    final start = segmentStartTime(index);
+    final duration = cumulativeTime[index] - start;
+    if (duration <= 0) return 1;
+    final time = progress.clamp(0.0, 1.0) * totalTime;
+    return ((time - start) / duration).clamp(0.0, 1.0);
+  }
+
+  /// `[low, high]` 中第一个累计时间 > [time] 的段。
+  int _firstEndingAfter(double time, int low, int high) {
+    while (low < high) {
+      final mid = (low + high) >> 1;
+      if (cumulativeTime[mid] <= time) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+}
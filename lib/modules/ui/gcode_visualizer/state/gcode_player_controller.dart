@@ -1,9 +1,14 @@
+import 'dart:async';
+
 import 'package:flutter/material.dart';
 
-import '../models/toolpath_segment.dart';
+import '../models/gcode_command.dart';
+import '../models/toolpath_store.dart';
 import '../parser/gcode_parse_result.dart';
 import '../parser/gcode_parser.dart';
+import '../parser/gcode_stream_parser.dart';
 import '../services/toolpath_builder.dart';
+import '../services/toolpath_timing.dart';
 
 const _kDefaultSample = '''
 ; Flutter G-code visualizer sample
@@ -16,6 +21,9 @@ G1 X60 Y20
 G0 X0 Y0
 ''';
 
+const _kMaxLoggedParseErrors = 5;
+const _kMinPlaybackDuration = Duration(seconds: 1);
+
 class GcodePlayerController extends ChangeNotifier {
   GcodePlayerController({
     required TickerProvider vsync,
@@ -30,11 +38,20 @@ class GcodePlayerController extends ChangeNotifier {
 
   late final AnimationController _animationController;
   final _parser = GcodeParser();
+  final _streamParser = const GcodeStreamParser();
 
   String _source = _kDefaultSample.trim();
   GcodeParseResult? _parseResult;
-  List<ToolpathSegment> _segments = [];
+  StreamSubscription<GcodeParseChunk>? _parseSubscription;
+  bool _isParsing = false;
+  double _parseProgress = 0;
+  List<GcodeCommand> _pendingCommands = [];
+  List<GcodeParseError> _pendingErrors = [];
+  ToolpathStore _segments = ToolpathStore.empty();
+  ToolpathTiming _timing = ToolpathTiming.empty();
   int _currentCommandIndex = -1;
+  int _currentSegmentIndex = -1;
+  double _segmentProgress = 0;
   bool _isPlaying = false;
   double _progress = 0;
   double _speedMultiplier = 1.0;
@@ -42,15 +59,23 @@ class GcodePlayerController extends ChangeNotifier {
 
   String get source => _source;
   GcodeParseResult? get parseResult => _parseResult;
-  List<ToolpathSegment> get segments => _segments;
+  ToolpathStore get segments => _segments;
+  ToolpathTiming get timing => _timing;
   int get currentCommandIndex => _currentCommandIndex;
+  int get currentSegmentIndex => _currentSegmentIndex;
+  double get segmentProgress => _segmentProgress;
   bool get isPlaying => _isPlaying;
   double get progress => _progress;
   double get speedMultiplier => _speedMultiplier;
   List<String> get logs => List.unmodifiable(_logs);
+  bool get isParsing => _isParsing;
+  double get parseProgress => _parseProgress;
 
-  int get totalCommands => _parseResult?.commands.length ?? 0;
-  int get errorCount => _parseResult?.errors.length ?? 0;
+  int get totalCommands => _isParsing
+      ? _pendingCommands.length
+      : _parseResult?.commands.length ?? 0;
+  int get errorCount =>
+      _isParsing ? _pendingErrors.length : _parseResult?.errors.length ?? 0;
 
   void updateSource(String value) {
     _source = value;
@@ -58,32 +83,48 @@ class GcodePlayerController extends ChangeNotifier {
   }
 
   void parse() {
-    final result = _parser.parse(_source);
-    _parseResult = result;
-    _segments = result.hasErrors
-        ? ToolpathBuilder.build(
-            result.commands,
-          )
-        : ToolpathBuilder.build(result.commands);
+    _cancelParsing();
     _currentCommandIndex = -1;
+    _currentSegmentIndex = -1;
+    _segmentProgress = 0;
     _progress = 0;
     _isPlaying = false;
     _animationController.stop();
     _animationController.value = 0;
-    _addLog('解析完成: ${result.commands.length} 条指令, ${result.errors.length} 个错误');
+
+    if (!GcodeStreamParser.shouldParseInBackground(_source)) {
+      _applyParseResult(_parser.parse(_source));
+      return;
+    }
+
+    _parseResult = null;
+    _segments = ToolpathStore.empty();
+    _timing = ToolpathTiming.empty();
+    _isParsing = true;
+    _parseProgress = 0;
+    _pendingCommands = [];
+    _pendingErrors = [];
+    _addLog('开始后台解析: ${_source.length} 字符');
     notifyListeners();
+
+    _parseSubscription = _streamParser.parseInBackground(_source).listen(
+          _onParseChunk,
+          onError: _onParseFailed,
+        );
   }
 
   void play() {
-    if (_segments.isEmpty) return;
+    if (_isParsing || _segments.isEmpty) return;
     if (_progress >= 1.0) {
       _progress = 0;
       _animationController.value = 0;
     }
     _isPlaying = true;
-    _animationController.duration = Duration(
-      milliseconds: (5000 / _speedMultiplier).round(),
+    final duration = Duration(
+      microseconds: (_timing.totalTime * 1e6 / _speedMultiplier).round(),
     );
+    _animationController.duration =
+        duration < _kMinPlaybackDuration ? _kMinPlaybackDuration : duration;
     _animationController.forward(from: _progress);
     _addLog('开始播放');
     notifyListeners();
@@ -100,6 +141,8 @@ class GcodePlayerController extends ChangeNotifier {
     _isPlaying = false;
     _progress = 0;
     _currentCommandIndex = -1;
+    _currentSegmentIndex = -1;
+    _segmentProgress = 0;
     _animationController.stop();
     _animationController.value = 0;
     _addLog('重置');
@@ -117,8 +160,30 @@ class GcodePlayerController extends ChangeNotifier {
 
   void seek(double value) {
     _progress = value.clamp(0.0, 1.0);
-    _animationController.value = _progress;
-    _updateCurrentCommandIndex();
+    _moveAnimationTo(_progress);
+    _updatePlaybackPosition();
+    notifyListeners();
+  }
+
+  /// 跳转到指令所在段的起点；无运动的指令跳到其后的第一段。
+  void seekToCommand(int commandIndex) {
+    if (_segments.isEmpty) return;
+    final mapping = _segments.segmentIndexOfCommand;
+    if (commandIndex < 0 || commandIndex >= mapping.length) return;
+    var segment = mapping[commandIndex];
+    if (segment < 0) {
+      segment = _segments.segmentAtOrAfterCommand(commandIndex);
+    }
+    if (segment >= _segments.length) {
+      seek(1.0);
+      return;
+    }
+    _progress = _timing.progressAtSegmentStart(segment);
+    _moveAnimationTo(_progress);
+    // 直接使用目标段，避免进度换算的舍入误差落回上一段
+    _currentSegmentIndex = segment;
+    _segmentProgress = 0;
+    _currentCommandIndex = _segments.commandIndex[segment];
     notifyListeners();
   }
 
@@ -128,9 +193,61 @@ class GcodePlayerController extends ChangeNotifier {
     notifyListeners();
   }
 
+  void _onParseChunk(GcodeParseChunk chunk) {
+    _pendingCommands.addAll(chunk.commands);
+    for (final error in chunk.errors) {
+      if (_pendingErrors.length < _kMaxLoggedParseErrors) {
+        _addLog('解析错误 $error');
+      }
+      _pendingErrors.add(error);
+    }
+    _parseProgress = chunk.progress;
+
+    if (!chunk.isLast) {
+      notifyListeners();
+      return;
+    }
+
+    _parseSubscription = null;
+    _isParsing = false;
+    _applyParseResult(
+      GcodeParseResult(commands: _pendingCommands, errors: _pendingErrors),
+    );
+    _pendingCommands = [];
+    _pendingErrors = [];
+  }
+
+  void _onParseFailed(Object error) {
+    _parseSubscription = null;
+    _isParsing = false;
+    _pendingCommands = [];
+    _pendingErrors = [];
+    _addLog('后台解析失败: $error');
+    notifyListeners();
+  }
+
+  void _cancelParsing() {
+    _parseSubscription?.cancel();
+    _parseSubscription = null;
+    _isParsing = false;
+  }
+
+  void _applyParseResult(GcodeParseResult result) {
+    _parseResult = result;
+    _segments = ToolpathBuilder.build(result.commands);
+    _timing = ToolpathTiming.fromStore(_segments);
+    _parseProgress = 1.0;
+    _addLog('解析完成: ${result.commands.length} 条指令, ${result.errors.length} 个错误');
+    if (_timing.isNotEmpty) {
+      _addLog('路径长度 ${_timing.totalLength.toStringAsFixed(1)} mm, '
+          '预计加工 ${_timing.totalTime.toStringAsFixed(1)} 秒');
+    }
+    notifyListeners();
+  }
+
   void _onAnimationTick() {
     _progress = _animationController.value;
-    _updateCurrentCommandIndex();
+    _updatePlaybackPosition();
     notifyListeners();
   }
 
@@ -138,24 +255,33 @@ class GcodePlayerController extends ChangeNotifier {
     if (status != AnimationStatus.completed) return;
     _isPlaying = false;
     _progress = 1.0;
-    _updateCurrentCommandIndex();
+    _updatePlaybackPosition();
     _addLog('播放完成');
     notifyListeners();
   }
 
-  void _updateCurrentCommandIndex() {
+  /// 设置 value 会停止动画，播放中跳转后需要从新位置继续。
+  void _moveAnimationTo(double value) {
+    if (_isPlaying && value < 1.0) {
+      _animationController.forward(from: value);
+    } else {
+      _animationController.value = value;
+    }
+  }
+
+  /// 进度按预计加工时间映射到段：顺序播放时利用上一帧的段下标，
+  /// 跳转时二分查找，与程序规模无关。
+  void _updatePlaybackPosition() {
     if (_segments.isEmpty) {
+      _currentSegmentIndex = -1;
+      _segmentProgress = 0;
       _currentCommandIndex = -1;
       return;
     }
-    final totalSegments = _segments.length;
-    final idx = (_progress * totalSegments).floor().clamp(0, totalSegments - 1);
-    final cmd = _segments[idx].command;
-    final cmdIdx = _parseResult?.commands.indexWhere(
-          (c) => c.lineNumber == cmd.lineNumber,
-        ) ??
-        -1;
-    _currentCommandIndex = cmdIdx;
+    final segment = _timing.segmentAt(_progress, hint: _currentSegmentIndex);
+    _currentSegmentIndex = segment;
+    _segmentProgress = _timing.localProgress(segment, _progress);
+    _currentCommandIndex = _segments.commandIndex[segment];
   }
 
   void _addLog(String message) {
@@ -168,6 +294,7 @@ class GcodePlayerController extends ChangeNotifier {
 
   @override
   void dispose() {
+    _cancelParsing();
     _animationController.dispose();
     super.dispose();
   }
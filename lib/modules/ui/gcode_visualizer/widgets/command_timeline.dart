@@ -1,6 +1,7 @@
 import 'package:flutter/material.dart';
 
 import '../models/gcode_command.dart';
+import '../models/toolpath_store.dart';
 import '../parser/gcode_parse_result.dart';
 
 class CommandTimeline extends StatelessWidget {
@@ -8,6 +9,7 @@ class CommandTimeline extends StatelessWidget {
     super.key,
     required this.commands,
     required this.errors,
+    this.toolpath,
     this.currentIndex = -1,
     this.onTap,
     this.maxHeight,
@@ -15,6 +17,7 @@ class CommandTimeline extends StatelessWidget {
 
   final List<GcodeCommand> commands;
   final List<GcodeParseError> errors;
+  final ToolpathStore? toolpath;
   final int currentIndex;
   final ValueChanged<int>? onTap;
   final double? maxHeight;
@@ -76,11 +79,12 @@ class CommandTimeline extends StatelessWidget {
                 final item = items[index];
                 final cmd = item.command;
                 final error = item.error;
-                final commandIndex = cmd == null ? -1 : commands.indexOf(cmd);
+                final commandIndex = item.commandIndex;
                 final isCurrent =
                     commandIndex >= 0 && commandIndex == currentIndex;
                 final hasError = error != null;
                 final code = cmd?.code;
+                final hasMovement = _hasMovement(commandIndex);
 
                 return InkWell(
                   onTap: onTap != null && commandIndex >= 0
@@ -118,9 +122,11 @@ class CommandTimeline extends StatelessWidget {
                           decoration: BoxDecoration(
                             color: hasError
                                 ? Colors.red.withValues(alpha: 0.15)
-                                : code == 'G0'
-                                    ? Colors.blue.withValues(alpha: 0.15)
-                                    : Colors.green.withValues(alpha: 0.15),
+                                : !hasMovement
+                                    ? Colors.grey.withValues(alpha: 0.15)
+                                    : code == 'G0'
+                                        ? Colors.blue.withValues(alpha: 0.15)
+                                        : Colors.green.withValues(alpha: 0.15),
                             borderRadius: BorderRadius.circular(3),
                           ),
                           child: Text(
@@ -130,9 +136,11 @@ class CommandTimeline extends StatelessWidget {
                               fontWeight: FontWeight.w600,
                               color: hasError
                                   ? Colors.red
-                                  : code == 'G0'
-                                      ? Colors.blue
-                                      : Colors.green,
+                                  : !hasMovement
+                                      ? Colors.grey
+                                      : code == 'G0'
+                                          ? Colors.blue
+                                          : Colors.green,
                               fontFamily: 'monospace',
                             ),
                           ),
@@ -177,12 +185,31 @@ class CommandTimeline extends StatelessWidget {
     );
   }
 
+  /// 没有轨迹数据时按有运动处理，保持原有配色。
+  bool _hasMovement(int commandIndex) {
+    final store = toolpath;
+    if (store == null || commandIndex < 0) return true;
+    if (commandIndex >= store.segmentIndexOfCommand.length) return true;
+    return store.segmentIndexOfCommand[commandIndex] >= 0;
+  }
+
+  /// commands 与 errors 均按行号递增，归并即可，无需排序。
   List<_TimelineItem> _buildTimelineItems() {
-    final items = <_TimelineItem>[
-      for (final command in commands) _TimelineItem.command(command),
-      for (final error in errors) _TimelineItem.error(error),
-    ];
-    items.sort((a, b) => a.lineNumber.compareTo(b.lineNumber));
+    final items = <_TimelineItem>[];
+    var c = 0;
+    var e = 0;
+    while (c < commands.length || e < errors.length) {
+      final takeCommand = e >= errors.length ||
+          (c < commands.length &&
+              commands[c].lineNumber <= errors[e].lineNumber);
+      if (takeCommand) {
+        items.add(_TimelineItem.command(commands[c], c));
+        c++;
+      } else {
+        items.add(_TimelineItem.error(errors[e]));
+        e++;
+      }
+    }
     return items;
   }
 }
@@ -191,13 +218,16 @@ class _TimelineItem {
   const _TimelineItem._({
     required this.lineNumber,
     required this.rawLine,
+    this.commandIndex = -1,
     this.command,
     this.error,
   });
 
-  factory _TimelineItem.command(GcodeCommand command) => _TimelineItem._(
+  factory _TimelineItem.command(GcodeCommand command, int commandIndex) =>
+      _TimelineItem._(
         lineNumber: command.lineNumber,
         rawLine: command.rawLine,
+        commandIndex: commandIndex,
         command: command,
       );
 
@@ -209,6 +239,7 @@ class _TimelineItem {
 
   final int lineNumber;
   final String rawLine;
+  final int commandIndex;
   final GcodeCommand? command;
   final GcodeParseError? error;
 }
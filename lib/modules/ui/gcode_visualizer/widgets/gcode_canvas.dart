@@ -1,24 +1,44 @@
-import 'dart:math';
+import 'dart:ui' as ui;
 
 import 'package:flutter/material.dart';
 
-import '../models/gcode_command.dart';
-import '../models/toolpath_segment.dart';
+import '../models/toolpath_store.dart';
+import '../services/toolpath_decimator.dart';
 
-class GcodeCanvas extends StatelessWidget {
+class GcodeCanvas extends StatefulWidget {
   const GcodeCanvas({
     super.key,
     required this.segments,
     required this.progress,
+    this.currentSegmentIndex = -1,
+    this.segmentProgress = 0,
     this.errorCount = 0,
   });
 
-  final List<ToolpathSegment> segments;
+  final ToolpathStore segments;
   final double progress;
+  final int currentSegmentIndex;
+  final double segmentProgress;
   final int errorCount;
 
+  @override
+  State<GcodeCanvas> createState() => _GcodeCanvasState();
+}
+
+class _GcodeCanvasState extends State<GcodeCanvas> {
+  final _layerCache = _ToolpathLayerCache();
+
+  @override
+  void dispose() {
+    _layerCache.dispose();
+    super.dispose();
+  }
+
   @override
   Widget build(BuildContext context) {
+    final segments = widget.segments;
+    final errorCount = widget.errorCount;
+
     return Container(
       decoration: BoxDecoration(
         color: Colors.grey.shade50,
@@ -60,7 +80,10 @@ class GcodeCanvas extends StatelessWidget {
             size: Size(constraints.maxWidth, constraints.maxHeight),
             painter: _ToolpathPainter(
               segments: segments,
-              progress: progress,
+              progress: widget.progress,
+              currentSegmentIndex: widget.currentSegmentIndex,
+              segmentProgress: widget.segmentProgress,
+              cache: _layerCache,
             ),
           );
         },
@@ -69,227 +92,270 @@ class GcodeCanvas extends StatelessWidget {
   }
 }
 
-class _ToolpathPainter extends CustomPainter {
-  _ToolpathPainter({
-    required this.segments,
-    required this.progress,
-  });
-
-  final List<ToolpathSegment> segments;
-  final double progress;
-
-  static const _padding = 30.0;
+/// 缓存的静态图层与已完成路径图层。
+///
+/// 静态图层（网格 + 完整路径）只在轨迹或视口变化时重新录制。已完成路径按
+/// 段区间录制为若干 Picture，播放前进时只追加新完成的区间，并像二进制计数器
+/// 一样合并相邻的等长区间，使每帧绘制的 Picture 数保持在 O(log n)。
+class _ToolpathLayerCache {
   static const _gridSpacing = 20.0;
 
-  @override
-  void paint(Canvas canvas, Size size) {
-    if (segments.isEmpty) return;
+  static final _gridPaint = Paint()
+    ..color = Colors.grey.withValues(alpha: 0.15)
+    ..strokeWidth = 0.5;
+  static final _fullRapidPaint = Paint()
+    ..color = Colors.blue.withValues(alpha: 0.15)
+    ..strokeWidth = 0.5
+    ..style = PaintingStyle.stroke;
+  static final _fullLinearPaint = Paint()
+    ..color = Colors.green.withValues(alpha: 0.15)
+    ..strokeWidth = 1
+    ..style = PaintingStyle.stroke;
+  static final _doneRapidPaint = Paint()
+    ..color = Colors.blue
+    ..strokeWidth = 1.5
+    ..style = PaintingStyle.stroke
+    ..strokeCap = StrokeCap.round;
+  static final _doneLinearPaint = Paint()
+    ..color = Colors.green
+    ..strokeWidth = 2.5
+    ..style = PaintingStyle.stroke
+    ..strokeCap = StrokeCap.round;
+
+  final _decimator = ToolpathDecimator();
+  ToolpathStore? _store;
+  ToolpathViewport? _viewport;
+  ui.Picture? _staticLayer;
+  final List<_CompletedChunk> _completed = [];
+
+  /// 轨迹或视口变化时丢弃全部缓存。
+  void sync(ToolpathStore store, ToolpathViewport viewport) {
+    if (identical(store, _store) && viewport == _viewport) return;
+    _clear();
+    _store = store;
+    _viewport = viewport;
+  }
 
-    final bounds = _calculateBounds();
-    final machineRangeX = bounds.maxX - bounds.minX;
-    final machineRangeY = bounds.maxY - bounds.minY;
-    final scaleX = (size.width - _padding * 2) / max(machineRangeX, 1);
-    final scaleY = (size.height - _padding * 2) / max(machineRangeY, 1);
-    final scale = min(scaleX, scaleY);
-
-    final offsetX =
-        _padding + (size.width - _padding * 2 - machineRangeX * scale) / 2;
-    final offsetY =
-        _padding + (size.height - _padding * 2 - machineRangeY * scale) / 2;
-
-    _drawGrid(canvas, size, bounds, scale, offsetX, offsetY);
-    _drawFullPath(canvas, bounds, scale, offsetX, offsetY);
-    _drawAnimatedPath(canvas, bounds, scale, offsetX, offsetY);
-    _drawToolHead(canvas, bounds, scale, offsetX, offsetY);
-    _drawOrigin(canvas, bounds, scale, offsetX, offsetY);
+  ui.Picture staticLayer() {
+    return _staticLayer ??= _record((canvas) {
+      _drawGrid(canvas, _viewport!);
+      _drawLines(canvas, 0, _store!.length, _fullRapidPaint, _fullLinearPaint);
+    });
   }
 
-  void _drawGrid(
-    Canvas canvas,
-    Size size,
-    _Bounds bounds,
-    double scale,
-    double offsetX,
-    double offsetY,
-  ) {
-    final gridPaint = Paint()
-      ..color = Colors.grey.withValues(alpha: 0.15)
-      ..strokeWidth = 0.5;
-
-    final gridStep = _gridSpacing / scale;
-
-    var x = (bounds.minX / gridStep).floor() * gridStep;
-    while (x <= bounds.maxX) {
-      final sx = offsetX + (x - bounds.minX) * scale;
-      canvas.drawLine(Offset(sx, offsetY),
-          Offset(sx, offsetY + (bounds.maxY - bounds.minY) * scale), gridPaint);
-      x += gridStep;
+  /// 返回覆盖 `[0, count)` 段的已完成图层，必要时只追加缺少的区间。
+  Iterable<ui.Picture> completedLayers(int count) {
+    while (_completed.isNotEmpty && _completed.last.end > count) {
+      _completed.removeLast().picture.dispose();
     }
-
-    var y = (bounds.minY / gridStep).floor() * gridStep;
-    while (y <= bounds.maxY) {
-      final sy = offsetY + (bounds.maxY - y - bounds.minY) * scale;
-      canvas.drawLine(Offset(offsetX, sy),
-          Offset(offsetX + (bounds.maxX - bounds.minX) * scale, sy), gridPaint);
-      y += gridStep;
+    final from = _completed.isEmpty ? 0 : _completed.last.end;
+    if (count > from) {
+      _completed.add(_recordCompleted(from, count));
+      while (_completed.length >= 2 &&
+          _completed[_completed.length - 2].length <=
+              _completed.last.length) {
+        final last = _completed.removeLast();
+        final previous = _completed.removeLast();
+        last.picture.dispose();
+        previous.picture.dispose();
+        _completed.add(_recordCompleted(previous.start, last.end));
+      }
     }
+    return _completed.map((chunk) => chunk.picture);
   }
 
-  void _drawFullPath(
-    Canvas canvas,
-    _Bounds bounds,
-    double scale,
-    double offsetX,
-    double offsetY,
-  ) {
-    for (final seg in segments) {
-      final sx = offsetX + (seg.start.x - bounds.minX) * scale;
-      final sy = offsetY + (bounds.maxY - seg.start.y - bounds.minY) * scale;
-      final ex = offsetX + (seg.end.x - bounds.minX) * scale;
-      final ey = offsetY + (bounds.maxY - seg.end.y - bounds.minY) * scale;
-
-      final paint = Paint()
-        ..color = seg.type == GcodeSegmentType.rapid
-            ? Colors.blue.withValues(alpha: 0.15)
-            : Colors.green.withValues(alpha: 0.15)
-        ..strokeWidth = 1
-        ..style = PaintingStyle.stroke;
-
-      if (seg.type == GcodeSegmentType.rapid) {
-        paint.strokeWidth = 0.5;
-      }
+  void dispose() => _clear();
 
-      canvas.drawLine(Offset(sx, sy), Offset(ex, ey), paint);
-    }
+  _CompletedChunk _recordCompleted(int start, int end) {
+    return _CompletedChunk(
+      start,
+      end,
+      _record((canvas) {
+        _drawLines(canvas, start, end, _doneRapidPaint, _doneLinearPaint);
+      }),
+    );
   }
 
-  void _drawAnimatedPath(
+  void _drawLines(
     Canvas canvas,
-    _Bounds bounds,
-    double scale,
-    double offsetX,
-    double offsetY,
+    int start,
+    int end,
+    Paint rapidPaint,
+    Paint linearPaint,
   ) {
-    if (progress <= 0 || segments.isEmpty) return;
-
-    final totalSegments = segments.length;
-    final currentSegFloat = progress * totalSegments;
-    final currentSegIndex = currentSegFloat.floor().clamp(0, totalSegments - 1);
-    final localProgress = (currentSegFloat - currentSegIndex).clamp(0.0, 1.0);
-
-    for (var i = 0; i <= currentSegIndex && i < totalSegments; i++) {
-      final seg = segments[i];
-      final isCurrent = i == currentSegIndex;
-
-      var endX = seg.end.x;
-      var endY = seg.end.y;
+    final lines = _decimator.decimate(
+      _store!,
+      _viewport!,
+      start: start,
+      end: end,
+    );
+    if (lines.rapid.isNotEmpty) {
+      canvas.drawRawPoints(ui.PointMode.lines, lines.rapid, rapidPaint);
+    }
+    if (lines.linear.isNotEmpty) {
+      canvas.drawRawPoints(ui.PointMode.lines, lines.linear, linearPaint);
+    }
+  }
 
-      if (isCurrent) {
-        endX = seg.start.x + (seg.end.x - seg.start.x) * localProgress;
-        endY = seg.start.y + (seg.end.y - seg.start.y) * localProgress;
-      }
+  void _drawGrid(Canvas canvas, ToolpathViewport viewport) {
+    final step = _gridSpacing / viewport.scale;
+    if (!step.isFinite || step <= 0) return;
+    final top = viewport.screenY(viewport.maxY);
+    final bottom = viewport.screenY(viewport.minY);
+    final left = viewport.screenX(viewport.minX);
+    final right = viewport.screenX(viewport.maxX);
+    final points = <double>[];
+
+    var x = (viewport.minX / step).floor() * step;
+    while (x <= viewport.maxX) {
+      final sx = viewport.screenX(x);
+      points.addAll([sx, top, sx, bottom]);
+      x += step;
+    }
 
-      final sx = offsetX + (seg.start.x - bounds.minX) * scale;
-      final sy = offsetY + (bounds.maxY - seg.start.y - bounds.minY) * scale;
-      final ex = offsetX + (endX - bounds.minX) * scale;
-      final ey = offsetY + (bounds.maxY - endY - bounds.minY) * scale;
+    var y = (viewport.minY / step).floor() * step;
+    while (y <= viewport.maxY) {
+      final sy = viewport.screenY(y);
+      points.addAll([left, sy, right, sy]);
+      y += step;
+    }
 
-      final paint = Paint()
-        ..color =
-            seg.type == GcodeSegmentType.rapid ? Colors.blue : Colors.green
-        ..strokeWidth = seg.type == GcodeSegmentType.rapid ? 1.5 : 2.5
-        ..style = PaintingStyle.stroke
-        ..strokeCap = StrokeCap.round;
+    canvas.drawRawPoints(
+      ui.PointMode.lines,
+      Float32List.fromList(points),
+      _gridPaint,
+    );
+  }
 
-      if (seg.type == GcodeSegmentType.rapid) {
-        paint.strokeWidth = 1.5;
-      }
+  ui.Picture _record(void Function(Canvas canvas) draw) {
+    final recorder = ui.PictureRecorder();
+    draw(Canvas(recorder));
+    return recorder.endRecording();
+  }
 
-      canvas.drawLine(Offset(sx, sy), Offset(ex, ey), paint);
+  void _clear() {
+    _staticLayer?.dispose();
+    _staticLayer = null;
+    for (final chunk in _completed) {
+      chunk.picture.dispose();
     }
+    _completed.clear();
+    _store = null;
+    _viewport = null;
   }
+}
 
-  void _drawToolHead(
-    Canvas canvas,
-    _Bounds bounds,
-    double scale,
-    double offsetX,
-    double offsetY,
-  ) {
-    if (progress <= 0 || segments.isEmpty) return;
+class _CompletedChunk {
+  const _CompletedChunk(this.start, this.end, this.picture);
 
-    final totalSegments = segments.length;
-    final currentSegFloat = progress * totalSegments;
-    final currentSegIndex = currentSegFloat.floor().clamp(0, totalSegments - 1);
-    final localProgress = (currentSegFloat - currentSegIndex).clamp(0.0, 1.0);
-    final seg = segments[currentSegIndex];
+  final int start;
+  final int end;
+  final ui.Picture picture;
+
+  int get length => end - start;
+}
 
-    final toolX = seg.start.x + (seg.end.x - seg.start.x) * localProgress;
-    final toolY = seg.start.y + (seg.end.y - seg.start.y) * localProgress;
+class _ToolpathPainter extends CustomPainter {
+  _ToolpathPainter({
+    required this.segments,
+    required this.progress,
+    required this.currentSegmentIndex,
+    required this.segmentProgress,
+    required this.cache,
+  });
 
-    final sx = offsetX + (toolX - bounds.minX) * scale;
-    final sy = offsetY + (bounds.maxY - toolY - bounds.minY) * scale;
+  final ToolpathStore segments;
+  final double progress;
+  final int currentSegmentIndex;
+  final double segmentProgress;
+  final _ToolpathLayerCache cache;
+
+  static final _currentRapidPaint = Paint()
+    ..color = Colors.blue
+    ..strokeWidth = 1.5
+    ..style = PaintingStyle.stroke
+    ..strokeCap = StrokeCap.round;
+  static final _currentLinearPaint = Paint()
+    ..color = Colors.green
+    ..strokeWidth = 2.5
+    ..style = PaintingStyle.stroke
+    ..strokeCap = StrokeCap.round;
+  static final _toolPaint = Paint()
+    ..color = Colors.red
+    ..style = PaintingStyle.fill;
+  static final _toolGlowPaint = Paint()
+    ..color = Colors.red.withValues(alpha: 0.3)
+    ..style = PaintingStyle.fill;
+  static final _originPaint = Paint()
+    ..color = Colors.orange.withValues(alpha: 0.6)
+    ..strokeWidth = 1.5
+    ..style = PaintingStyle.stroke;
+  static final _originDotPaint = Paint()
+    ..color = Colors.orange.withValues(alpha: 0.6)
+    ..style = PaintingStyle.fill;
 
-    final paint = Paint()
-      ..color = Colors.red
-      ..style = PaintingStyle.fill;
+  @override
+  void paint(Canvas canvas, Size size) {
+    if (segments.isEmpty) return;
 
-    canvas.drawCircle(Offset(sx, sy), 5, paint);
+    final viewport = ToolpathViewport.forStore(
+      segments,
+      width: size.width,
+      height: size.height,
+    );
+    cache.sync(segments, viewport);
 
-    final outerPaint = Paint()
-      ..color = Colors.red.withValues(alpha: 0.3)
-      ..style = PaintingStyle.fill;
-    canvas.drawCircle(Offset(sx, sy), 10, outerPaint);
+    canvas.drawPicture(cache.staticLayer());
+    _drawAnimatedPath(canvas, viewport);
+    _drawOrigin(canvas, viewport);
   }
 
-  void _drawOrigin(
-    Canvas canvas,
-    _Bounds bounds,
-    double scale,
-    double offsetX,
-    double offsetY,
-  ) {
-    final ox = offsetX + (0 - bounds.minX) * scale;
-    final oy = offsetY + (bounds.maxY - 0 - bounds.minY) * scale;
+  void _drawAnimatedPath(Canvas canvas, ToolpathViewport viewport) {
+    if (progress <= 0 || currentSegmentIndex < 0) return;
 
-    final paint = Paint()
-      ..color = Colors.orange.withValues(alpha: 0.6)
-      ..strokeWidth = 1.5
-      ..style = PaintingStyle.stroke;
+    final currentSegIndex = currentSegmentIndex.clamp(0, segments.length - 1);
+    final localProgress = segmentProgress;
 
-    const size = 6;
-    canvas.drawLine(Offset(ox - size, oy), Offset(ox + size, oy), paint);
-    canvas.drawLine(Offset(ox, oy - size), Offset(ox, oy + size), paint);
-    canvas.drawCircle(Offset(ox, oy), 2, paint..style = PaintingStyle.fill);
+    for (final picture in cache.completedLayers(currentSegIndex)) {
+      canvas.drawPicture(picture);
+    }
+
+    final startX = segments.startX[currentSegIndex];
+    final startY = segments.startY[currentSegIndex];
+    final toolX =
+        startX + (segments.endX[currentSegIndex] - startX) * localProgress;
+    final toolY =
+        startY + (segments.endY[currentSegIndex] - startY) * localProgress;
+
+    final start = Offset(viewport.screenX(startX), viewport.screenY(startY));
+    final tool = Offset(viewport.screenX(toolX), viewport.screenY(toolY));
+
+    canvas.drawLine(
+      start,
+      tool,
+      segments.isRapidAt(currentSegIndex)
+          ? _currentRapidPaint
+          : _currentLinearPaint,
+    );
+    canvas.drawCircle(tool, 5, _toolPaint);
+    canvas.drawCircle(tool, 10, _toolGlowPaint);
   }
 
-  _Bounds _calculateBounds() {
-    var minX = double.infinity;
-    var maxX = double.negativeInfinity;
-    var minY = double.infinity;
-    var maxY = double.negativeInfinity;
-
-    for (final seg in segments) {
-      minX = min(minX, min(seg.start.x, seg.end.x));
-      maxX = max(maxX, max(seg.start.x, seg.end.x));
-      minY = min(minY, min(seg.start.y, seg.end.y));
-      maxY = max(maxY, max(seg.start.y, seg.end.y));
-    }
+  void _drawOrigin(Canvas canvas, ToolpathViewport viewport) {
+    final ox = viewport.screenX(0);
+    final oy = viewport.screenY(0);
 
-    return _Bounds(minX, maxX, minY, maxY);
+    const size = 6;
+    canvas.drawLine(Offset(ox - size, oy), Offset(ox + size, oy), _originPaint);
+    canvas.drawLine(Offset(ox, oy - size), Offset(ox, oy + size), _originPaint);
+    canvas.drawCircle(Offset(ox, oy), 2, _originDotPaint);
   }
 
   @override
   bool shouldRepaint(covariant _ToolpathPainter oldDelegate) {
-    return oldDelegate.progress != progress || oldDelegate.segments != segments;
+    return oldDelegate.progress != progress ||
+        oldDelegate.currentSegmentIndex != currentSegmentIndex ||
+        oldDelegate.segmentProgress != segmentProgress ||
+        oldDelegate.segments != segments;
   }
 }
-
-class _Bounds {
-  const _Bounds(this.minX, this.maxX, this.minY, this.maxY);
-
-  final double minX;
-  final double maxX;
-  final double minY;
-  final double maxY;
-}
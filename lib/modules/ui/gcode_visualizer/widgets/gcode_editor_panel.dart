@@ -9,6 +9,8 @@ class GcodeEditorPanel extends StatefulWidget {
     required this.errorCount,
     required this.commandCount,
     required this.hasParsed,
+    this.isParsing = false,
+    this.parseProgress = 0,
   });
 
   final TextEditingController controller;
@@ -17,6 +19,8 @@ class GcodeEditorPanel extends StatefulWidget {
   final int errorCount;
   final int commandCount;
   final bool hasParsed;
+  final bool isParsing;
+  final double parseProgress;
 
   @override
   State<GcodeEditorPanel> createState() => _GcodeEditorPanelState();
@@ -128,7 +132,29 @@ class _GcodeEditorPanelState extends State<GcodeEditorPanel> {
               ),
             ),
           ),
-          if (widget.hasParsed)
+          if (widget.isParsing)
+            Padding(
+              padding: const EdgeInsets.fromLTRB(12, 0, 12, 8),
+              child: Row(
+                children: [
+                  Expanded(
+                    child: LinearProgressIndicator(
+                      value: widget.parseProgress,
+                      minHeight: 4,
+                    ),
+                  ),
+                  const SizedBox(width: 8),
+                  Text(
+                    '后台解析 ${(widget.parseProgress * 100).toStringAsFixed(0)}%',
+                    style: TextStyle(
+                      fontSize: 11,
+                      color: Colors.grey.shade700,
+                    ),
+                  ),
+                ],
+              ),
+            ),
+          if (widget.hasParsed || widget.isParsing)
             Padding(
               padding: const EdgeInsets.fromLTRB(12, 0, 12, 8),
               child: Row(
@@ -0,0 +1,246 @@
+import 'package:flutter/foundation.dart';
+
+import 'table_column.dart';
+import 'table_query.dart';
+
+/// 一页行数据，单元格按行优先顺序平铺在一个列表中
+class TableRowPage {
+  TableRowPage({
+    required this.start,
+    required this.columnCount,
+    required this.rowIds,
+    required this.cells,
+  }) : assert(cells.length == rowIds.length * columnCount);
+
+  /// 本页第一行在表格中的位置
+  final int start;
+  final int columnCount;
+
+  /// 每行在原始数据中的行号（排序/筛选后与位置不同）
+  final Int32List rowIds;
+  final List<String> cells;
+
+  int get rowCount => rowIds.length;
+
+  String cell(int localRow, int column) =>
+      cells[localRow * columnCount + column];
+}
+
+/// 按页提供行数据的数据源
+///
+/// ScrollTable 只在行进入可见区域附近时才请求对应的页，数据源可以来自
+/// 内存、数据库或网络。
+abstract class TableRowSource {
+  List<String> get columnHeaders;
+
+  int get rowCount;
+
+  /// 加载 [start, start + count) 的行，超出 [rowCount] 的部分截断
+  Future<TableRowPage> loadPage(int start, int count);
+}
+
+/// 基于 [ColumnarTable] 的数据源，支持在后台 Isolate 排序和筛选
+class ColumnarRowSource implements TableRowSource {
+  ColumnarRowSource(this.table, {this.latency = Duration.zero});
+
+  final ColumnarTable table;
+
+  /// 模拟远程数据源的加载延迟
+  final Duration latency;
+
+  TableQuery _query = const TableQuery();
+
+  // 查询结果：第 i 行对应原表的 _order[i] 行；为 null 时按原顺序
+  Int32List? _order;
+
+  TableQuery get query => _query;
+
+  @override
+  List<String> get columnHeaders => table.headers;
+
+  @override
+  int get rowCount => _order?.length ?? table.rowCount;
+
+  @override
+  Future<TableRowPage> loadPage(int start, int count) async {
+    // 即使没有延迟也让出一次事件循环，不在 build 中格式化整页
+    await Future<void>.delayed(latency);
+
+    final end = (start + count).clamp(start, rowCount);
+    final order = _order;
+    final rowIds = Int32List(end - start);
+    final columnCount = table.columnCount;
+    final cells = List<String>.filled(rowIds.length * columnCount, '');
+    var index = 0;
+    for (var i = 0; i < rowIds.length; i++) {
+      final row = order == null ? start + i : order[start + i];
+      rowIds[i] = row;
+      for (var column = 0; column < columnCount; column++) {
+        cells[index++] = table.format(row, column);
+      }
+    }
+    return TableRowPage(
+      start: start,
+      columnCount: columnCount,
+      rowIds: rowIds,
+      cells: cells,
+    );
+  }
+
+  /// 应用新的排序/筛选条件，完成后行顺序立即生效
+  ///
+  /// 调用方需要随后调用 [RowPageCache.invalidate] 丢弃旧顺序的页。
+  Future<void> applyQuery(TableQuery query) async {
+    final order = query.isEmpty ? null : await runTableQuery(table, query);
+    _query = query;
+    _order = order;
+  }
+}
+
+/// 行数据的页缓存
+///
+/// - 单元格访问是同步的：页已加载时直接返回，否则返回 null 并开始加载
+/// - 最多保留 [maxPages] 页，按最近访问顺序淘汰
+/// - [updateViewport] 根据滚动方向预取前方的 [prefetchPages] 页
+/// - 页加载完成后通知监听者重建
+class RowPageCache extends ChangeNotifier {
+  RowPageCache(
+    this.source, {
+    this.pageSize = 128,
+    this.maxPages = 32,
+    this.prefetchPages = 2,
+  })  : assert(pageSize > 0),
+        assert(maxPages > prefetchPages + 1);
+
+  final TableRowSource source;
+  final int pageSize;
+  final int maxPages;
+  final int prefetchPages;
+
+  // Map 字面量保持插入顺序，访问时移到末尾即为 LRU
+  final Map<int, TableRowPage> _pages = {};
+  final Set<int> _loading = {};
+  final Map<int, Object> _failed = {};
+
+  // 数据源顺序变化后递增，之前发出的加载结果作废
+  int _generation = 0;
+  int _lastFirstRow = 0;
+  bool _scrollingForward = true;
+  bool _disposed = false;
+
+  int _hits = 0;
+  int _misses = 0;
+  int _loads = 0;
+  int _evictions = 0;
+
+  int get rowCount => source.rowCount;
+  List<String> get columnHeaders => source.columnHeaders;
+
+  int get hits => _hits;
+  int get misses => _misses;
+  int get loads => _loads;
+  int get evictions => _evictions;
+  int get cachedPageCount => _pages.length;
+  int get loadingPageCount => _loading.length;
+
+  /// 加载失败的页及错误，[invalidate] 后重试
+  Map<int, Object> get failedPages => Map.unmodifiable(_failed);
+
+  /// 已缓存的页号，从最久未访问到最近访问
+  Iterable<int> get cachedPages => _pages.keys;
+
+  bool isRowLoaded(int row) => _pages.containsKey(row ~/ pageSize);
+
+  /// 单元格文本，页尚未加载时返回 null
+  String? cellAt(int row, int column) {
+    final page = _touch(row ~/ pageSize);
+    return page?.cell(row - page.start, column);
+  }
+
+  /// 行在原始数据中的行号，页尚未加载时返回 null
+  int? rowIdAt(int row) {
+    final page = _touch(row ~/ pageSize);
+    return page?.rowIds[row - page.start];
+  }
+
+  /// 通知当前可见的行范围，加载可见页并沿滚动方向预取
+  void updateViewport(int firstRow, int lastRow) {
+    if (rowCount == 0) return;
+    if (firstRow != _lastFirstRow) {
+      _scrollingForward = firstRow > _lastFirstRow;
+      _lastFirstRow = firstRow;
+    }
+
+    final lastPage = (rowCount - 1) ~/ pageSize;
+    final firstVisible = (firstRow ~/ pageSize).clamp(0, lastPage);
+    final lastVisible = (lastRow ~/ pageSize).clamp(0, lastPage);
+    for (var page = firstVisible; page <= lastVisible; page++) {
+      _load(page);
+    }
+    for (var i = 1; i <= prefetchPages; i++) {
+      final page = _scrollingForward ? lastVisible + i : firstVisible - i;
+      if (page < 0 || page > lastPage) break;
+      _load(page);
+    }
+  }
+
+  /// 丢弃所有页（数据源顺序或内容变化后调用）
+  void invalidate() {
+    _generation++;
+    _pages.clear();
+    _loading.clear();
+    _failed.clear();
+    notifyListeners();
+  }
+
+  @override
+  void dispose() {
+    _disposed = true;
+    super.dispose();
+  }
+
+  TableRowPage? _touch(int pageIndex) {
+    final page = _pages.remove(pageIndex);
+    if (page == null) {
+      _misses++;
+      _load(pageIndex);
+      return null;
+    }
+    _pages[pageIndex] = page;
+    _hits++;
+    return page;
+  }
+
+  void _load(int pageIndex) {
+    if (_pages.containsKey(pageIndex) ||
+        _loading.contains(pageIndex) ||
+        _failed.containsKey(pageIndex)) {
+      return;
+    }
+    final start = pageIndex * pageSize;
+    if (start >= rowCount) return;
+
+    _loading.add(pageIndex);
+    _loads++;
+    final generation = _generation;
+    source.loadPage(start, pageSize).then(
+      (page) {
+        if (_disposed || generation != _generation) return;
+        _loading.remove(pageIndex);
+        _pages[pageIndex] = page;
+        while (_pages.length > maxPages) {
+          _pages.remove(_pages.keys.first);
+          _evictions++;
+        }
+        notifyListeners();
+      },
+      onError: (Object error, StackTrace stackTrace) {
+        if (_disposed || generation != _generation) return;
+        _loading.remove(pageIndex);
+        _failed[pageIndex] = error;
+        debugPrint('RowPageCache: failed to load page $pageIndex: $error');
+        notifyListeners();
+      },
+    );
+  }
+}
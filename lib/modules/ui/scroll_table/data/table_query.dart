@@ -0,0 +1,160 @@
+import 'dart:isolate';
+import 'dart:typed_data';
+
+import 'table_column.dart';
+
+/// 单列筛选条件
+sealed class ColumnFilter {
+  const ColumnFilter(this.column);
+
+  final int column;
+
+  /// 针对具体的列生成判断函数，可以预先计算的部分只算一次
+  bool Function(int row) bind(TableColumn column);
+}
+
+/// 数值范围筛选（闭区间，未指定的一端不限制）
+final class RangeFilter extends ColumnFilter {
+  const RangeFilter(super.column, {this.min, this.max});
+
+  final num? min;
+  final num? max;
+
+  @override
+  bool Function(int row) bind(TableColumn column) {
+    final lower = min ?? double.negativeInfinity;
+    final upper = max ?? double.infinity;
+    return switch (column) {
+      IntColumn(:final values) => (row) {
+          final value = values[row];
+          return value >= lower && value <= upper;
+        },
+      DoubleColumn(:final values) => (row) {
+          final value = values[row];
+          return value >= lower && value <= upper;
+        },
+      CategoryColumn() => throw ArgumentError(
+          'RangeFilter cannot be applied to text column ${this.column}',
+        ),
+    };
+  }
+}
+
+/// 文本包含筛选（忽略大小写）
+final class ContainsFilter extends ColumnFilter {
+  const ContainsFilter(super.column, this.text);
+
+  final String text;
+
+  @override
+  bool Function(int row) bind(TableColumn column) {
+    final needle = text.toLowerCase();
+    if (column case CategoryColumn(:final categories, :final codes)) {
+      // 只对每个类别判断一次
+      final matches = Uint8List(categories.length);
+      for (var i = 0; i < categories.length; i++) {
+        if (categories[i].toLowerCase().contains(needle)) matches[i] = 1;
+      }
+      return (row) => matches[codes[row]] == 1;
+    }
+    return (row) => column.format(row).toLowerCase().contains(needle);
+  }
+}
+
+/// 排序和筛选条件
+class TableQuery {
+  const TableQuery({
+    this.sortColumn,
+    this.ascending = true,
+    this.filters = const [],
+  });
+
+  final int? sortColumn;
+  final bool ascending;
+  final List<ColumnFilter> filters;
+
+  bool get isEmpty => sortColumn == null && filters.isEmpty;
+
+  /// 查询涉及的列
+  Set<int> get columns => {
+        if (sortColumn != null) sortColumn!,
+        for (final filter in filters) filter.column,
+      };
+
+  TableQuery copyWith({
+    int? sortColumn,
+    bool? ascending,
+    List<ColumnFilter>? filters,
+  }) {
+    return TableQuery(
+      sortColumn: sortColumn ?? this.sortColumn,
+      ascending: ascending ?? this.ascending,
+      filters: filters ?? this.filters,
+    );
+  }
+}
+
+/// 在后台 Isolate 中执行查询，返回结果行在原表中的行号
+///
+/// 只把查询涉及的列复制到后台 Isolate；结果通过 `Isolate.exit` 返回，
+/// 不会再复制一次。
+Future<Int32List> runTableQuery(ColumnarTable table, TableQuery query) {
+  final request = _QueryRequest(
+    columns: {for (final index in query.columns) index: table.columns[index]},
+    rowCount: table.rowCount,
+    query: query,
+  );
+  return Isolate.run(() => computeRowOrder(
+        request.columns,
+        request.rowCount,
+        request.query,
+      ));
+}
+
+/// 先筛选再排序，排序值相同的行保持原来的顺序
+Int32List computeRowOrder(
+  Map<int, TableColumn> columns,
+  int rowCount,
+  TableQuery query,
+) {
+  final predicates = [
+    for (final filter in query.filters) filter.bind(columns[filter.column]!),
+  ];
+
+  var rows = Int32List(rowCount);
+  var count = 0;
+  for (var row = 0; row < rowCount; row++) {
+    var keep = true;
+    for (final predicate in predicates) {
+      if (!predicate(row)) {
+        keep = false;
+        break;
+      }
+    }
+    if (keep) rows[count++] = row;
+  }
+  if (count < rowCount) rows = rows.sublist(0, count);
+
+  final sortColumn = query.sortColumn;
+  if (sortColumn != null) {
+    final compare = columns[sortColumn]!.rowComparator();
+    final direction = query.ascending ? 1 : -1;
+    rows.sort((a, b) {
+      final result = compare(a, b);
+      return result != 0 ? result * direction : a - b;
+    });
+  }
+  return rows;
+}
+
+class _QueryRequest {
+  const _QueryRequest({
+    required this.columns,
+    required this.rowCount,
+    required this.query,
+  });
+
+  final Map<int, TableColumn> columns;
+  final int rowCount;
+  final TableQuery query;
+}
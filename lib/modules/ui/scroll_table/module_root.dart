@@ -1,7 +1,18 @@
+import 'dart:isolate';
+
 import 'package:flutter/material.dart';
 
+import 'data/row_data_source.dart';
+import 'data/table_column.dart';
+import 'data/table_query.dart';
 import 'widgets/scroll_table.dart';
 
+const _kLargeRowCount = 1000000;
+
+// 顶层函数交给 Isolate.run，避免闭包捕获 State
+ColumnarTable _generateLargeTable() =>
+    TableData.generateLargeTable(_kLargeRowCount);
+
 class ScrollTableDemo extends StatefulWidget {
   const ScrollTableDemo({super.key});
 
@@ -10,8 +21,84 @@ class ScrollTableDemo extends StatefulWidget {
 }
 
 class _ScrollTableDemoState extends State<ScrollTableDemo> {
+  bool _largeMode = false;
+  ColumnarRowSource? _source;
+  RowPageCache? _rows;
+  bool _busy = false;
+  String _status = '';
+
+  @override
+  void dispose() {
+    _rows?.dispose();
+    super.dispose();
+  }
+
+  Future<void> _toggleLargeMode(bool enabled) async {
+    setState(() => _largeMode = enabled);
+    // 已在生成时不再重复启动，沿用进行中的结果
+    if (!enabled || _rows != null || _busy) return;
+
+    setState(() {
+      _busy = true;
+      _status = '正在生成 $_kLargeRowCount 行数据…';
+    });
+    final watch = Stopwatch()..start();
+    // 在后台 Isolate 生成，结果通过 Isolate.exit 转移，不阻塞界面
+    final table = await Isolate.run(_generateLargeTable);
+    if (!mounted) return;
+    if (!_largeMode) {
+      // 生成期间已关闭大数据模式，丢弃结果，下次打开时重新生成
+      setState(() {
+        _busy = false;
+        _status = '';
+      });
+      return;
+    }
+    final source = ColumnarRowSource(table);
+    setState(() {
+      _source = source;
+      _rows = RowPageCache(source);
+      _busy = false;
+      _status = '生成 ${table.rowCount} 行 × ${table.columnCount} 列，'
+          '耗时 ${watch.elapsedMilliseconds}ms';
+    });
+  }
+
+  Future<void> _applyQuery(TableQuery query) async {
+    final source = _source;
+    final rows = _rows;
+    if (source == null || rows == null || _busy) return;
+
+    setState(() => _busy = true);
+    final watch = Stopwatch()..start();
+    await source.applyQuery(query);
+    if (!mounted) return;
+    rows.invalidate();
+    setState(() {
+      _busy = false;
+      _status = '${source.rowCount} 行，排序/筛选耗时 '
+          '${watch.elapsedMilliseconds}ms（后台 Isolate）';
+    });
+  }
+
+  void _onColumnHeaderTap(int column) {
+    final query = _source!.query;
+    final ascending = query.sortColumn == column ? !query.ascending : true;
+    _applyQuery(query.copyWith(sortColumn: column, ascending: ascending));
+  }
+
+  void _onNameFilter(String text) {
+    final query = _source!.query;
+    _applyQuery(TableQuery(
+      sortColumn: query.sortColumn,
+      ascending: query.ascending,
+      filters: [if (text.isNotEmpty) ContainsFilter(0, text)],
+    ));
+  }
+
   @override
   Widget build(BuildContext context) {
+    final rows = _rows;
     return Scaffold(
       appBar: AppBar(
         title: const Text('二维滚动表格演示'),
@@ -22,28 +109,66 @@ class _ScrollTableDemoState extends State<ScrollTableDemo> {
         child: Column(
           crossAxisAlignment: CrossAxisAlignment.start,
           children: [
-            const Text(
-              '员工信息表格',
-              style: TextStyle(fontSize: 18, fontWeight: FontWeight.bold),
+            Row(
+              children: [
+                const Expanded(
+                  child: Text(
+                    '员工信息表格',
+                    style: TextStyle(fontSize: 18, fontWeight: FontWeight.bold),
+                  ),
+                ),
+                const Text('百万行'),
+                Switch(value: _largeMode, onChanged: _toggleLargeMode),
+              ],
             ),
             const SizedBox(height: 8),
-            const Text(
-              '支持横向和纵向滚动，固定表头和行头',
-              style: TextStyle(fontSize: 14, color: Colors.grey),
+            Text(
+              _largeMode
+                  ? '按需分页加载，点击列头排序；$_status'
+                  : '支持横向和纵向滚动，固定表头和行头',
+              style: const TextStyle(fontSize: 14, color: Colors.grey),
             ),
-            const SizedBox(height: 16),
-            Expanded(
-              child: ScrollTable(
-                columnHeaders: TableData.getColumnHeaders(),
-                rowHeaders: TableData.getRowHeaders(),
-                data: TableData.getSampleData(),
-                cellHeight: 56.0,
-                cellWidth: 140.0,
+            if (_largeMode && rows != null) ...[
+              const SizedBox(height: 8),
+              TextField(
+                decoration: const InputDecoration(
+                  isDense: true,
+                  prefixIcon: Icon(Icons.search),
+                  hintText: '按姓名筛选，回车执行',
+                ),
+                enabled: !_busy,
+                onSubmitted: _onNameFilter,
               ),
-            ),
+            ],
+            const SizedBox(height: 16),
+            Expanded(child: _buildTable(rows)),
           ],
         ),
       ),
     );
   }
+
+  Widget _buildTable(RowPageCache? rows) {
+    if (!_largeMode) {
+      return ScrollTable(
+        columnHeaders: TableData.getColumnHeaders(),
+        rowHeaders: TableData.getRowHeaders(),
+        data: TableData.getSampleData(),
+        cellHeight: 56.0,
+        cellWidth: 140.0,
+      );
+    }
+    if (rows == null) {
+      return const Center(child: CircularProgressIndicator());
+    }
+    final query = _source!.query;
+    return ScrollTable.paged(
+      rows: rows,
+      cellHeight: 56.0,
+      cellWidth: 140.0,
+      sortColumn: query.sortColumn,
+      sortAscending: query.ascending,
+      onColumnHeaderTap: _busy ? null : _onColumnHeaderTap,
+    );
+  }
 }
@@ -1,13 +1,33 @@
+import 'dart:typed_data';
+
 import 'package:flutter/material.dart';
 import 'package:two_dimensional_scrollables/two_dimensional_scrollables.dart';
 
-class ScrollTable extends StatelessWidget {
+import '../data/row_data_source.dart';
+import '../data/table_column.dart';
+
+/// 二维滚动表格
+///
+/// 默认构造函数直接显示内存中的 [data]；[ScrollTable.paged] 通过
+/// [RowPageCache] 按需拉取可见区域附近的行，适合百万行级别的数据。
+class ScrollTable extends StatefulWidget {
   final List<String> columnHeaders;
   final List<String> rowHeaders;
   final List<List<String>> data;
+  final RowPageCache? rows;
   final double cellHeight;
   final double cellWidth;
 
+  /// 纵向滚动控制器，不传时内部创建
+  final ScrollController? verticalController;
+
+  /// 点击列头（不含行头列），参数为数据列下标
+  final ValueChanged<int>? onColumnHeaderTap;
+
+  /// 当前排序列和方向，用于在列头显示箭头
+  final int? sortColumn;
+  final bool sortAscending;
+
   const ScrollTable({
     super.key,
     required this.columnHeaders,
@@ -15,7 +35,95 @@ class ScrollTable extends StatelessWidget {
     required this.data,
     this.cellHeight = 50.0,
     this.cellWidth = 120.0,
-  });
+    this.verticalController,
+    this.onColumnHeaderTap,
+    this.sortColumn,
+    this.sortAscending = true,
+  }) : rows = null;
+
+  const ScrollTable.paged({
+    super.key,
+    required RowPageCache this.rows,
+    this.cellHeight = 50.0,
+    this.cellWidth = 120.0,
+    this.verticalController,
+    this.onColumnHeaderTap,
+    this.sortColumn,
+    this.sortAscending = true,
+  })  : columnHeaders = const [],
+        rowHeaders = const [],
+        data = const [];
+
+  @override
+  State<ScrollTable> createState() => _ScrollTableState();
+}
+
+class _ScrollTableState extends State<ScrollTable> {
+  ScrollController? _ownController;
+
+  ScrollController get _verticalController =>
+      widget.verticalController ?? (_ownController ??= ScrollController());
+
+  List<String> get _columnHeaders =>
+      widget.rows?.columnHeaders ?? widget.columnHeaders;
+
+  int get _rowCount => widget.rows?.rowCount ?? widget.data.length;
+
+  @override
+  void initState() {
+    super.initState();
+    _attach();
+  }
+
+  @override
+  void didUpdateWidget(ScrollTable oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.rows != widget.rows ||
+        oldWidget.verticalController != widget.verticalController) {
+      _detach(oldWidget);
+      _attach();
+    }
+  }
+
+  @override
+  void dispose() {
+    _detach(widget);
+    _ownController?.dispose();
+    super.dispose();
+  }
+
+  void _attach() {
+    final rows = widget.rows;
+    if (rows == null) return;
+    rows.addListener(_onRowsChanged);
+    _verticalController.addListener(_updateViewport);
+    WidgetsBinding.instance.addPostFrameCallback((_) => _updateViewport());
+  }
+
+  void _detach(ScrollTable oldWidget) {
+    oldWidget.rows?.removeListener(_onRowsChanged);
+    (oldWidget.verticalController ?? _ownController)
+        ?.removeListener(_updateViewport);
+  }
+
+  void _onRowsChanged() {
+    if (mounted) setState(() {});
+  }
+
+  /// 根据滚动位置计算可见的数据行，交给页缓存加载和预取
+  void _updateViewport() {
+    final rows = widget.rows;
+    final controller = _verticalController;
+    if (rows == null || !mounted || !controller.hasClients) return;
+    final position = controller.position;
+    final firstRow = (position.pixels / widget.cellHeight).floor();
+    final visibleRows =
+        (position.viewportDimension / widget.cellHeight).ceil() + 1;
+    rows.updateViewport(
+      firstRow.clamp(0, _rowCount),
+      (firstRow + visibleRows).clamp(0, _rowCount),
+    );
+  }
 
   @override
   Widget build(BuildContext context) {
@@ -25,12 +133,15 @@ class ScrollTable extends StatelessWidget {
         borderRadius: BorderRadius.circular(8),
       ),
       child: TableView.builder(
+        verticalDetails: ScrollableDetails.vertical(
+          controller: _verticalController,
+        ),
         diagonalDragBehavior: DiagonalDragBehavior.weightedEvent,
         cellBuilder: _buildCell,
         pinnedColumnCount: 1,
         pinnedRowCount: 1,
-        columnCount: columnHeaders.length + 1, // +1 for row headers
-        rowCount: data.length + 1, // +1 for column headers
+        columnCount: _columnHeaders.length + 1, // +1 for row headers
+        rowCount: _rowCount + 1, // +1 for column headers
         columnBuilder: _buildColumn,
         rowBuilder: _buildRow,
       ),
@@ -53,55 +164,83 @@ class ScrollTable extends StatelessWidget {
       textStyle = const TextStyle(fontWeight: FontWeight.bold);
     } else if (isColumnHeader) {
       // 列头
+      final column = vicinity.column - 1;
       backgroundColor = Colors.blue.shade100;
-      text = columnHeaders[vicinity.column - 1];
+      text = _columnHeaders[column];
+      if (widget.sortColumn == column) {
+        text += widget.sortAscending ? ' ▲' : ' ▼';
+      }
       textStyle = const TextStyle(fontWeight: FontWeight.bold);
     } else if (isRowHeader) {
       // 行头
       backgroundColor = Colors.blue.shade50;
-      text = rowHeaders[vicinity.row - 1];
+      text = _rowHeader(vicinity.row - 1);
       textStyle = const TextStyle(fontWeight: FontWeight.bold);
     } else {
-      // 数据单元格
+      // 数据单元格，分页模式下页未加载时先显示占位
       backgroundColor =
           vicinity.row % 2 == 0 ? Colors.white : Colors.grey.shade50;
-      text = data[vicinity.row - 1][vicinity.column - 1];
-      textStyle = const TextStyle();
+      final cell = _cellText(vicinity.row - 1, vicinity.column - 1);
+      text = cell ?? '…';
+      textStyle = cell == null
+          ? TextStyle(color: Colors.grey.shade400)
+          : const TextStyle();
     }
 
-    return TableViewCell(
-      child: Container(
-        decoration: BoxDecoration(
-          color: backgroundColor,
-          border: Border(
-            right: BorderSide(color: Colors.grey.shade300, width: 0.5),
-            bottom: BorderSide(color: Colors.grey.shade300, width: 0.5),
-          ),
+    Widget child = Container(
+      decoration: BoxDecoration(
+        color: backgroundColor,
+        border: Border(
+          right: BorderSide(color: Colors.grey.shade300, width: 0.5),
+          bottom: BorderSide(color: Colors.grey.shade300, width: 0.5),
         ),
-        child: Center(
-          child: Padding(
-            padding: const EdgeInsets.all(8.0),
-            child: Text(
-              text,
-              style: textStyle,
-              textAlign: TextAlign.center,
-              overflow: TextOverflow.ellipsis,
-            ),
+      ),
+      child: Center(
+        child: Padding(
+          padding: const EdgeInsets.all(8.0),
+          child: Text(
+            text,
+            style: textStyle,
+            textAlign: TextAlign.center,
+            overflow: TextOverflow.ellipsis,
           ),
         ),
       ),
     );
+
+    final onColumnHeaderTap = widget.onColumnHeaderTap;
+    if (isColumnHeader && !isCornerCell && onColumnHeaderTap != null) {
+      child = GestureDetector(
+        onTap: () => onColumnHeaderTap(vicinity.column - 1),
+        child: child,
+      );
+    }
+    return TableViewCell(child: child);
+  }
+
+  String _rowHeader(int row) {
+    final rows = widget.rows;
+    if (rows == null) return widget.rowHeaders[row];
+    // 排序/筛选后显示原始行号
+    final rowId = rows.rowIdAt(row);
+    return rowId == null ? '' : '第${rowId + 1}行';
+  }
+
+  String? _cellText(int row, int column) {
+    final rows = widget.rows;
+    if (rows == null) return widget.data[row][column];
+    return rows.cellAt(row, column);
   }
 
   TableSpan _buildColumn(int index) {
     return TableSpan(
-      extent: FixedTableSpanExtent(cellWidth),
+      extent: FixedTableSpanExtent(widget.cellWidth),
     );
   }
 
   TableSpan _buildRow(int index) {
     return TableSpan(
-      extent: FixedTableSpanExtent(cellHeight),
+      extent: FixedTableSpanExtent(widget.cellHeight),
     );
   }
 }
@@ -136,4 +275,84 @@ class TableData {
       ];
     });
   }
+
+  /// 生成列式存储的员工大表，用于演示和测试虚拟滚动
+  ///
+  /// 前 8 列与示例数据相同，另外追加 [metricColumns] 个浮点指标列。
+  /// 值由行号确定性地生成，相同参数得到相同数据。
+  static ColumnarTable generateLargeTable(
+    int rowCount, {
+    int metricColumns = 16,
+  }) {
+    const surnames = ['张', '李', '王', '赵', '钱', '孙', '周', '吴'];
+    const givenNames = ['伟', '芳', '娜', '敏', '静', '磊', '洋', '勇'];
+    const departments = ['技术部', '销售部', '市场部', '人事部', '财务部'];
+    const positions = ['工程师', '经理', '专员', '主管', '总监'];
+    const performance = ['优秀', '良好', '一般', '待改进'];
+    const status = ['在职', '休假', '出差', '培训'];
+    final names = [
+      for (final surname in surnames)
+        for (final given in givenNames) '$surname$given',
+    ];
+    final dates = [
+      for (var year = 2015; year <= 2024; year++)
+        for (var month = 1; month <= 12; month++)
+          for (var day = 1; day <= 28; day++)
+            '$year-${month.toString().padLeft(2, '0')}-'
+                '${day.toString().padLeft(2, '0')}',
+    ];
+
+    final nameCodes = Uint16List(rowCount);
+    final ages = Int32List(rowCount);
+    final departmentCodes = Uint16List(rowCount);
+    final positionCodes = Uint16List(rowCount);
+    final salaries = Int32List(rowCount);
+    final dateCodes = Uint16List(rowCount);
+    final performanceCodes = Uint16List(rowCount);
+    final statusCodes = Uint16List(rowCount);
+    final metrics = [
+      for (var i = 0; i < metricColumns; i++) Float64List(rowCount),
+    ];
+
+    for (var row = 0; row < rowCount; row++) {
+      final h = _mix(row);
+      nameCodes[row] = h % names.length;
+      ages[row] = 22 + (h >> 6) % 40;
+      departmentCodes[row] = (h >> 12) % departments.length;
+      positionCodes[row] = (h >> 15) % positions.length;
+      salaries[row] = (5 + (h >> 18) % 45) * 1000;
+      final h2 = _mix(h);
+      dateCodes[row] = h2 % dates.length;
+      performanceCodes[row] = (h2 >> 12) % performance.length;
+      statusCodes[row] = (h2 >> 14) % status.length;
+      for (var i = 0; i < metricColumns; i++) {
+        metrics[i][row] = _mix(h2 + i) % 100000 / 100;
+      }
+    }
+
+    return ColumnarTable(
+      headers: [
+        ...getColumnHeaders(),
+        for (var i = 0; i < metricColumns; i++) '指标${i + 1}',
+      ],
+      columns: [
+        CategoryColumn(names, nameCodes),
+        IntColumn(ages),
+        CategoryColumn(departments, departmentCodes),
+        CategoryColumn(positions, positionCodes),
+        IntColumn(salaries),
+        CategoryColumn(dates, dateCodes),
+        CategoryColumn(performance, performanceCodes),
+        CategoryColumn(status, statusCodes),
+        for (final values in metrics) DoubleColumn(values),
+      ],
+    );
+  }
+
+  /// 32 位整数哈希，用于生成分布均匀的伪随机值
+  static int _mix(int x) {
+    x = ((x ^ (x >> 16)) * 0x45d9f3b) & 0xFFFFFFFF;
+    x = ((x ^ (x >> 16)) * 0x45d9f3b) & 0xFFFFFFFF;
+    return x ^ (x >> 16);
+  }
 }
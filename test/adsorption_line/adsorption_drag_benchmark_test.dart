@@ -0,0 +1,100 @@
+import 'dart:math';
+
+import 'package:flutter/material.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/adsorption_line/models/drawing_element.dart';
+import 'package:main_app/modules/ui/adsorption_line/services/adsorption_manager.dart';
+import 'package:main_app/modules/ui/adsorption_line/state/drawing_state.dart';
+
+const _kElements = 10000;
+const _kDragEvents = 2000;
+const _kBruteForceEvents = 20;
+
+/// 原实现：元素 × 当前吸附点 × 元素吸附点 三重循环，作为对照。
+int _bruteForceSnapLineCount(
+  List<DrawingElement> elements,
+  DrawingElement current,
+) {
+  var count = 0;
+  final currentSnapPoints = current.getSnapPoints();
+  for (final element in elements) {
+    if (element.id == current.id) continue;
+    for (final a in currentSnapPoints) {
+      for (final b in element.getSnapPoints()) {
+        if ((a.dx - b.dx).abs() < AdsorptionManager.snapThreshold) count++;
+        if ((a.dy - b.dy).abs() < AdsorptionManager.snapThreshold) count++;
+      }
+    }
+  }
+  return count;
+}
+
+void main() {
+  tearDown(AdsorptionManager.dispose);
+
+  test('benchmark: drag across $_kElements elements', () {
+    final random = Random(1);
+    final state = DrawingState();
+
+    final buildWatch = Stopwatch()..start();
+    for (var i = 0; i < _kElements; i++) {
+      state.addElement(DrawingElement(
+        id: 'e$i',
+        position: Offset(
+          random.nextDouble() * 4000,
+          random.nextDouble() * 3000,
+        ),
+        size: Size(
+          20 + random.nextDouble() * 80,
+          20 + random.nextDouble() * 60,
+        ),
+        type: ElementType.values[i % ElementType.values.length],
+      ));
+    }
+    buildWatch.stop();
+
+    state.selectElement('e0');
+    state.startDrag(state.selectedElement!.center);
+
+    // 每个拖拽事件：计算磁吸位置 -> 更新元素（增量更新索引）-> 计算吸附线
+    var lineCount = 0;
+    final dragWatch = Stopwatch()..start();
+    for (var i = 0; i < _kDragEvents; i++) {
+      final pointer = Offset(i * 2.0, i * 1.5);
+      final snapped = AdsorptionManager.applyMagneticEffect(
+        pointer,
+        state.elements,
+        state.selectedElement!,
+        index: state.snapIndex,
+      );
+      state.updateDrag(snapped);
+      lineCount += AdsorptionManager.calculateSnapLines(
+        state.elements,
+        state.selectedElement,
+        index: state.snapIndex,
+      ).length;
+    }
+    dragWatch.stop();
+    state.endDrag();
+    expect(lineCount, greaterThan(0));
+
+    final elements = state.elements;
+    final current = state.selectedElement!;
+    var bruteCount = 0;
+    final bruteWatch = Stopwatch()..start();
+    for (var i = 0; i < _kBruteForceEvents; i++) {
+      bruteCount += _bruteForceSnapLineCount(elements, current);
+    }
+    bruteWatch.stop();
+    expect(bruteCount, greaterThan(0));
+
+    final indexedUs = dragWatch.elapsedMicroseconds / _kDragEvents;
+    final bruteUs = bruteWatch.elapsedMicroseconds / _kBruteForceEvents;
+    debugPrint('Adsorption drag benchmark ($_kElements elements)');
+    debugPrint('  build index: ${buildWatch.elapsedMilliseconds} ms');
+    debugPrint('  indexed: ${indexedUs.toStringAsFixed(1)} µs/event '
+        '($_kDragEvents events)');
+    debugPrint('  brute-force snap lines: '
+        '${bruteUs.toStringAsFixed(1)} µs/event');
+  });
+}
@@ -0,0 +1,284 @@
+import 'dart:math';
+import 'dart:ui';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/adsorption_line/models/drawing_element.dart';
+import 'package:main_app/modules/ui/adsorption_line/services/adsorption_manager.dart';
+import 'package:main_app/modules/ui/adsorption_line/services/snap_point_index.dart';
+import 'package:main_app/modules/ui/adsorption_line/state/drawing_state.dart';
+
+const _threshold = AdsorptionManager.snapThreshold;
+
+DrawingElement _rect(String id, double x, double y) {
+  return DrawingElement(
+    id: id,
+    position: Offset(x, y),
+    size: const Size(80, 60),
+    type: ElementType.rectangle,
+  );
+}
+
+List<DrawingElement> _randomElements(int count, int seed) {
+  final random = Random(seed);
+  final types = ElementType.values;
+  return List.generate(count, (i) {
+    return DrawingElement(
+      id: 'e$i',
+      position: Offset(
+        random.nextDouble() * 2000 - 200,
+        random.nextDouble() * 1500 - 200,
+      ),
+      size: Size(10 + random.nextDouble() * 100, random.nextDouble() * 100),
+      type: types[i % types.length],
+    );
+  });
+}
+
+/// 原三重循环实现的 X 结果，作为对照。
+Set<double> _bruteForceXs(
+  List<DrawingElement> elements,
+  DrawingElement current,
+) {
+  final result = <double>{};
+  for (final element in elements) {
+    if (element.id == current.id) continue;
+    for (final a in current.getSnapPoints()) {
+      for (final b in element.getSnapPoints()) {
+        if ((a.dx - b.dx).abs() < _threshold) result.add(b.dx);
+      }
+    }
+  }
+  return result;
+}
+
+Set<double> _bruteForceYs(
+  List<DrawingElement> elements,
+  DrawingElement current,
+) {
+  final result = <double>{};
+  for (final element in elements) {
+    if (element.id == current.id) continue;
+    for (final a in current.getSnapPoints()) {
+      for (final b in element.getSnapPoints()) {
+        if ((a.dy - b.dy).abs() < _threshold) result.add(b.dy);
+      }
+    }
+  }
+  return result;
+}
+
+void main() {
+  group('SnapPointIndex', () {
+    test('matches the brute-force scan for random boards', () {
+      final elements = _randomElements(500, 3);
+      final index = SnapPointIndex.fromElements(elements);
+      expect(index.length, 500);
+
+      for (final current in elements.take(50)) {
+        final points = current.getSnapPoints();
+        expect(
+          index.verticalCandidates(points, _threshold, excludeId: current.id),
+          _bruteForceXs(elements, current),
+        );
+        expect(
+          index.horizontalCandidates(
+            points,
+            _threshold,
+            excludeId: current.id,
+          ),
+          _bruteForceYs(elements, current),
+        );
+      }
+    });
+
+    test('excludes the queried element itself', () {
+      final index = SnapPointIndex.fromElements([_rect('a', 100, 100)]);
+      final points = _rect('a', 100, 100).getSnapPoints();
+
+      expect(index.verticalCandidates(points, _threshold), isNotEmpty);
+      expect(
+        index.verticalCandidates(points, _threshold, excludeId: 'a'),
+        isEmpty,
+      );
+    });
+
+    test('threshold is exclusive', () {
+      final index = SnapPointIndex.fromElements([_rect('a', 100, 0)]);
+
+      expect(
+        index.verticalCandidates(const [Offset(75, 0)], _threshold),
+        isEmpty,
+      );
+      expect(
+        index.verticalCandidates(const [Offset(75.5, 0)], _threshold),
+        {100},
+      );
+    });
+
+    test('update and remove replace old snap points', () {
+      final index = SnapPointIndex.fromElements([
+        _rect('a', 100, 100),
+        _rect('b', 500, 500),
+      ]);
+      const probe = [Offset(100, 100)];
+
+      expect(index.verticalCandidates(probe, 1), {100});
+
+      index.update(_rect('a', 300, 300));
+      expect(index.verticalCandidates(probe, 1), isEmpty);
+      expect(index.verticalCandidates(const [Offset(300, 0)], 1), {300});
+      expect(index.length, 2);
+
+      index.remove('a');
+      expect(index.verticalCandidates(const [Offset(300, 0)], 1), isEmpty);
+      expect(index.contains('a'), isFalse);
+      expect(index.contains('b'), isTrue);
+
+      index.clear();
+      expect(index.length, 0);
+      expect(index.verticalCandidates(const [Offset(500, 0)], 1), isEmpty);
+    });
+
+    test('removes elements that share one crowded bucket', () {
+      // 所有元素左边缘对齐，X 吸附点落在同一个桶里
+      final elements = [
+        for (var i = 0; i < 50; i++) _rect('e$i', 100, i * 100.0),
+      ];
+      final index = SnapPointIndex.fromElements(elements);
+
+      for (var i = 0; i < 50; i += 2) {
+        index.remove('e$i');
+      }
+      index.update(_rect('e1', 300, 100));
+
+      final remaining = [
+        for (var i = 3; i < 50; i += 2) _rect('e$i', 100, i * 100.0),
+        _rect('e1', 300, 100),
+      ];
+      final probe = _rect('probe', 100, 0);
+      expect(
+        index.verticalCandidates(probe.getSnapPoints(), _threshold),
+        _bruteForceXs(remaining, probe),
+      );
+      expect(index.length, 25);
+    });
+
+    test('handles negative coordinates across bucket boundaries', () {
+      final index = SnapPointIndex.fromElements([_rect('a', -30, -30)]);
+
+      expect(
+        index.verticalCandidates(const [Offset(-40, 0)], _threshold),
+        {-30},
+      );
+      expect(
+        index.horizontalCandidates(const [Offset(0, -45)], _threshold),
+        {-30},
+      );
+    });
+  });
+
+  group('AdsorptionManager with index', () {
+    tearDown(AdsorptionManager.dispose);
+
+    test('snapPosition snaps to the nearest brute-force candidate', () {
+      final elements = _randomElements(300, 11);
+      final index = SnapPointIndex.fromElements(elements);
+      final random = Random(5);
+
+      double nearest(double value, Set<double> candidates) {
+        var result = value;
+        var minDistance = _threshold;
+        for (final candidate in candidates) {
+          final distance = (value - candidate).abs();
+          if (distance < minDistance) {
+            minDistance = distance;
+            result = candidate;
+          }
+        }
+        return result;
+      }
+
+      for (final current in elements.take(40)) {
+        final position = current.position +
+            Offset(
+              random.nextDouble() * 40 - 20,
+              random.nextDouble() * 40 - 20,
+            );
+        final expected = Offset(
+          nearest(position.dx, _bruteForceXs(elements, current)),
+          nearest(position.dy, _bruteForceYs(elements, current)),
+        );
+
+        expect(
+          AdsorptionManager.snapPosition(
+            position,
+            elements,
+            current,
+            index: index,
+          ),
+          expected,
+        );
+        expect(
+          AdsorptionManager.snapPosition(position, elements, current),
+          expected,
+        );
+      }
+    });
+
+    test('snap lines are unique per coordinate', () {
+      final elements = [
+        _rect('a', 100, 100),
+        _rect('b', 100, 300),
+        _rect('c', 110, 500),
+      ];
+
+      final lines = AdsorptionManager.calculateSnapLines(elements, elements[2]);
+      final xs = lines
+          .where((line) => line.type == SnapType.vertical)
+          .map((line) => line.start.dx)
+          .toList();
+
+      expect(xs.toSet(), hasLength(xs.length));
+      expect(xs, containsAll(<double>[100, 140, 180]));
+    });
+  });
+
+  group('DrawingState', () {
+    test('keeps the snap index in sync with its elements', () {
+      final state = DrawingState();
+      state.addElement(_rect('a', 100, 100));
+      state.addElement(_rect('b', 400, 400));
+      expect(state.snapIndex.length, 2);
+
+      state.updateElement(_rect('a', 200, 200));
+      expect(
+        state.snapIndex.verticalCandidates(const [Offset(100, 0)], 1),
+        isEmpty,
+      );
+      expect(
+        state.snapIndex.verticalCandidates(const [Offset(200, 0)], 1),
+        {200},
+      );
+
+      state.removeElement('b');
+      expect(state.snapIndex.contains('b'), isFalse);
+
+      state.clear();
+      expect(state.snapIndex.length, 0);
+    });
+
+    test('updates the right element after removals', () {
+      final state = DrawingState();
+      for (var i = 0; i < 5; i++) {
+        state.addElement(_rect('e$i', i * 100.0, 0));
+      }
+      state.removeElement('e1');
+      state.updateElement(_rect('e3', 300, 500));
+      state.updateElement(_rect('missing', 0, 0));
+
+      expect(state.elements.map((e) => e.id), ['e0', 'e2', 'e3', 'e4']);
+      expect(state.elements[2].position, const Offset(300, 500));
+      expect(state.findElementAt(const Offset(310, 510))?.id, 'e3');
+    });
+  });
+}
@@ -0,0 +1,152 @@
+import 'dart:io';
+import 'dart:math';
+import 'dart:typed_data';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/cache/cache_entry.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/cache/cache_store.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/cache/disk_cache_store.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/interceptor/retry_interceptor.dart';
+
+final _epoch = DateTime(2024);
+
+CacheEntry _entry(String key, {int size = 100, String? etag}) {
+  return CacheEntry(
+    key: key,
+    statusCode: 200,
+    headers: const {
+      'content-type': ['application/json'],
+    },
+    body: Uint8List(size),
+    isJson: false,
+    storedAt: _epoch,
+    expiresAt: _epoch.add(const Duration(minutes: 1)),
+    etag: etag,
+  );
+}
+
+void main() {
+  group('MemoryCacheStore', () {
+    test('evicts the least recently used entry by size', () async {
+      final store = MemoryCacheStore(maxBytes: 350);
+      await store.set(_entry('a'));
+      await store.set(_entry('b'));
+      await store.set(_entry('c'));
+      // 访问 a 后，b 成为最久未访问的条目
+      expect(store.getSync('a'), isNotNull);
+
+      await store.set(_entry('d'));
+      expect(store.keys, ['c', 'a', 'd']);
+      expect(store.evictions, 1);
+      expect(store.sizeInBytes, lessThanOrEqualTo(350));
+    });
+
+    test('evicts by entry count and skips oversized entries', () async {
+      final store = MemoryCacheStore(maxBytes: 1000, maxEntries: 2);
+      await store.set(_entry('a'));
+      await store.set(_entry('b'));
+      await store.set(_entry('c'));
+      expect(store.keys, ['b', 'c']);
+
+      await store.set(_entry('huge', size: 2000));
+      expect(store.getSync('huge'), isNull);
+      expect(store.length, 2);
+    });
+
+    test('replacing an entry updates the byte count', () async {
+      final store = MemoryCacheStore();
+      await store.set(_entry('a', size: 100));
+      await store.set(_entry('a', size: 10));
+      expect(store.length, 1);
+      expect(store.sizeInBytes, _entry('a', size: 10).sizeInBytes);
+    });
+  });
+
+  group('DiskCacheStore', () {
+    late Directory dir;
+
+    setUp(() async {
+      dir = await Directory.systemTemp.createTemp('dio_cache_test');
+    });
+
+    tearDown(() async {
+      if (await dir.exists()) await dir.delete(recursive: true);
+    });
+
+    test('persists entries across instances', () async {
+      final entry = _entry('GET /api/articles', etag: 'W/"1"');
+      await DiskCacheStore(dir).set(entry);
+
+      final restored = await DiskCacheStore(dir).get(entry.key);
+      expect(restored, isNotNull);
+      expect(restored!.etag, 'W/"1"');
+      expect(restored.body, entry.body);
+      expect(restored.headers, entry.headers);
+      expect(restored.expiresAt, entry.expiresAt);
+    });
+
+    test('evicts the oldest files when over the size limit', () async {
+      final probe = DiskCacheStore(dir);
+      await probe.set(_entry('probe'));
+      final fileSize = probe.sizeInBytes;
+      await probe.clear();
+
+      final store = DiskCacheStore(dir, maxBytes: fileSize * 2 + 10);
+      await store.set(_entry('a'));
+      await store.set(_entry('b'));
+      expect(await store.get('a'), isNotNull);
+      await store.set(_entry('c'));
+
+      expect(store.length, 2);
+      expect(await store.get('b'), isNull);
+      expect(await store.get('a'), isNotNull);
+      expect(await store.get('c'), isNotNull);
+    });
+
+    test('concurrent writes to one key are serialized', () async {
+      final store = DiskCacheStore(dir);
+      await Future.wait([
+        for (var i = 0; i < 10; i++) store.set(_entry('a', etag: 'W/"$i"')),
+      ]);
+
+      expect(store.length, 1);
+      expect((await store.get('a'))!.etag, 'W/"9"');
+      final files = dir.listSync().whereType<File>().toList();
+      expect(files, hasLength(1));
+      expect(store.sizeInBytes, files.single.lengthSync());
+    });
+
+    test('drops unreadable files', () async {
+      final store = DiskCacheStore(dir);
+      await store.set(_entry('a'));
+      final file = dir.listSync().whereType<File>().single;
+      await file.writeAsString('not json');
+
+      expect(await store.get('a'), isNull);
+      expect(store.length, 0);
+      expect(await file.exists(), isFalse);
+    });
+  });
+
+  test('stableHash is deterministic and spreads keys', () {
+    expect(stableHash('GET /a'), stableHash('GET /a'));
+    expect(stableHash('GET /a'), hasLength(16));
+    final hashes = {for (var i = 0; i < 1000; i++) stableHash('key $i')};
+    expect(hashes, hasLength(1000));
+  });
+
+  test('retry backoff grows exponentially and stays under the cap', () {
+    final retry = RetryInterceptor(
+      retryInterval: 100,
+      maxRetryInterval: 1000,
+      random: Random(1),
+    );
+    for (var attempt = 1; attempt <= 8; attempt++) {
+      final ceiling = min(1000, 100 * pow(2, attempt - 1));
+      for (var i = 0; i < 50; i++) {
+        final delay = retry.backoffDelay(attempt).inMilliseconds;
+        expect(delay, inInclusiveRange(0, ceiling));
+      }
+    }
+  });
+}
@@ -0,0 +1,175 @@
+import 'dart:async';
+
+import 'package:dio/dio.dart';
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/platform/dio_interceptor/mock_server/mock_server.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/http_client.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/interceptor/auth_interceptor.dart';
+import 'package:main_app/modules/platform/dio_interceptor/network/interceptor/cache_interceptor.dart';
+
+const _kRequests = 200;
+const _kPages = 4;
+
+Future<void> _login(HttpClient client) async {
+  final response = await client.post('/api/login', data: {
+    'username': 'admin',
+    'password': 'password123',
+  });
+  AuthInterceptor.setToken(response.data['data']['token'] as String);
+}
+
+Future<Response> _page(HttpClient client, int page) =>
+    client.get('/api/articles', queryParameters: {'page': page});
+
+void main() {
+  late MockServer server;
+
+  setUp(() async {
+    server = MockServer(port: 0)
+      ..failureRate = 0
+      ..networkDelay = 5;
+    await server.start();
+  });
+
+  tearDown(() async {
+    AuthInterceptor.clearToken();
+    await server.stop();
+  });
+
+  HttpClient createClient({Duration maxAge = const Duration(minutes: 1)}) {
+    final client = HttpClient.create(
+      baseUrl: 'http://127.0.0.1:${server.boundPort}',
+      cacheInterceptor: CacheInterceptor(maxAge: maxAge),
+    );
+    addTearDown(() => client.dio.close(force: true));
+    return client;
+  }
+
+  test('benchmark: repeated page reads with and without cache', () async {
+    final client = createClient();
+    await _login(client);
+
+    Future<int> run({required bool cached}) async {
+      final watch = Stopwatch()..start();
+      for (var i = 0; i < _kRequests; i++) {
+        await client.dio.get(
+          '/api/articles',
+          queryParameters: {'page': i % _kPages + 1},
+          options: Options(extra: {CacheInterceptor.noCacheKey: !cached}),
+        );
+      }
+      return watch.elapsedMicroseconds;
+    }
+
+    final before = server.requestCount;
+    final uncached = await run(cached: false);
+    final uncachedRequests = server.requestCount - before;
+
+    client.cacheInterceptor.stats.reset();
+    final beforeCached = server.requestCount;
+    final cached = await run(cached: true);
+    final cachedRequests = server.requestCount - beforeCached;
+    final stats = client.cacheInterceptor.stats;
+
+    expect(uncachedRequests, _kRequests);
+    expect(cachedRequests, _kPages);
+    expect(stats.hitRate, closeTo(1 - _kPages / _kRequests, 1e-9));
+    expect(cached, lessThan(uncached));
+
+    debugPrint('HTTP cache benchmark ($_kRequests GETs over $_kPages pages)');
+    debugPrint('  no cache: ${uncached ~/ _kRequests} us/request, '
+        '$uncachedRequests server hits');
+    debugPrint('  cache:    ${cached ~/ _kRequests} us/request, '
+        '$cachedRequests server hits, $stats');
+  });
+
+  test('identical concurrent GETs share one request', () async {
+    final client = createClient();
+    await _login(client);
+
+    final before = server.requestCount;
+    final responses =
+        await Future.wait([for (var i = 0; i < 20; i++) _page(client, 1)]);
+
+    expect(server.requestCount - before, 1);
+    expect(client.deduplicator.sharedCount, 19);
+    expect(client.deduplicator.inFlightCount, 0);
+    expect(responses.map((r) => r.data['data']['page']).toSet(), {1});
+
+    // 每个调用方拿到独立的数据，修改不会互相影响
+    expect(responses.map((r) => r.data).toSet(), hasLength(20));
+    (responses.first.data['data'] as Map)['page'] = -1;
+    expect(responses.last.data['data']['page'], 1);
+
+    // 不同参数的请求不合并
+    await Future.wait([_page(client, 2), _page(client, 3)]);
+    expect(server.requestCount - before, 3);
+  });
+
+  test('stale entries are revalidated with ETag', () async {
+    final client = createClient(maxAge: Duration.zero);
+    await _login(client);
+
+    final first = await _page(client, 1);
+    final second = await _page(client, 1);
+
+    expect(server.notModifiedCount, 1);
+    expect(second.statusCode, 200);
+    expect(second.extra[CacheInterceptor.fromCacheKey], isTrue);
+    expect(second.data, first.data);
+    expect(client.cacheInterceptor.stats.revalidated, 1);
+  });
+
+  test('retried GETs are counted and revalidated once', () async {
+    final client = createClient(maxAge: Duration.zero);
+    await _login(client);
+    await _page(client, 1);
+    final stats = client.cacheInterceptor.stats..reset();
+
+    // 第一次请求超时；服务器收到它之后恢复正常，由重试拿到 304
+    server.networkDelay = 300;
+    final before = server.requestCount;
+    final recover = Timer.periodic(const Duration(milliseconds: 1), (timer) {
+      if (server.requestCount > before) {
+        server.networkDelay = 5;
+        timer.cancel();
+      }
+    });
+    addTearDown(recover.cancel);
+
+    final response = await client.dio.get(
+      '/api/articles',
+      queryParameters: {'page': 1},
+      options: Options(receiveTimeout: const Duration(milliseconds: 100)),
+    );
+
+    expect(server.requestCount - before, greaterThanOrEqualTo(2));
+    expect(response.statusCode, 200);
+    expect(response.data['data']['page'], 1);
+    expect(stats.requests, 1);
+    expect(stats.revalidated, 1);
+    expect(stats.misses, 0);
+    expect(stats.hitRate, 1);
+  });
+
+  test('successful writes invalidate cached reads', () async {
+    final client = createClient();
+    await _login(client);
+
+    final before = await _page(client, 1);
+    final total = before.data['data']['total'] as int;
+    expect((await _page(client, 1)).extra[CacheInterceptor.fromCacheKey],
+        isTrue);
+
+    await client.post('/api/articles/create', data: {
+      'title': 'new',
+      'content': 'content',
+    });
+    expect(client.cacheInterceptor.memory.length, 0);
+
+    final after = await _page(client, 1);
+    expect(after.extra[CacheInterceptor.fromCacheKey], isNot(true));
+    expect(after.data['data']['total'], total + 1);
+  });
+}
@@ -0,0 +1,130 @@
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/state/flutter_ioc/ioc/ioc.dart';
+
+const _kResolves = 1000000;
+const _kDepth = 8;
+
+class _Service {}
+
+class _Key {
+  _Key(this.type, this.name);
+  final Type type;
+  final String? name;
+
+  @override
+  bool operator ==(Object other) =>
+      other is _Key && type == other.type && name == other.name;
+
+  @override
+  int get hashCode => type.hashCode ^ name.hashCode;
+}
+
+class _LegacyRegistration {
+  _LegacyRegistration(this.key, this.factory);
+  final _Key key;
+  final Object Function() factory;
+  Object? instance;
+}
+
+/// 原实现的查找方式，作为对照：每次解析都分配 key、沿父链收集注册并过滤。
+class _LegacyContainer {
+  _LegacyContainer([this.parent]);
+
+  final _LegacyContainer? parent;
+  final Map<Type, List<_LegacyRegistration>> registrations = {};
+  final List<_Key> path = [];
+
+  void registerSingleton<T extends Object>(T Function() factory) {
+    registrations
+        .putIfAbsent(T, () => [])
+        .add(_LegacyRegistration(_Key(T, null), factory));
+  }
+
+  T resolve<T>({String? name}) {
+    final token = _Key(T, name);
+    if (path.contains(token)) throw StateError('cycle');
+    final matching = _collect(T).where((r) => r.key.name == name).toList();
+    if (matching.isEmpty) throw StateError('missing $T');
+    path.add(token);
+    try {
+      final registration = matching.first;
+      return (registration.instance ??= registration.factory()) as T;
+    } finally {
+      path.removeLast();
+    }
+  }
+
+  List<_LegacyRegistration> _collect(Type type) {
+    final current = registrations[type] ?? const <_LegacyRegistration>[];
+    if (parent == null) return current;
+    return [...current, ...parent!._collect(type)];
+  }
+}
+
+int _time(void Function() body) {
+  final watch = Stopwatch()..start();
+  body();
+  return watch.elapsedMilliseconds;
+}
+
+void main() {
+  test('benchmark: $_kResolves resolves from a depth-$_kDepth scope', () {
+    final legacyRoot = _LegacyContainer()..registerSingleton(_Service.new);
+    var legacy = legacyRoot;
+    for (var i = 0; i < _kDepth; i++) {
+      legacy = _LegacyContainer(legacy);
+    }
+
+    final root = Container();
+    root.registerSingleton<_Service>((_) => _Service());
+    root.registerTransient<String>((_) => 'transient');
+    var scope = root;
+    for (var i = 0; i < _kDepth; i++) {
+      scope = scope.createScope() as Container;
+    }
+    scope.registerScoped<int>((_) => 42);
+
+    final expected = root.resolve<_Service>();
+    final legacyMs = _time(() {
+      for (var i = 0; i < _kResolves; i++) {
+        legacy.resolve<_Service>();
+      }
+    });
+    final singletonMs = _time(() {
+      for (var i = 0; i < _kResolves; i++) {
+        scope.resolve<_Service>();
+      }
+    });
+    final scopedMs = _time(() {
+      for (var i = 0; i < _kResolves; i++) {
+        scope.resolve<int>();
+      }
+    });
+    final transientMs = _time(() {
+      for (var i = 0; i < _kResolves; i++) {
+        scope.resolve<String>();
+      }
+    });
+
+    final profiler = scope.enableProfiling();
+    final profiledMs = _time(() {
+      for (var i = 0; i < _kResolves; i++) {
+        scope.resolve<_Service>();
+      }
+    });
+    scope.disableProfiling();
+
+    expect(scope.resolve<_Service>(), same(expected));
+    expect(profiler.statsFor<_Service>()!.count, _kResolves);
+
+    debugPrint('IoC resolve benchmark ($_kResolves resolves, '
+        'scope depth $_kDepth)');
+    debugPrint('  legacy lookup (singleton): $legacyMs ms');
+    debugPrint('  compiled singleton: $singletonMs ms');
+    debugPrint('  compiled scoped:    $scopedMs ms');
+    debugPrint('  compiled transient: $transientMs ms');
+    debugPrint('  singleton with profiling: $profiledMs ms');
+    debugPrint('  ${profiler.statsFor<_Service>()}');
+  });
+}
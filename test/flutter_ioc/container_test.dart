@@ -0,0 +1,217 @@
+import 'dart:async';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/state/flutter_ioc/ioc/ioc.dart';
+
+class _Service {
+  _Service(this.label);
+  final String label;
+  _Service? dependency;
+}
+
+class _A {
+  _A(this.b);
+  final _B b;
+}
+
+class _B {
+  _B(this.a);
+  final _A a;
+}
+
+void main() {
+  group('lifetimes', () {
+    test('singleton, transient and scoped instances', () {
+      final root = Container();
+      var created = 0;
+      root.registerSingleton<_Service>((_) => _Service('s${created++}'));
+      root.registerTransient<String>((_) => 't${created++}');
+      root.registerScoped<int>((_) => created++);
+
+      final scope = root.createScope();
+      expect(scope.resolve<_Service>(), same(root.resolve<_Service>()));
+      expect(root.resolve<String>(), isNot(root.resolve<String>()));
+
+      expect(root.resolve<int>(), root.resolve<int>());
+      expect(scope.resolve<int>(), scope.resolve<int>());
+      expect(scope.resolve<int>(), isNot(root.resolve<int>()));
+    });
+
+    test('child registrations override parents and see new registrations',
+        () {
+      final root = Container();
+      root.registerSingleton<_Service>((_) => _Service('root'));
+      final child = root.createScope() as Container;
+      final grandChild = child.createScope();
+      expect(grandChild.resolve<_Service>().label, 'root');
+
+      // 已编译的解析结果在注册后失效，包括子作用域
+      child.registerSingleton<_Service>((_) => _Service('child'));
+      expect(grandChild.resolve<_Service>().label, 'child');
+      expect(root.resolve<_Service>().label, 'root');
+
+      root.registerSingleton<String>((_) => 'late', name: 'late');
+      expect(grandChild.resolve<String>(name: 'late'), 'late');
+    });
+
+    test('scoped instances survive later registrations', () {
+      final root = Container();
+      root.registerScoped<_Service>((_) => _Service('scoped'));
+      final first = root.resolve<_Service>();
+      root.registerTransient<String>((_) => 'other');
+      expect(root.resolve<_Service>(), same(first));
+    });
+  });
+
+  group('selection', () {
+    test('conditions are evaluated against the resolving scope', () {
+      final root = Container(environment: {'mode': 'prod'});
+      root.registerTransient<String>(
+        (_) => 'debug',
+        condition: (resolver) => resolver.flag('debug'),
+      );
+      root.registerTransient<String>((_) => 'default');
+
+      final debugScope = root.createScope(environmentOverrides: {
+        'debug': true,
+      });
+      expect(root.resolve<String>(), 'default');
+      expect(debugScope.resolve<String>(), 'debug');
+    });
+
+    test('named registrations and missing names', () {
+      final root = Container();
+      root.registerSingleton<String>((_) => 'primary', name: 'primary');
+      root.registerSingleton<String>((_) => 'backup', name: 'backup');
+
+      expect(root.resolve<String>(name: 'backup'), 'backup');
+      expect(
+        () => root.resolve<String>(),
+        throwsA(isA<ContainerException>().having(
+          (e) => e.message,
+          'message',
+          contains('available names: primary, backup'),
+        )),
+      );
+    });
+
+    test('property injectors run after creation', () {
+      final root = Container();
+      root.registerSingleton<_Service>((_) => _Service('dependency'),
+          name: 'dep');
+      root.registerTransient<_Service>(
+        (_) => _Service('main'),
+        propertyInjectors: [
+          (service, resolver) =>
+              service.dependency = resolver.resolve<_Service>(name: 'dep'),
+        ],
+      );
+
+      expect(root.resolve<_Service>().dependency?.label, 'dependency');
+    });
+
+    test('circular dependencies are reported with the chain', () {
+      final root = Container();
+      root.registerTransient<_A>((r) => _A(r.resolve<_B>()));
+      root.registerTransient<_B>((r) => _B(r.resolve<_A>()));
+
+      expect(
+        () => root.resolve<_A>(),
+        throwsA(isA<ContainerException>().having(
+          (e) => e.message,
+          'message',
+          contains('_A -> _B -> _A'),
+        )),
+      );
+      // 出错后解析路径被清理，后续解析不受影响
+      root.registerSingleton<String>((_) => 'ok');
+      expect(root.resolve<String>(), 'ok');
+    });
+  });
+
+  group('async factories', () {
+    test('concurrent resolves share one in-flight future', () async {
+      final root = Container();
+      final gate = Completer<void>();
+      var created = 0;
+      root.registerSingleton<_Service>((_) async {
+        created++;
+        await gate.future;
+        return _Service('async');
+      });
+
+      final pending = [
+        for (var i = 0; i < 5; i++) root.resolveAsync<_Service>(),
+      ];
+      expect(
+        () => root.resolve<_Service>(),
+        throwsA(isA<ContainerException>()),
+      );
+      gate.complete();
+      final services = await Future.wait(pending);
+
+      expect(created, 1);
+      expect(services.toSet(), hasLength(1));
+      // 完成后同步解析也能拿到实例
+      expect(root.resolve<_Service>(), same(services.first));
+    });
+
+    test('failed async singletons are retried', () async {
+      final root = Container();
+      var attempts = 0;
+      root.registerSingleton<_Service>((_) async {
+        if (++attempts == 1) throw StateError('first attempt');
+        return _Service('second');
+      });
+
+      await expectLater(root.resolveAsync<_Service>(), throwsStateError);
+      expect((await root.resolveAsync<_Service>()).label, 'second');
+      expect(attempts, 2);
+    });
+  });
+
+  test('profiling records counts per type and is opt-in', () {
+    final root = Container();
+    root.registerSingleton<_Service>((_) => _Service('s'));
+    root.registerTransient<String>((r) => r.resolve<_Service>().label);
+    final scope = root.createScope();
+
+    scope.resolve<String>();
+    expect(root.profiler, isNull);
+
+    final profiler = root.enableProfiling();
+    for (var i = 0; i < 10; i++) {
+      scope.resolve<String>();
+    }
+    root.resolve<_Service>();
+
+    expect(profiler.statsFor<String>()!.count, 10);
+    // 嵌套解析同样计数
+    expect(profiler.statsFor<_Service>()!.count, 11);
+    expect(profiler.stats, hasLength(2));
+
+    root.disableProfiling();
+    scope.resolve<String>();
+    expect(profiler.statsFor<String>()!.count, 10);
+  });
+
+  test('profiler reset keeps recording into the same slots', () {
+    final root = Container();
+    root.registerSingleton<_Service>((_) => _Service('s'));
+    final profiler = root.enableProfiling();
+
+    for (var i = 0; i < 3; i++) {
+      root.resolve<_Service>();
+    }
+    expect(profiler.statsFor<_Service>()!.count, 3);
+
+    profiler.reset();
+    expect(profiler.statsFor<_Service>()!.count, 0);
+    expect(profiler.statsFor<_Service>()!.total, Duration.zero);
+
+    // 已编译的绑定仍持有原统计槽，重置后继续计数
+    root.resolve<_Service>();
+    root.resolve<_Service>();
+    expect(profiler.statsFor<_Service>()!.count, 2);
+  });
+}
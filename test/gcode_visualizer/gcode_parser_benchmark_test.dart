@@ -0,0 +1,68 @@
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/parser/gcode_parser.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/parser/gcode_stream_parser.dart';
+
+const _kLineCount = 200000;
+
+String _generateProgram(int lineCount) {
+  final buffer = StringBuffer('; benchmark program\n');
+  for (var i = 1; i < lineCount; i++) {
+    final x = (i % 400) * 0.25;
+    final y = (i ~/ 400) * 0.5;
+    if (i % 50 == 0) {
+      buffer.writeln('G0 X${x.toStringAsFixed(3)} Y${y.toStringAsFixed(3)}');
+    } else if (i % 10 == 0) {
+      buffer.writeln('G1 X${x.toStringAsFixed(3)} F1200 ; pass $i');
+    } else {
+      buffer.writeln(
+          'G1 X${x.toStringAsFixed(3)} Y${y.toStringAsFixed(3)} (seg $i)');
+    }
+  }
+  return buffer.toString();
+}
+
+String _linesPerSecond(int lines, Duration elapsed) {
+  final seconds = elapsed.inMicroseconds / Duration.microsecondsPerSecond;
+  return (lines / seconds).toStringAsFixed(0);
+}
+
+void main() {
+  test('benchmark: GcodeParser vs GcodeStreamParser lines/sec', () async {
+    final source = _generateProgram(_kLineCount);
+
+    final legacyWatch = Stopwatch()..start();
+    final legacy = GcodeParser().parse(source);
+    legacyWatch.stop();
+
+    final streamWatch = Stopwatch()..start();
+    final streamed = const GcodeStreamParser().parse(source);
+    streamWatch.stop();
+
+    final backgroundWatch = Stopwatch()..start();
+    var backgroundCommands = 0;
+    var chunkCount = 0;
+    await for (final chunk
+        in const GcodeStreamParser().parseInBackground(source)) {
+      backgroundCommands += chunk.commands.length;
+      chunkCount++;
+    }
+    backgroundWatch.stop();
+
+    debugPrint('G-code parse benchmark ($_kLineCount lines)');
+    debugPrint('  GcodeParser.parse:             '
+        '${legacyWatch.elapsedMilliseconds} ms, '
+        '${_linesPerSecond(_kLineCount, legacyWatch.elapsed)} lines/s');
+    debugPrint('  GcodeStreamParser.parse:       '
+        '${streamWatch.elapsedMilliseconds} ms, '
+        '${_linesPerSecond(_kLineCount, streamWatch.elapsed)} lines/s');
+    debugPrint('  GcodeStreamParser (isolate):   '
+        '${backgroundWatch.elapsedMilliseconds} ms, '
+        '${_linesPerSecond(_kLineCount, backgroundWatch.elapsed)} lines/s, '
+        '$chunkCount chunks');
+
+    expect(streamed.commands.length, legacy.commands.length);
+    expect(streamed.errors.length, legacy.errors.length);
+    expect(backgroundCommands, legacy.commands.length);
+  });
+}
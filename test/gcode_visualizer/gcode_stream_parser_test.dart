@@ -0,0 +1,93 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/parser/gcode_parse_result.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/parser/gcode_parser.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/parser/gcode_stream_parser.dart';
+
+void main() {
+  group('GcodeStreamParser', () {
+    const streamParser = GcodeStreamParser(chunkSize: 2);
+    final parser = GcodeParser();
+
+    void expectSameResult(GcodeParseResult actual, GcodeParseResult expected) {
+      expect(actual.commands, hasLength(expected.commands.length));
+      expect(actual.errors, hasLength(expected.errors.length));
+      for (var i = 0; i < expected.commands.length; i++) {
+        final a = actual.commands[i];
+        final e = expected.commands[i];
+        expect(a.lineNumber, e.lineNumber);
+        expect(a.rawLine, e.rawLine);
+        expect(a.code, e.code);
+        expect(a.params, e.params);
+        expect(a.comment, e.comment);
+      }
+      for (var i = 0; i < expected.errors.length; i++) {
+        expect(actual.errors[i].lineNumber, expected.errors[i].lineNumber);
+        expect(actual.errors[i].rawLine, expected.errors[i].rawLine);
+        expect(actual.errors[i].message, expected.errors[i].message);
+      }
+    }
+
+    test('matches GcodeParser on mixed input', () {
+      const source = '''
+; header comment
+G0 X0 Y0
+g1 x10.5 y-.25 f1200 ; cut
+G01 X1(inline)0 Y3 (trailing)
+G00\tX5\t\tY5\r
+(only a comment)
+G1 X10 ; a ; b (c) d
+
+G2 X10 Y10 I5 J5
+G1 Xabc Y10
+G1 X10abc
+G1 X
+G1X10
+G1 X1.2345678901234567 Y123456789012345678
+G1 X-0 Y5
+''';
+      expectSameResult(streamParser.parse(source), parser.parse(source));
+    });
+
+    test('keeps line numbers across chunks', () {
+      final chunks = streamParser
+          .parseChunks('G0 X1\nG0 X2\nG0 X3\nG2 X4\nG0 X5')
+          .toList();
+      expect(chunks, hasLength(3));
+      expect(chunks.first.isLast, isFalse);
+      expect(chunks.last.isLast, isTrue);
+      expect(chunks.last.progress, 1.0);
+      expect(chunks[1].errors.single.lineNumber, 4);
+      expect(chunks.last.commands.single.lineNumber, 5);
+    });
+
+    test('empty source yields a single final chunk', () {
+      final chunks = streamParser.parseChunks('').toList();
+      expect(chunks, hasLength(1));
+      expect(chunks.single.isLast, isTrue);
+      expect(chunks.single.commands, isEmpty);
+    });
+
+    test('only large sources parse in background', () {
+      expect(
+        GcodeStreamParser.shouldParseInBackground('G0 X1\nG1 X2'),
+        isFalse,
+      );
+      final large = List.filled(2000, 'G1 X1 Y1').join('\n');
+      expect(GcodeStreamParser.shouldParseInBackground(large), isTrue);
+    });
+
+    test('parseInBackground streams chunks from an isolate', () async {
+      final source = List.generate(25, (i) => 'G1 X$i Y$i').join('\n');
+      final chunks = await const GcodeStreamParser(chunkSize: 10)
+          .parseInBackground(source)
+          .toList();
+
+      expect(chunks, hasLength(3));
+      expect(chunks.last.isLast, isTrue);
+      final commands = chunks.expand((c) => c.commands).toList();
+      expect(commands, hasLength(25));
+      expect(commands.last.lineNumber, 25);
+      expect(commands.last.x, 24);
+    });
+  });
+}
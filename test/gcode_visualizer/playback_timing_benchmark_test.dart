@@ -0,0 +1,101 @@
+import 'dart:async';
+import 'dart:math';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/state/gcode_player_controller.dart';
+
+const _kTicks = 200000;
+const _kSeeks = 100000;
+
+/// N 行的往复切削程序，每 400 行换行并快速移动一次。
+String _generateProgram(int lineCount) {
+  final buffer = StringBuffer('G0 X0 Y0\n');
+  for (var i = 1; i < lineCount; i++) {
+    final x = (i % 400) * 0.25;
+    final y = (i ~/ 400) * 0.5;
+    if (i % 400 == 0) {
+      buffer.writeln('G0 X${x.toStringAsFixed(2)} Y${y.toStringAsFixed(2)}');
+    } else {
+      buffer.writeln('G1 X${x.toStringAsFixed(2)} Y${y.toStringAsFixed(2)} '
+          'F${600 + i % 1800}');
+    }
+  }
+  return buffer.toString();
+}
+
+/// 走完控制器自己的解析流程（大文件在后台 Isolate 解析，完成后一次性建立
+/// 列存储和时间表）。
+Future<void> _parse(GcodePlayerController controller, String source) {
+  final done = Completer<void>();
+  void onChanged() {
+    if (done.isCompleted) return;
+    if (!controller.isParsing && controller.parseResult != null) {
+      done.complete();
+    }
+  }
+
+  controller
+    ..updateSource(source)
+    ..addListener(onChanged)
+    ..parse();
+  return done.future
+      .timeout(const Duration(minutes: 2))
+      .whenComplete(() => controller.removeListener(onChanged));
+}
+
+void main() {
+  test('benchmark: per-tick playback cost is independent of program size',
+      () async {
+    debugPrint('Playback benchmark ($_kTicks ticks, $_kSeeks seeks)');
+
+    for (final lines in [10000, 100000, 1000000]) {
+      final controller = GcodePlayerController(vsync: const TestVSync());
+      addTearDown(controller.dispose);
+      final source = _generateProgram(lines);
+
+      final parseWatch = Stopwatch()..start();
+      await _parse(controller, source);
+      parseWatch.stop();
+      final segments = controller.segments;
+      expect(controller.totalCommands, lines);
+      expect(segments.length, greaterThan(lines ~/ 2));
+
+      // 顺序播放：暂停状态下设置动画值会触发控制器的 tick 回调，
+      // 与动画每帧的路径相同
+      final tickWatch = Stopwatch()..start();
+      for (var tick = 0; tick <= _kTicks; tick++) {
+        controller.seek(tick / _kTicks);
+      }
+      tickWatch.stop();
+      expect(controller.currentSegmentIndex, segments.length - 1);
+      expect(
+        controller.currentCommandIndex,
+        segments.commandIndex[segments.length - 1],
+      );
+
+      // 随机跳转：按进度（二分查找）和按指令（段 <-> 指令直接映射）
+      final random = Random(42);
+      final seekWatch = Stopwatch()..start();
+      for (var i = 0; i < _kSeeks; i++) {
+        controller.seek(random.nextDouble());
+      }
+      seekWatch.stop();
+
+      final commandWatch = Stopwatch()..start();
+      for (var i = 0; i < _kSeeks; i++) {
+        controller.seekToCommand(random.nextInt(controller.totalCommands));
+      }
+      commandWatch.stop();
+      expect(controller.currentSegmentIndex, isNonNegative);
+
+      String perOp(Stopwatch watch, int count) =>
+          (watch.elapsedMicroseconds * 1000 / count).toStringAsFixed(0);
+      debugPrint('  $lines lines: '
+          'parse + build ${parseWatch.elapsedMilliseconds} ms, '
+          'tick ${perOp(tickWatch, _kTicks)} ns, '
+          'seek ${perOp(seekWatch, _kSeeks)} ns, '
+          'seekToCommand ${perOp(commandWatch, _kSeeks)} ns');
+    }
+  });
+}
@@ -90,5 +90,46 @@ void main() {
       final segments = ToolpathBuilder.build([]);
       expect(segments, isEmpty);
     });
+
+    test('stores segments in packed columns with command mapping', () {
+      final commands = [
+        const GcodeCommand(
+          lineNumber: 1,
+          rawLine: 'G0 X-5 Y10',
+          code: 'G0',
+          params: {'X': -5, 'Y': 10},
+        ),
+        const GcodeCommand(
+          lineNumber: 2,
+          rawLine: 'G1 F600',
+          code: 'G1',
+          params: {'F': 600},
+        ),
+        const GcodeCommand(
+          lineNumber: 3,
+          rawLine: 'G1 X20',
+          code: 'G1',
+          params: {'X': 20},
+        ),
+      ];
+
+      final store = ToolpathBuilder.build(commands);
+
+      expect(store.length, 2);
+      expect(store.endX, [-5, 20]);
+      expect(store.endY, [10, 10]);
+      expect(store.startX, [0, -5]);
+      expect(store.feedRate, [0, 600]);
+      expect(store.typeAt(0), GcodeSegmentType.rapid);
+      expect(store.typeAt(1), GcodeSegmentType.linear);
+      expect(store.commandIndex, [0, 2]);
+      expect(store.segmentIndexOfCommand, [0, -1, 1]);
+      expect(store.lineNumberAt(1), 3);
+      expect(store[1].command.rawLine, 'G1 X20');
+      expect(store.minX, -5);
+      expect(store.maxX, 20);
+      expect(store.minY, 0);
+      expect(store.maxY, 10);
+    });
   });
 }
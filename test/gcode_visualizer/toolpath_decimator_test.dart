@@ -0,0 +1,90 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/models/gcode_command.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/services/toolpath_builder.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/services/toolpath_decimator.dart';
+
+GcodeCommand _move(int line, String code, double x, double y) {
+  return GcodeCommand(
+    lineNumber: line,
+    rawLine: '$code X$x Y$y',
+    code: code,
+    params: {'X': x, 'Y': y},
+  );
+}
+
+void main() {
+  group('ToolpathViewport', () {
+    test('maps bounds with Y axis flipped', () {
+      final viewport = ToolpathViewport.fit(
+        width: 160,
+        height: 160,
+        minX: -50,
+        maxX: 50,
+        minY: -50,
+        maxY: 50,
+      );
+
+      expect(viewport.scale, 1);
+      expect(viewport.screenX(-50), 30);
+      expect(viewport.screenY(50), 30);
+      expect(viewport.screenY(-50), 130);
+    });
+  });
+
+  group('ToolpathDecimator', () {
+    test('keeps long segments and groups them by type', () {
+      final store = ToolpathBuilder.build([
+        _move(1, 'G0', 10, 0),
+        _move(2, 'G1', 10, 10),
+        _move(3, 'G1', 0, 10),
+      ]);
+      final viewport =
+          ToolpathViewport.forStore(store, width: 200, height: 200);
+
+      final lines = ToolpathDecimator().decimate(store, viewport);
+
+      expect(lines.rapid.length, 4);
+      expect(lines.linear.length, 8);
+      expect(lines.lineCount, 3);
+    });
+
+    test('never emits more short lines than there are pixels', () {
+      const size = 100;
+      final commands = <GcodeCommand>[];
+      for (var i = 0; i < 100000; i++) {
+        // 反复来回的细密折线，远小于 1 像素
+        final x = (i % 200) * 0.5;
+        final y = (i ~/ 200) * 0.2;
+        commands.add(_move(i + 1, 'G1', x, y));
+      }
+      final store = ToolpathBuilder.build(commands);
+      final viewport = ToolpathViewport.forStore(
+        store,
+        width: size.toDouble(),
+        height: size.toDouble(),
+      );
+
+      final lines = ToolpathDecimator().decimate(store, viewport);
+
+      expect(store.length, greaterThan(size * size));
+      expect(lines.lineCount, lessThanOrEqualTo(size * size));
+      expect(lines.lineCount, greaterThan(0));
+    });
+
+    test('decimates a sub range only', () {
+      final store = ToolpathBuilder.build([
+        _move(1, 'G1', 10, 0),
+        _move(2, 'G1', 10, 10),
+        _move(3, 'G1', 0, 10),
+      ]);
+      final viewport =
+          ToolpathViewport.forStore(store, width: 200, height: 200);
+
+      final lines = ToolpathDecimator().decimate(store, viewport, start: 1);
+
+      expect(lines.lineCount, 2);
+      expect(lines.linear[0], viewport.screenX(10));
+      expect(lines.linear[1], viewport.screenY(0));
+    });
+  });
+}
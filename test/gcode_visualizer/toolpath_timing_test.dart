@@ -0,0 +1,83 @@
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/models/gcode_command.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/services/toolpath_builder.dart';
+import 'package:main_app/modules/ui/gcode_visualizer/services/toolpath_timing.dart';
+
+void main() {
+  group('ToolpathTiming', () {
+    // 10mm @ F600 = 1s, 30mm @ F600 = 3s, G0 50mm @ 5000 = 0.6s
+    final store = ToolpathBuilder.build(const [
+      GcodeCommand(
+        lineNumber: 1,
+        rawLine: 'G1 X10 F600',
+        code: 'G1',
+        params: {'X': 10, 'F': 600},
+      ),
+      GcodeCommand(
+        lineNumber: 2,
+        rawLine: 'G1 Y30',
+        code: 'G1',
+        params: {'Y': 30},
+      ),
+      GcodeCommand(
+        lineNumber: 3,
+        rawLine: 'G1 F100',
+        code: 'G1',
+        params: {'F': 100},
+      ),
+      GcodeCommand(
+        lineNumber: 4,
+        rawLine: 'G0 Y-20',
+        code: 'G0',
+        params: {'Y': -20},
+      ),
+    ]);
+    final timing = ToolpathTiming.fromStore(store);
+
+    test('accumulates length and estimated time', () {
+      expect(timing.length, 3);
+      expect(timing.cumulativeLength[0], closeTo(10, 1e-9));
+      expect(timing.cumulativeLength[1], closeTo(40, 1e-9));
+      expect(timing.totalLength, closeTo(90, 1e-6));
+      expect(timing.cumulativeTime[0], closeTo(1, 1e-9));
+      expect(timing.cumulativeTime[1], closeTo(4, 1e-9));
+      expect(timing.totalTime, closeTo(4.6, 1e-6));
+    });
+
+    test('maps progress to segments by time, not by index', () {
+      expect(timing.segmentAt(0), 0);
+      expect(timing.segmentAt(0.5), 1);
+      expect(timing.segmentAt(0.9), 2);
+      expect(timing.segmentAt(1), 2);
+      expect(timing.localProgress(1, 2.5 / 4.6), closeTo(0.5, 1e-9));
+    });
+
+    test('hint and binary search agree', () {
+      for (var i = 0; i <= 100; i++) {
+        final progress = i / 100;
+        final expected = timing.segmentAt(progress);
+        for (var hint = -1; hint < timing.length; hint++) {
+          expect(timing.segmentAt(progress, hint: hint), expected);
+        }
+      }
+    });
+
+    test('segment start progress maps back to that segment', () {
+      for (var i = 0; i < timing.length; i++) {
+        final start = timing.progressAtSegmentStart(i);
+        expect(
+          start * timing.totalTime,
+          closeTo(timing.segmentStartTime(i), 1e-9),
+        );
+      }
+      expect(store.segmentAtOrAfterCommand(2), 2);
+      expect(store.segmentAtOrAfterCommand(4), store.length);
+    });
+
+    test('empty timing', () {
+      final empty = ToolpathTiming.empty();
+      expect(empty.totalTime, 0);
+      expect(empty.segmentAt(0.5), -1);
+    });
+  });
+}
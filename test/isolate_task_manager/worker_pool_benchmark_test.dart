@@ -0,0 +1,57 @@
+import 'dart:async';
+import 'dart:io';
+import 'dart:isolate';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/async/isolate_task_manager/task_messages.dart';
+import 'package:main_app/modules/async/isolate_task_manager/worker_pool.dart';
+
+const _kTasks = 300;
+
+void _echo(SendPort port) => port.send(null);
+
+void main() {
+  test('benchmark: burst of $_kTasks tasks', () async {
+    debugPrint('Isolate burst benchmark ($_kTasks tasks, '
+        '${Platform.numberOfProcessors} cores)');
+
+    // 对照：每个任务单独 spawn 一个空 Isolate（原实现的启动开销）
+    final spawnWatch = Stopwatch()..start();
+    final port = ReceivePort();
+    var replies = 0;
+    final allReplied = Completer<void>();
+    port.listen((_) {
+      if (++replies == _kTasks) allReplied.complete();
+    });
+    for (var i = 0; i < _kTasks; i++) {
+      await Isolate.spawn(_echo, port.sendPort);
+    }
+    await allReplied.future;
+    spawnWatch.stop();
+    port.close();
+
+    // 线程池：工作 Isolate 数量固定，任务排队复用
+    var completed = 0;
+    final allCompleted = Completer<void>();
+    final pool = TaskWorkerPool(onEvent: (event) {
+      if (event is TaskCompletedEvent && ++completed == _kTasks) {
+        allCompleted.complete();
+      }
+    });
+    final poolWatch = Stopwatch()..start();
+    for (var id = 1; id <= _kTasks; id++) {
+      pool.submit(TaskRequest(taskId: id, stepInterval: Duration.zero));
+    }
+    await allCompleted.future.timeout(const Duration(minutes: 1));
+    poolWatch.stop();
+    final workers = pool.workerCount;
+    await pool.close();
+
+    expect(workers, lessThanOrEqualTo(Platform.numberOfProcessors));
+    debugPrint('  spawn per task (empty body): '
+        '${spawnWatch.elapsedMilliseconds} ms');
+    debugPrint('  pool of $workers workers (10-30 steps each): '
+        '${poolWatch.elapsedMilliseconds} ms');
+  });
+}
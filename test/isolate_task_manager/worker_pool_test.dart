@@ -0,0 +1,252 @@
+import 'dart:async';
+import 'dart:isolate';
+import 'dart:typed_data';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/async/isolate_task_manager/task_manager.dart';
+import 'package:main_app/modules/async/isolate_task_manager/task_messages.dart';
+import 'package:main_app/modules/async/isolate_task_manager/worker_pool.dart';
+
+const _step = Duration(milliseconds: 1);
+
+/// 收到任务后立即抛出未捕获异常的工作 Isolate
+void _crashingWorker(WorkerBootstrap bootstrap) {
+  final commandPort = ReceivePort();
+  bootstrap.eventPort
+      .send(WorkerReadyEvent(bootstrap.workerId, commandPort.sendPort));
+  commandPort.listen((dynamic message) {
+    if (message is StartTaskCommand) throw StateError('worker crashed');
+  });
+}
+
+/// 收集线程池事件，直到指定数量的任务完成
+class _EventLog {
+  final events = <WorkerEvent>[];
+  final _completed = <int>{};
+  Completer<void>? _waiter;
+  int _expected = 0;
+
+  void add(WorkerEvent event) {
+    events.add(event);
+    if (event is TaskCompletedEvent) {
+      _completed.add(event.taskId);
+      if (_completed.length >= _expected) _waiter?.complete();
+    }
+  }
+
+  Future<void> waitForCompleted(int count) {
+    _expected = count;
+    if (_completed.length >= count) return Future.value();
+    _waiter = Completer<void>();
+    return _waiter!.future.timeout(const Duration(seconds: 20));
+  }
+
+  List<int> get startOrder => events
+      .whereType<TaskStartedEvent>()
+      .map((event) => event.taskId)
+      .toList();
+
+  Iterable<TaskEvent> eventsFor(int taskId) =>
+      events.whereType<TaskEvent>().where((event) => event.taskId == taskId);
+}
+
+void main() {
+  group('TaskWorkerPool', () {
+    late _EventLog log;
+    late TaskWorkerPool pool;
+
+    tearDown(() => pool.close());
+
+    test('never runs more tasks than workers', () async {
+      log = _EventLog();
+      pool = TaskWorkerPool(size: 2, onEvent: log.add);
+
+      var maxRunning = 0;
+      for (var id = 1; id <= 8; id++) {
+        pool.submit(TaskRequest(taskId: id, stepInterval: _step));
+        expect(pool.runningCount, lessThanOrEqualTo(2));
+      }
+      expect(pool.runningCount, 2);
+      expect(pool.queuedCount, 6);
+
+      final timer = Timer.periodic(_step, (_) {
+        if (pool.runningCount > maxRunning) maxRunning = pool.runningCount;
+      });
+      await log.waitForCompleted(8);
+      timer.cancel();
+
+      expect(maxRunning, lessThanOrEqualTo(2));
+      expect(pool.workerCount, 2);
+      expect(pool.runningCount, 0);
+      expect(log.startOrder, [1, 2, 3, 4, 5, 6, 7, 8]);
+    });
+
+    test('dequeues by priority, then by submission order', () async {
+      log = _EventLog();
+      pool = TaskWorkerPool(size: 1, onEvent: log.add);
+
+      pool.submit(const TaskRequest(taskId: 1, stepInterval: _step));
+      pool.submit(const TaskRequest(taskId: 2, stepInterval: _step));
+      pool.submit(
+        const TaskRequest(taskId: 3, priority: 5, stepInterval: _step),
+      );
+      pool.submit(const TaskRequest(taskId: 4, stepInterval: _step));
+      pool.submit(
+        const TaskRequest(taskId: 5, priority: 5, stepInterval: _step),
+      );
+
+      await log.waitForCompleted(5);
+      expect(log.startOrder, [1, 3, 5, 2, 4]);
+    });
+
+    test('stopped tasks emit no further events', () async {
+      log = _EventLog();
+      pool = TaskWorkerPool(size: 1, onEvent: log.add);
+
+      pool.submit(const TaskRequest(taskId: 1, stepInterval: _step));
+      pool.submit(const TaskRequest(taskId: 2, stepInterval: _step));
+      pool.submit(const TaskRequest(taskId: 3, stepInterval: _step));
+
+      expect(pool.stop(2), isTrue);
+      expect(pool.isQueued(2), isFalse);
+      expect(pool.stop(1), isTrue);
+      final eventsOfStopped = log.eventsFor(1).length;
+
+      await log.waitForCompleted(1);
+      expect(log.startOrder, [1, 3]);
+      expect(log.eventsFor(1), hasLength(eventsOfStopped));
+      expect(log.eventsFor(2), isEmpty);
+      expect(pool.stop(42), isFalse);
+    });
+
+    test('transfers large payloads and returns the checksum', () async {
+      log = _EventLog();
+      pool = TaskWorkerPool(size: 1, onEvent: log.add);
+
+      final bytes = Uint8List(TaskPayload.transferThreshold * 4);
+      var expected = 0;
+      for (var i = 0; i < bytes.length; i++) {
+        bytes[i] = i & 0xFF;
+        expected += i & 0xFF;
+      }
+      expect(TaskPayload(bytes).isTransferable, isTrue);
+
+      pool.submit(TaskRequest(taskId: 1, stepInterval: _step, payload: bytes));
+      await log.waitForCompleted(1);
+
+      final completed = log.events.whereType<TaskCompletedEvent>().single;
+      expect(completed.checksum, expected);
+      // 发送方的数据不受影响
+      expect(bytes[255], 255);
+    });
+
+    test('crashed workers fail their task and free the slot', () async {
+      final failed = <TaskFailedEvent>[];
+      final allFailed = Completer<void>();
+      log = _EventLog();
+      pool = TaskWorkerPool(
+        size: 1,
+        workerEntryPoint: _crashingWorker,
+        onEvent: (event) {
+          log.add(event);
+          if (event is TaskFailedEvent) {
+            failed.add(event);
+            if (failed.length == 3) allFailed.complete();
+          }
+        },
+      );
+
+      for (var id = 1; id <= 3; id++) {
+        pool.submit(TaskRequest(taskId: id, stepInterval: _step));
+      }
+      await allFailed.future.timeout(const Duration(seconds: 20));
+
+      // 每个任务都换了一个新的工作 Isolate 执行，死掉的不再占用名额
+      expect(failed.map((event) => event.taskId), [1, 2, 3]);
+      expect(failed.first.error, contains('worker crashed'));
+      expect(log.startOrder, [1, 2, 3]);
+      final workerIds =
+          log.events.whereType<TaskStartedEvent>().map((e) => e.workerId);
+      expect(workerIds.toSet(), hasLength(3));
+      expect(pool.runningCount, 0);
+      expect(pool.workerCount, 0);
+    });
+
+        test('rejects duplicate submissions', () {
+      log = _EventLog();
+      pool = TaskWorkerPool(size: 1, onEvent: log.add);
+
+      pool.submit(const TaskRequest(taskId: 1, stepInterval: _step));
+      expect(
+        () => pool.submit(const TaskRequest(taskId: 1)),
+        throwsStateError,
+      );
+    });
+  });
+
+  group('TaskManager', () {
+    test('coalesces updates into one notification per flush', () async {
+      final pendingFlushes = <void Function()>[];
+      final updates = <int>[];
+      final completed = <int>[];
+      final manager = TaskManager(
+        poolSize: 2,
+        stepInterval: _step,
+        scheduleFlush: pendingFlushes.add,
+        onTaskUpdate: (task) => updates.add(task.id),
+        onTaskComplete: (task) => completed.add(task.id),
+      );
+      addTearDown(manager.dispose);
+
+      final tasks = [for (var i = 0; i < 4; i++) manager.startNewTask()];
+      expect(tasks.where((task) => task.isRunning), hasLength(2));
+      expect(tasks.where((task) => task.isQueued), hasLength(2));
+
+      // 在“帧”之间积累事件，每次只调度一次 flush
+      var frames = 0;
+      while (completed.length < tasks.length && frames < 2000) {
+        await Future<void>.delayed(const Duration(milliseconds: 5));
+        expect(pendingFlushes.length, lessThanOrEqualTo(1));
+        if (pendingFlushes.isNotEmpty) {
+          final before = updates.length;
+          pendingFlushes.removeLast()();
+          // 同一帧内每个任务最多通知一次
+          final ids = updates.sublist(before);
+          expect(ids.toSet(), hasLength(ids.length));
+        }
+        frames++;
+      }
+
+      expect(completed.toSet(), tasks.map((task) => task.id).toSet());
+      expect(tasks.every((task) => task.progress == 100), isTrue);
+    });
+
+    test('pause keeps progress and releases the worker', () async {
+      final manager = TaskManager(
+        poolSize: 1,
+        stepInterval: const Duration(milliseconds: 20),
+        scheduleFlush: (flush) => scheduleMicrotask(flush),
+      );
+      addTearDown(manager.dispose);
+
+      final first = manager.startNewTask();
+      final second = manager.startNewTask();
+      expect(first.isRunning, isTrue);
+      expect(second.isQueued, isTrue);
+
+      await Future<void>.delayed(const Duration(milliseconds: 50));
+      manager.pauseTask(first);
+      final pausedProgress = first.progress;
+
+      expect(first.isPaused, isTrue);
+      expect(second.isRunning, isTrue);
+
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+      expect(first.progress, pausedProgress);
+
+      manager.resumeTask(first);
+      expect(first.isQueued, isTrue);
+      expect(manager.taskById(first.id), same(first));
+    });
+  });
+}
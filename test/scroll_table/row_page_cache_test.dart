@@ -0,0 +1,139 @@
+import 'dart:async';
+import 'dart:typed_data';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/scroll_table/data/row_data_source.dart';
+
+/// 每次加载都挂起，由测试决定何时完成
+class _ManualSource implements TableRowSource {
+  _ManualSource(this.rowCount);
+
+  @override
+  int rowCount;
+
+  final requests = <int, Completer<TableRowPage>>{};
+
+  @override
+  List<String> get columnHeaders => const ['value'];
+
+  @override
+  Future<TableRowPage> loadPage(int start, int count) {
+    final completer = Completer<TableRowPage>();
+    requests[start] = completer;
+    return completer.future;
+  }
+
+  void complete(int start, {String prefix = 'r'}) {
+    final count = (rowCount - start).clamp(0, 10);
+    requests.remove(start)!.complete(TableRowPage(
+      start: start,
+      columnCount: 1,
+      rowIds: Int32List.fromList([for (var i = 0; i < count; i++) start + i]),
+      cells: [for (var i = 0; i < count; i++) '$prefix${start + i}'],
+    ));
+  }
+
+  void completeAll({String prefix = 'r'}) {
+    for (final start in requests.keys.toList()) {
+      complete(start, prefix: prefix);
+    }
+  }
+}
+
+void main() {
+  late _ManualSource source;
+  late RowPageCache cache;
+  late int notifications;
+
+  setUp(() {
+    source = _ManualSource(1000);
+    cache = RowPageCache(source, pageSize: 10, maxPages: 4, prefetchPages: 1);
+    notifications = 0;
+    cache.addListener(() => notifications++);
+  });
+
+  tearDown(() => cache.dispose());
+
+  test('loads a page once and serves cells synchronously', () async {
+    expect(cache.cellAt(15, 0), isNull);
+    expect(cache.cellAt(16, 0), isNull);
+    expect(source.requests.keys, [10]);
+
+    source.complete(10);
+    await Future<void>.delayed(Duration.zero);
+
+    expect(notifications, 1);
+    expect(cache.cellAt(15, 0), 'r15');
+    expect(cache.rowIdAt(19), 19);
+    expect(cache.loads, 1);
+  });
+
+  test('prefetches ahead of the scroll direction', () async {
+    cache.updateViewport(20, 25);
+    expect(source.requests.keys, unorderedEquals([20, 30]));
+    source.completeAll();
+
+    cache.updateViewport(30, 35);
+    expect(source.requests.keys, [40]);
+    source.completeAll();
+
+    // 向上滚动时预取上方的页
+    cache.updateViewport(12, 17);
+    expect(source.requests.keys, unorderedEquals([10, 0]));
+  });
+
+  test('keeps at most maxPages pages, evicting the least recently used',
+      () async {
+    for (var page = 0; page < 4; page++) {
+      cache.cellAt(page * 10, 0);
+    }
+    source.completeAll();
+    await Future<void>.delayed(Duration.zero);
+    expect(cache.cachedPageCount, 4);
+
+    // 访问第 0 页后，第 1 页成为最久未访问的页
+    expect(cache.cellAt(0, 0), 'r0');
+    cache.cellAt(40, 0);
+    source.completeAll();
+    await Future<void>.delayed(Duration.zero);
+
+    expect(cache.cachedPages, [2, 3, 0, 4]);
+    expect(cache.evictions, 1);
+    expect(cache.isRowLoaded(10), isFalse);
+  });
+
+  test('invalidate drops pages and ignores loads already in flight', () async {
+    cache.cellAt(0, 0);
+    final stale = source.requests[0]!;
+    cache.invalidate();
+
+    expect(cache.cellAt(0, 0), isNull);
+    final fresh = source.requests[0]!;
+    expect(fresh, isNot(same(stale)));
+
+    stale.complete(TableRowPage(
+      start: 0,
+      columnCount: 1,
+      rowIds: Int32List(1),
+      cells: const ['stale'],
+    ));
+    source.complete(0, prefix: 'new');
+    await Future<void>.delayed(Duration.zero);
+
+    expect(cache.cellAt(0, 0), 'new0');
+  });
+
+  test('records failed pages without retrying on every access', () async {
+    cache.cellAt(0, 0);
+    source.requests.remove(0)!.completeError(StateError('offline'));
+    await Future<void>.delayed(Duration.zero);
+
+    expect(cache.failedPages.keys, [0]);
+    expect(cache.cellAt(0, 0), isNull);
+    expect(source.requests, isEmpty);
+
+    cache.invalidate();
+    expect(cache.cellAt(0, 0), isNull);
+    expect(source.requests.keys, [0]);
+  });
+}
@@ -0,0 +1,89 @@
+import 'package:flutter/material.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/scroll_table/data/row_data_source.dart';
+import 'package:main_app/modules/ui/scroll_table/widgets/scroll_table.dart';
+
+const _kRows = 1000000;
+const _kFrames = 600;
+const _kCellHeight = 40.0;
+const _kFrameBudget = Duration(microseconds: 16667);
+
+String _percentile(List<int> sorted, double p) {
+  final index = ((sorted.length - 1) * p).round();
+  return (sorted[index] / 1000).toStringAsFixed(2);
+}
+
+void main() {
+  testWidgets('benchmark: scroll $_kRows rows', (tester) async {
+    tester.view.physicalSize = const Size(1200, 800);
+    tester.view.devicePixelRatio = 1.0;
+    addTearDown(tester.view.reset);
+
+    final generateWatch = Stopwatch()..start();
+    final table = TableData.generateLargeTable(_kRows, metricColumns: 16);
+    generateWatch.stop();
+
+    final rows = RowPageCache(ColumnarRowSource(table));
+    addTearDown(rows.dispose);
+    final controller = ScrollController();
+    addTearDown(controller.dispose);
+
+    await tester.pumpWidget(MaterialApp(
+      home: Scaffold(
+        body: ScrollTable.paged(
+          rows: rows,
+          verticalController: controller,
+          cellHeight: _kCellHeight,
+        ),
+      ),
+    ));
+    await tester.pump(const Duration(milliseconds: 16));
+
+    // 三段滚动：匀速向下、快速甩动、跳到中间后向上
+    final frameTimes = <int>[];
+    final maxOffset = controller.position.maxScrollExtent;
+    var offset = 0.0;
+    for (var frame = 0; frame < _kFrames; frame++) {
+      final double step;
+      if (frame < _kFrames / 3) {
+        step = _kCellHeight * 2;
+      } else if (frame < _kFrames * 2 / 3) {
+        step = _kCellHeight * 40;
+      } else {
+        step = -_kCellHeight * 3;
+      }
+      if (frame == _kFrames * 2 ~/ 3) offset = maxOffset / 2;
+      offset = (offset + step).clamp(0.0, maxOffset);
+
+      final watch = Stopwatch()..start();
+      controller.jumpTo(offset);
+      await tester.pump(const Duration(milliseconds: 16));
+      frameTimes.add(watch.elapsedMicroseconds);
+    }
+
+    // 滚动停止后可见行全部加载
+    await tester.pumpAndSettle();
+    final firstVisible = (controller.offset / _kCellHeight).floor();
+    expect(rows.isRowLoaded(firstVisible), isTrue);
+    expect(rows.cachedPageCount, lessThanOrEqualTo(rows.maxPages));
+    expect(rows.failedPages, isEmpty);
+    await tester.pumpWidget(const SizedBox());
+
+    final sorted = [...frameTimes]..sort();
+    final janky = frameTimes
+        .where((us) => us > _kFrameBudget.inMicroseconds)
+        .length;
+    final total = frameTimes.fold<int>(0, (sum, us) => sum + us);
+    debugPrint('ScrollTable benchmark ($_kRows rows × '
+        '${table.columnCount} columns, $_kFrames frames)');
+    debugPrint('  generate columns: ${generateWatch.elapsedMilliseconds} ms');
+    final average = total / frameTimes.length / 1000;
+    debugPrint('  frame ms: avg ${average.toStringAsFixed(2)}'
+        ', p50 ${_percentile(sorted, 0.5)}, p90 ${_percentile(sorted, 0.9)}'
+        ', p99 ${_percentile(sorted, 0.99)}, max ${_percentile(sorted, 1)}');
+    debugPrint('  jank (> 16.7 ms): $janky / $_kFrames frames');
+    debugPrint('  pages: loads ${rows.loads}, resident ${rows.cachedPageCount}'
+        ' / ${rows.maxPages}, evictions ${rows.evictions}, '
+        'cell hits ${rows.hits}, misses ${rows.misses}');
+  });
+}
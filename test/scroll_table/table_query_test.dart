@@ -0,0 +1,104 @@
+import 'dart:typed_data';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/ui/scroll_table/data/row_data_source.dart';
+import 'package:main_app/modules/ui/scroll_table/data/table_column.dart';
+import 'package:main_app/modules/ui/scroll_table/data/table_query.dart';
+import 'package:main_app/modules/ui/scroll_table/widgets/scroll_table.dart';
+
+ColumnarTable _smallTable() {
+  return ColumnarTable(
+    headers: const ['name', 'age', 'score'],
+    columns: [
+      CategoryColumn(
+        const ['carol', 'alice', 'bob'],
+        Uint16List.fromList([0, 1, 2, 1, 0, 2]),
+      ),
+      IntColumn(Int32List.fromList([30, 25, 41, 25, 19, 33])),
+      DoubleColumn(Float64List.fromList([1.5, 9.0, 3.25, 7.0, 2.0, 5.5])),
+    ],
+  );
+}
+
+Int32List _order(ColumnarTable table, TableQuery query) {
+  return computeRowOrder(
+    {for (var i = 0; i < table.columnCount; i++) i: table.columns[i]},
+    table.rowCount,
+    query,
+  );
+}
+
+void main() {
+  test('sorts text columns by value and keeps ties in row order', () {
+    final table = _smallTable();
+    expect(_order(table, const TableQuery(sortColumn: 0)), [1, 3, 2, 5, 0, 4]);
+    expect(
+      _order(table, const TableQuery(sortColumn: 0, ascending: false)),
+      [0, 4, 2, 5, 1, 3],
+    );
+  });
+
+  test('sorts numeric columns', () {
+    final table = _smallTable();
+    expect(_order(table, const TableQuery(sortColumn: 1)), [4, 1, 3, 0, 5, 2]);
+    expect(
+      _order(table, const TableQuery(sortColumn: 2, ascending: false)),
+      [1, 3, 5, 2, 4, 0],
+    );
+  });
+
+  test('combines filters before sorting', () {
+    final table = _smallTable();
+    const query = TableQuery(
+      sortColumn: 2,
+      filters: [
+        RangeFilter(1, min: 20, max: 35),
+        ContainsFilter(0, 'O'),
+      ],
+    );
+    // age 20..35 且名字包含 o：carol(30), bob(33)
+    expect(_order(table, query), [0, 5]);
+    expect(
+      () => _order(table, const TableQuery(filters: [RangeFilter(0)])),
+      throwsArgumentError,
+    );
+  });
+
+  test('rejects columns of different lengths', () {
+    expect(
+      () => ColumnarTable(
+        headers: const ['a', 'b'],
+        columns: [
+          IntColumn(Int32List(3)),
+          IntColumn(Int32List(4)),
+        ],
+      ),
+      throwsArgumentError,
+    );
+  });
+
+  test('runs queries on a background isolate', () async {
+    final table = TableData.generateLargeTable(50000, metricColumns: 2);
+    const query = TableQuery(
+      sortColumn: 4,
+      ascending: false,
+      filters: [RangeFilter(1, max: 30)],
+    );
+    final order = await runTableQuery(table, query);
+    expect(order, _order(table, query));
+
+    final salaries = (table.columns[4] as IntColumn).values;
+    final ages = (table.columns[1] as IntColumn).values;
+    for (var i = 1; i < order.length; i++) {
+      expect(salaries[order[i - 1]], greaterThanOrEqualTo(salaries[order[i]]));
+    }
+    expect(order.every((row) => ages[row] <= 30), isTrue);
+
+    final source = ColumnarRowSource(table);
+    await source.applyQuery(query);
+    expect(source.rowCount, order.length);
+    final page = await source.loadPage(0, 10);
+    expect(page.rowIds, order.sublist(0, 10));
+    expect(page.cell(0, 4), salaries[order[0]].toString());
+  });
+}
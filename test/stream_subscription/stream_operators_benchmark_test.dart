@@ -0,0 +1,157 @@
+import 'dart:async';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/async/stream_subscription/utils/stream_utils.dart';
+
+const _kEvents = 10000000;
+const _kBatch = 1000;
+const _kQueueCapacity = 4096;
+
+/// 同步发送 [count] 个整数的数据源，下游暂停时停止发送
+Stream<int> _range(int count) {
+  var next = 0;
+  var scheduled = false;
+  late final StreamController<int> controller;
+
+  void pump() {
+    scheduled = false;
+    while (next < count && controller.hasListener && !controller.isPaused) {
+      controller.add(next++);
+    }
+    if (next == count && !controller.isClosed) controller.close();
+  }
+
+  void schedule() {
+    if (scheduled) return;
+    scheduled = true;
+    scheduleMicrotask(pump);
+  }
+
+  controller = StreamController<int>(
+    sync: true,
+    onListen: schedule,
+    onResume: schedule,
+  );
+  return controller.stream;
+}
+
+/// 原实现的写法，作为对照：异步控制器、立即订阅上游、每个批次复制一次。
+Stream<R> _legacyPipe<T, R>(
+  Stream<T> stream,
+  void Function(T data, StreamController<R> controller) onData, [
+  void Function(StreamController<R> controller)? onDone,
+]) {
+  final controller = StreamController<R>();
+  final subscription = stream.listen(
+    (data) => onData(data, controller),
+    onError: controller.addError,
+    onDone: () {
+      onDone?.call(controller);
+      controller.close();
+    },
+  );
+  controller.onCancel = subscription.cancel;
+  return controller.stream;
+}
+
+Stream<List<int>> _legacyChain(Stream<int> source) {
+  int? previous;
+  final batch = <int>[];
+  final mapped = _legacyPipe<int, int>(source, (data, c) => c.add(data + 1));
+  final distinct = _legacyPipe<int, int>(mapped, (data, c) {
+    if (data != previous) {
+      previous = data;
+      c.add(data);
+    }
+  });
+  return _legacyPipe<int, List<int>>(distinct, (data, c) {
+    batch.add(data);
+    if (batch.length >= _kBatch) {
+      c.add(List<int>.from(batch));
+      batch.clear();
+    }
+  }, (c) {
+    if (batch.isNotEmpty) c.add(List<int>.from(batch));
+  });
+}
+
+class _ChainStats {
+  final queue = StreamOperatorStats();
+  final batches = StreamOperatorStats();
+}
+
+Stream<List<int>> _chain(Stream<int> source, _ChainStats stats) {
+  final mapped = StreamUtils.transform(source, (int value) => value + 1);
+  final distinct = StreamUtils.distinct(mapped);
+  final queued = StreamUtils.bounded(
+    distinct,
+    capacity: _kQueueCapacity,
+    stats: stats.queue,
+  );
+  return StreamUtils.buffer(queued, _kBatch, stats: stats.batches);
+}
+
+/// 消费整条链路，返回耗时（毫秒）；[pauseEvery] 个批次暂停一次模拟慢速监听者
+Future<int> _drain(Stream<List<int>> batches, {int? pauseEvery}) async {
+  final watch = Stopwatch()..start();
+  var events = 0;
+  var sum = 0;
+  var received = 0;
+  final done = Completer<void>();
+  late final StreamSubscription<List<int>> subscription;
+  subscription = batches.listen(
+    (batch) {
+      events += batch.length;
+      for (final value in batch) {
+        sum += value;
+      }
+      if (pauseEvery != null && ++received % pauseEvery == 0) {
+        subscription.pause(Future<void>.delayed(Duration.zero));
+      }
+    },
+    onDone: done.complete,
+  );
+  await done.future;
+  watch.stop();
+
+  expect(events, _kEvents);
+  expect(sum, _kEvents * (_kEvents + 1) ~/ 2);
+  return watch.elapsedMilliseconds;
+}
+
+String _rate(int ms) =>
+    '${(_kEvents / (ms == 0 ? 1 : ms) / 1000).toStringAsFixed(1)} M events/s';
+
+void main() {
+  test('benchmark: $_kEvents events through an operator chain', () async {
+    final legacyMs = await _drain(_legacyChain(_range(_kEvents)));
+
+    final freeStats = _ChainStats();
+    final freeMs = await _drain(_chain(_range(_kEvents), freeStats));
+
+    final slowStats = _ChainStats();
+    final slowMs = await _drain(
+      _chain(_range(_kEvents), slowStats),
+      pauseEvery: 10,
+    );
+
+    // 下游不暂停时数据直接透传，队列始终为空
+    expect(freeStats.queue.maxQueueDepth, 0);
+    // 慢速监听者：暂停逐级传到数据源，队列有界且不丢数据
+    expect(slowStats.queue.maxQueueDepth, lessThanOrEqualTo(_kQueueCapacity));
+    expect(slowStats.queue.dropped, 0);
+    expect(slowStats.batches.maxQueueDepth, _kBatch);
+    expect(slowStats.batches.emitted, _kEvents ~/ _kBatch);
+
+    debugPrint('Stream operator benchmark ($_kEvents events: '
+        'transform -> distinct -> bounded -> buffer($_kBatch))');
+    debugPrint('  legacy (async controllers, copied batches): '
+        '$legacyMs ms, ${_rate(legacyMs)}');
+    debugPrint('  backpressure operators: $freeMs ms, ${_rate(freeMs)}');
+    debugPrint('  with paused listener (every 10 batches): '
+        '$slowMs ms, ${_rate(slowMs)}');
+    debugPrint('  queue: ${slowStats.queue}');
+    debugPrint('  batches: ${slowStats.batches}');
+  });
+}
@@ -0,0 +1,198 @@
+import 'dart:async';
+
+import 'package:flutter/foundation.dart';
+import 'package:flutter_test/flutter_test.dart';
+import 'package:main_app/modules/async/stream_subscription/utils/stream_utils.dart';
+
+Future<void> _settle() => Future<void>.delayed(Duration.zero);
+
+void main() {
+  group('batching', () {
+    test('buffer hands over full batches and flushes the rest on done',
+        () async {
+      final stats = StreamOperatorStats();
+      final batches = await StreamUtils.buffer(
+        Stream.fromIterable([1, 2, 3, 4, 5, 6, 7]),
+        3,
+        stats: stats,
+      ).toList();
+
+      expect(batches, [
+        [1, 2, 3],
+        [4, 5, 6],
+        [7],
+      ]);
+      expect(stats.received, 7);
+      expect(stats.emitted, 3);
+      expect(stats.maxQueueDepth, 3);
+      expect(stats.queueDepth, 0);
+    });
+
+    test('bufferTime emits on window expiry and on maxCount', () async {
+      final source = StreamController<int>(sync: true);
+      final batches = <List<int>>[];
+      final done = Completer<void>();
+      StreamUtils.bufferTime(
+        source.stream,
+        const Duration(milliseconds: 20),
+        maxCount: 3,
+      ).listen(batches.add, onDone: done.complete);
+
+      source
+        ..add(1)
+        ..add(2)
+        ..add(3)
+        ..add(4);
+      expect(batches, [
+        [1, 2, 3],
+      ]);
+
+      await Future<void>.delayed(const Duration(milliseconds: 60));
+      expect(batches.last, [4]);
+
+      source.add(5);
+      await source.close();
+      await done.future;
+      expect(batches.last, [5]);
+    });
+  });
+
+  group('backpressure', () {
+    test('per-event operators pause and resume their upstream', () async {
+      final source = StreamController<int>(sync: true);
+      final values = <int>[];
+      final subscription = StreamUtils.transform(
+        StreamUtils.distinct(source.stream),
+        (int value) => value * 10,
+      ).listen(values.add);
+
+      source.add(1);
+      subscription.pause();
+      await _settle();
+      expect(source.isPaused, isTrue);
+
+      // 上游暂停期间的数据留在源控制器中，恢复后依次送达
+      source
+        ..add(1)
+        ..add(2);
+      expect(values, [10]);
+      subscription.resume();
+      expect(source.isPaused, isFalse);
+      await _settle();
+      expect(values, [10, 20]);
+
+      await subscription.cancel();
+      expect(source.hasListener, isFalse);
+    });
+
+    test('block policy pauses upstream once the queue is full', () async {
+      final source = StreamController<int>(sync: true);
+      final stats = StreamOperatorStats();
+      final values = <int>[];
+      final done = Completer<void>();
+      final subscription = StreamUtils.bounded(
+        source.stream,
+        capacity: 4,
+        stats: stats,
+      ).listen(values.add, onDone: done.complete);
+
+      subscription.pause();
+      for (var i = 0; i < 10; i++) {
+        source.add(i);
+      }
+      expect(stats.queueDepth, 4);
+      expect(stats.upstreamPauses, 1);
+      expect(source.isPaused, isTrue);
+
+      subscription.resume();
+      await _settle();
+      expect(source.isPaused, isFalse);
+      await source.close();
+      await done.future;
+
+      expect(values, List.generate(10, (i) => i));
+      expect(stats.dropped, 0);
+      expect(stats.maxQueueDepth, 4);
+      expect(stats.emitted, 10);
+    });
+
+    for (final (policy, expected) in [
+      (OverflowPolicy.dropOldest, [7, 8, 9]),
+      (OverflowPolicy.dropNewest, [0, 1, 2]),
+    ]) {
+      test('${policy.name} keeps the upstream flowing', () async {
+        final source = StreamController<int>(sync: true);
+        final stats = StreamOperatorStats();
+        final values = <int>[];
+        final done = Completer<void>();
+        final subscription = StreamUtils.bounded(
+          source.stream,
+          capacity: 3,
+          policy: policy,
+          stats: stats,
+        ).listen(values.add, onDone: done.complete);
+
+        subscription.pause();
+        for (var i = 0; i < 10; i++) {
+          source.add(i);
+        }
+        expect(source.isPaused, isFalse);
+        expect(stats.queueDepth, 3);
+        expect(stats.dropped, 7);
+
+        subscription.resume();
+        await source.close();
+        await done.future;
+        expect(values, expected);
+      });
+    }
+  });
+
+  test('coalesceLatest emits the latest value once per flush', () async {
+    final source = StreamController<int>(sync: true);
+    final stats = StreamOperatorStats();
+    final pending = <VoidCallback>[];
+    final values = <int>[];
+    final done = Completer<void>();
+    final subscription = StreamUtils.coalesceLatest(
+      source.stream,
+      scheduleFlush: pending.add,
+      stats: stats,
+    ).listen(values.add, onDone: done.complete);
+
+    source
+      ..add(1)
+      ..add(2)
+      ..add(3);
+    expect(pending, hasLength(1));
+    pending.removeLast()();
+    expect(values, [3]);
+    expect(stats.dropped, 2);
+
+    // 暂停期间只保留最新值，恢复时才调度
+    subscription.pause();
+    source
+      ..add(4)
+      ..add(5);
+    expect(pending, isEmpty);
+    subscription.resume();
+    expect(pending, hasLength(1));
+
+    source
+      ..add(6)
+      ..close();
+    pending.removeLast()();
+    await done.future;
+    expect(values, [3, 6]);
+    expect(stats.received, 6);
+    expect(stats.emitted, 2);
+  });
+
+  test('mergeStreams closes after every source is done', () async {
+    final merged = await StreamUtils.mergeStreams([
+      Stream.fromIterable([1, 2]),
+      Stream.fromIterable([3]),
+    ]).toList();
+    expect(merged..sort(), [1, 2, 3]);
+  });
+}